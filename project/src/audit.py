@@ -3,31 +3,132 @@ Audit logger — writes a JSONL line for every tool / resource call.
 
 Schema per line:
   {timestamp, action, tool_name, ...kwargs}
+
+``log()`` only appends the entry to an in-memory buffer; a background
+writer thread drains it in batches once ``flush_entries`` entries are
+pending or ``flush_interval`` seconds have passed, so tool calls never
+block the event loop on file I/O. Call ``flush()`` (sync) or ``aclose()``
+(async, used at lifespan shutdown) to persist everything still buffered.
+
+Rotation: ``audit.jsonl`` is renamed to ``audit-<UTC time>Z-NNNN.jsonl``
+once it would exceed ``max_bytes`` or when the UTC day changes. Rotated
+segments are gzip-compressed on a background thread and recorded in
+``audit-manifest.json`` with their first/last timestamps, so
+``segments()`` / ``iter_entries()`` can skip files outside a time range.
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
+import logging
+import os
+import threading
 import time
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
 from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Flush thresholds: whichever is reached first triggers a write
+FLUSH_ENTRIES = 256
+FLUSH_INTERVAL = 0.5
+# Rotate the active file before it grows past this size
+ROTATE_BYTES = 64 * 1024 * 1024
+MANIFEST_NAME = "audit-manifest.json"
+
+# start_timer() value of the instrumented call in progress (see src.instrument);
+# log() uses it to stamp duration_ms on entries written during that call
+call_started: ContextVar[float | None] = ContextVar("audit_call_started", default=None)
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _parse_timestamp(value: str | datetime) -> datetime:
+    parsed = datetime.fromisoformat(value) if isinstance(value, str) else value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _first_timestamp(path: Path) -> datetime | None:
+    try:
+        with path.open("rb") as f:
+            return _parse_timestamp(json.loads(f.readline())["timestamp"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
 
 class AuditLogger:
-    def __init__(self, log_dir: str | Path = "logs"):
+    def __init__(
+        self,
+        log_dir: str | Path = "logs",
+        flush_entries: int = FLUSH_ENTRIES,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_bytes: int = ROTATE_BYTES,
+        rotate_daily: bool = True,
+    ):
         self._log_dir = Path(log_dir)
         self._log_dir.mkdir(parents=True, exist_ok=True)
-        self._lock = asyncio.Lock()
+        self._flush_entries = flush_entries
+        self._flush_interval = flush_interval
+        self._buffer: list[str] = []
+        self._cond = threading.Condition()
+        # Serializes file writes so batches land in the order they were taken;
+        # reentrant because a write may trigger rotate()
+        self._write_lock = threading.RLock()
+        self._closing = False
+        self._thread: threading.Thread | None = None
+
+        self._max_bytes = max_bytes
+        self._rotate_daily = rotate_daily
+        self._manifest_lock = threading.Lock()
+        self._compressor: ThreadPoolExecutor | None = None
+        self._current_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        first = _first_timestamp(self.log_path) if self._current_size else None
+        self._current_day = first.date() if first else None
+        # Segments rotated before a crash but never compressed
+        for leftover in sorted(self._log_dir.glob("audit-*.jsonl")):
+            self._schedule_compress(leftover)
+
+    def for_worker(self, worker_id: int) -> "AuditLogger":
+        """Same settings, writing to ``<log_dir>/worker-<id>/``.
+
+        Pre-forked workers each get their own directory so the active file,
+        rotation and the manifest are never shared between processes.
+        """
+        return AuditLogger(
+            log_dir=self._log_dir / f"worker-{worker_id}",
+            flush_entries=self._flush_entries,
+            flush_interval=self._flush_interval,
+            max_bytes=self._max_bytes,
+            rotate_daily=self._rotate_daily,
+        )
 
     @property
     def log_path(self) -> Path:
         return self._log_dir / "audit.jsonl"
 
-    def start_timer(self) -> float:
+    @property
+    def manifest_path(self) -> Path:
+        return self._log_dir / MANIFEST_NAME
+
+    @property
+    def pending(self) -> int:
+        """Entries buffered but not yet written."""
+        return len(self._buffer)
+
+    @staticmethod
+    def start_timer() -> float:
         return time.perf_counter()
 
-    def elapsed_ms(self, start: float) -> float:
+    @staticmethod
+    def elapsed_ms(start: float) -> float:
         return round((time.perf_counter() - start) * 1000, 2)
 
     async def log(self, action: str, tool_name: str, **kwargs) -> None:
@@ -37,6 +138,221 @@ class AuditLogger:
             "tool_name": tool_name,
             **kwargs,
         }
-        async with self._lock:
-            with self.log_path.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        started = call_started.get()
+        if started is not None and "duration_ms" not in entry:
+            entry["duration_ms"] = self.elapsed_ms(started)
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._cond:
+            self._buffer.append(line)
+            if self._thread is None or not self._thread.is_alive():
+                self._start_writer()
+            if len(self._buffer) >= self._flush_entries:
+                self._cond.notify()
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+    def _start_writer(self) -> None:
+        self._closing = False
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closing or len(self._buffer) >= self._flush_entries,
+                    timeout=self._flush_interval,
+                )
+                closing = self._closing
+            self.flush()
+            if closing:
+                return
+
+    def _write(self, lines: list[str]) -> None:
+        data = "".join(lines).encode("utf-8")
+        try:
+            self._maybe_rotate(len(data))
+            with self.log_path.open("ab") as f:
+                f.write(data)
+        except OSError:
+            logger.exception("Failed to write %d audit entries", len(lines))
+            return
+        self._current_size += len(data)
+        if self._current_day is None:
+            self._current_day = _utc_today()
+
+    def flush(self) -> None:
+        """Write every buffered entry now (blocking; safe from any thread)."""
+        with self._write_lock:
+            with self._cond:
+                lines, self._buffer = self._buffer, []
+            if lines:
+                self._write(lines)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Stop the writer thread after it has drained the buffer."""
+        with self._cond:
+            thread = self._thread
+            self._closing = True
+            self._cond.notify()
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        self.flush()
+        with self._manifest_lock:
+            compressor, self._compressor = self._compressor, None
+        if compressor is not None:
+            compressor.shutdown(wait=True)
+
+    async def aclose(self) -> None:
+        """Async ``close()`` for lifespan shutdown; the logger stays usable."""
+        await asyncio.to_thread(self.close)
+
+    # ------------------------------------------------------------------
+    # Rotation
+    # ------------------------------------------------------------------
+    def _maybe_rotate(self, incoming: int) -> None:
+        if not self._current_size:
+            return
+        too_big = self._current_size + incoming > self._max_bytes
+        new_day = self._rotate_daily and self._current_day != _utc_today()
+        if too_big or new_day:
+            self.rotate()
+
+    def rotate(self) -> Path | None:
+        """Move the active file aside and compress it in the background."""
+        with self._write_lock:
+            if not self.log_path.exists():
+                return None
+            # Sequence suffix keeps names unique and sorted within a second
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            n = 0
+            while True:
+                segment = self._log_dir / f"audit-{stamp}-{n:04d}.jsonl"
+                if not segment.exists() and not segment.with_suffix(".jsonl.gz").exists():
+                    break
+                n += 1
+            os.replace(self.log_path, segment)
+            self._current_size = 0
+            self._current_day = None
+        self._schedule_compress(segment)
+        return segment
+
+    def _schedule_compress(self, segment: Path) -> None:
+        with self._manifest_lock:
+            if self._compressor is None:
+                self._compressor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="audit-compress",
+                )
+            self._compressor.submit(self._compress, segment)
+
+    def _compress(self, segment: Path) -> None:
+        target = segment.with_suffix(".jsonl.gz")
+        if any(seg["file"] == target.name for seg in self.load_manifest()):
+            segment.unlink(missing_ok=True)  # crashed after the manifest update
+            return
+        tmp = target.with_name(f"{target.name}.tmp")
+        first = last = None
+        entries = 0
+        try:
+            import gzip  # only needed once a segment rotates
+
+            with segment.open("rb") as src, gzip.open(tmp, "wb") as dst:
+                for line in src:
+                    dst.write(line)
+                    try:
+                        ts = json.loads(line)["timestamp"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    first = first or ts
+                    last = ts
+                    entries += 1
+            os.replace(tmp, target)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            logger.exception("Failed to compress audit segment %s", segment)
+            return
+        with self._manifest_lock:
+            manifest = self.load_manifest()
+            manifest.append({
+                "file": target.name,
+                "first_timestamp": first,
+                "last_timestamp": last,
+                "entries": entries,
+                "bytes": target.stat().st_size,
+            })
+            manifest_tmp = self.manifest_path.with_name(f"{MANIFEST_NAME}.tmp")
+            manifest_tmp.write_text(
+                json.dumps({"segments": manifest}, ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+            os.replace(manifest_tmp, self.manifest_path)
+        # Only now drop the plain segment, so readers always find one copy
+        segment.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def load_manifest(self) -> list[dict]:
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))["segments"]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def segments(
+        self,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+    ) -> list[Path]:
+        """Files that may hold entries in [since, until], oldest first.
+
+        Compressed segments are skipped using the manifest time ranges;
+        segments still awaiting compression and the active file are
+        always included.
+        """
+        start = _parse_timestamp(since) if since is not None else None
+        end = _parse_timestamp(until) if until is not None else None
+        paths: list[Path] = []
+        manifest = self.load_manifest()
+        compressed = {seg["file"] for seg in manifest}
+        for seg in manifest:
+            if seg["first_timestamp"] is None:
+                continue
+            if end is not None and _parse_timestamp(seg["first_timestamp"]) > end:
+                continue
+            if start is not None and _parse_timestamp(seg["last_timestamp"]) < start:
+                continue
+            paths.append(self._log_dir / seg["file"])
+        paths.extend(
+            path for path in sorted(self._log_dir.glob("audit-*.jsonl"))
+            if path.with_suffix(".jsonl.gz").name not in compressed
+        )
+        if self.log_path.exists():
+            paths.append(self.log_path)
+        return paths
+
+    def iter_entries(
+        self,
+        since: str | datetime | None = None,
+        until: str | datetime | None = None,
+    ) -> Iterator[dict]:
+        """Stream entries with since <= timestamp <= until across segments."""
+        import gzip
+
+        self.flush()
+        start = _parse_timestamp(since) if since is not None else None
+        end = _parse_timestamp(until) if until is not None else None
+        for path in self.segments(since, until):
+            opener = gzip.open if path.suffix == ".gz" else open
+            try:
+                with opener(path, "rb") as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        ts = _parse_timestamp(entry["timestamp"])
+                        if (start is None or ts >= start) and (end is None or ts <= end):
+                            yield entry
+            except FileNotFoundError:
+                continue  # compressed and removed while we were listing
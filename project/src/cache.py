@@ -0,0 +1,128 @@
+"""
+In-memory caches for pre-rendered responses.
+
+ByteLRUCache keeps encoded payloads keyed by an id plus a version token
+(e.g. a file's mtime) and evicts least-recently-used entries once the
+total payload size exceeds a byte budget. With a ``ttl`` entries also
+expire that many seconds after they were stored.
+
+SingleFlight coalesces concurrent identical async calls: while a call for
+a key is in flight, later callers with the same key await its result
+instead of starting their own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class ByteLRUCache:
+    def __init__(
+        self,
+        max_bytes: int = 8 * 1024 * 1024,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (version, payload, size, expires_at)
+        self._entries: OrderedDict[Hashable, tuple[Hashable, str, int, float]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: Hashable, version: Hashable) -> str | None:
+        """Return the cached payload if it exists, its version matches and
+        it has not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            if entry[3] <= self._clock():
+                del self._entries[key]
+                self._total_bytes -= entry[2]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: Hashable, payload: str) -> None:
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[2]
+            self._entries[key] = (version, payload, size, expires_at)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, _, evicted, _) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """In-flight call map for one event loop."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0  # callers that joined an in-flight call
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()``, or the in-flight call already running for ``key``.
+
+        The computation runs as its own task, so a cancelled caller does not
+        cancel it for the others; its result or exception goes to everyone.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
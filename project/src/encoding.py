@@ -0,0 +1,88 @@
+"""
+Shared response encoding for every tool and resource.
+
+Formats:
+  pretty   — indented JSON (the historical output, easiest to read)
+  compact  — JSON without whitespace; 20–40% fewer bytes (and LLM tokens)
+  columnar — compact, with tabular results (inventory items, ticket lists)
+             rewritten as {"columns": [...], "rows": [[...], ...]} so field
+             names are sent once instead of once per record
+
+The server-wide default comes from RESPONSE_FORMAT (or ``--response-format``);
+tools also take a per-call ``format`` argument. orjson is used when it is
+installed (``pip install .[speedups]``) and the stdlib encoder otherwise;
+both emit UTF-8 text (no \\u escapes).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FORMATS = ("pretty", "compact", "columnar")
+
+_default_format = os.environ.get("RESPONSE_FORMAT", "pretty").strip().lower()
+if _default_format not in FORMATS:
+    _default_format = "pretty"
+
+
+def default_format() -> str:
+    return _default_format
+
+
+def set_default_format(fmt: str) -> None:
+    """Set the server-wide format used when a call does not pass one."""
+    global _default_format
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown response format '{fmt}'. Choose from {', '.join(FORMATS)}")
+    _default_format = fmt
+
+
+def columnar(records: list[dict]) -> dict:
+    """List of records -> {"columns": [...], "rows": [[...], ...]}."""
+    columns: list[str] = []
+    seen: set[str] = set()
+    for record in records:
+        for name in record:
+            if name not in seen:
+                seen.add(name)
+                columns.append(name)
+    return {
+        "columns": columns,
+        "rows": [[record.get(name) for name in columns] for record in records],
+    }
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """JSON-encode ``obj``, preferring orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; the stdlib encoder handles them
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode(payload: Any, fmt: str | None = None, table: str | None = None) -> str:
+    """Serialize a tool/resource response.
+
+    Args:
+        payload: JSON-compatible response object.
+        fmt: "pretty", "compact" or "columnar"; None uses the server default.
+        table: Key of the list-of-records field that "columnar" rewrites;
+            without one, columnar output is the same as compact.
+    """
+    fmt = fmt or _default_format
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown response format '{fmt}'. Choose from {', '.join(FORMATS)}")
+    if fmt == "columnar" and table is not None and isinstance(payload.get(table), list):
+        payload = {**payload, table: columnar(payload[table])}
+    return dumps(payload, indent=fmt == "pretty")
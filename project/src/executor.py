@@ -0,0 +1,100 @@
+"""
+Shared thread pool for blocking work — SQLite queries, ticket store I/O and
+policy file reads — so the event loop stays responsive and concurrent
+requests overlap instead of running one after another.
+
+Tools call ``await app.run_blocking(fn, *args)``. The pool is bounded: at
+most ``max_workers`` calls run and ``max_queue`` more wait; beyond that a
+call is rejected with ``ExecutorSaturated`` (surfaced to clients as
+UNAVAILABLE) rather than letting latency pile up behind an unbounded queue.
+Context variables (e.g. ``call_started``) are copied into the worker thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_MAX_QUEUE = 256
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class BlockingExecutor:
+    """ThreadPoolExecutor with a bounded number of outstanding calls."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="blocking",
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "BlockingExecutor":
+        """Sized by BLOCKING_WORKERS / BLOCKING_QUEUE when set."""
+        workers = os.environ.get("BLOCKING_WORKERS", "").strip()
+        queue = os.environ.get("BLOCKING_QUEUE", "").strip()
+        return cls(
+            max_workers=int(workers) if workers else DEFAULT_MAX_WORKERS,
+            max_queue=int(queue) if queue else DEFAULT_MAX_QUEUE,
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def pending(self) -> int:
+        """Calls submitted and not yet finished (running + queued)."""
+        with self._lock:
+            return self._pending
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.capacity:
+                self.rejected += 1
+                raise ExecutorSaturated(
+                    f"{self._pending} blocking calls outstanding (capacity {self.capacity})"
+                )
+            self._pending += 1
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        try:
+            future = self._pool.submit(call)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn`` on the pool and await its result.
+
+        Cancelling the awaiting task does not stop a call already running;
+        its slot is freed when it finishes.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def _release(self, _future: Future | None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
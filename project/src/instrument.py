@@ -0,0 +1,155 @@
+"""
+Instrumentation for every registered tool, resource and prompt.
+
+``instrument_server(mcp)`` swaps ``mcp.tool`` / ``mcp.resource`` /
+``mcp.prompt`` for versions that wrap each handler with ``instrument``
+before registering it, so the modules under ``src/tools``, ``src/resources``
+and ``src/prompts`` need no changes. Per call the wrapper records duration,
+response payload size and error code into ``src.metrics.REGISTRY``.
+
+Audit entries written during the call get ``duration_ms`` stamped
+automatically (see ``src.audit.call_started``). Handlers do not audit their
+own failures, so the wrapper writes an ``error`` entry when one raises.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+from typing import Any, Callable
+
+from src.audit import AuditLogger, call_started
+from src.metrics import REGISTRY, MetricsRegistry
+from src.models import ErrorCode, ToolError
+
+
+def payload_size(result: Any) -> int:
+    """Approximate response size in bytes (UTF-8 for text results)."""
+    if result is None:
+        return 0
+    if isinstance(result, bytes):
+        return len(result)
+    if isinstance(result, str):
+        return len(result.encode("utf-8"))
+    try:
+        return len(json.dumps(result, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(result).encode("utf-8"))
+
+
+def error_code_of(exc: BaseException) -> str:
+    if isinstance(exc, ToolError):
+        return exc.code.value
+    return ErrorCode.INTERNAL_ERROR.value
+
+
+def instrument(
+    kind: str,
+    name: str,
+    registry: MetricsRegistry = REGISTRY,
+    audit_logger: Callable[[], AuditLogger | None] | None = None,
+) -> Callable[[Callable], Callable]:
+    """Decorator recording latency, payload size and outcome of a handler.
+
+    ``functools.wraps`` keeps the signature (and ``__wrapped__``) intact, so
+    FastMCP still derives the argument schema and Context parameter from
+    the original function. ``audit_logger`` is called lazily to find the
+    logger for error entries; it may return None outside a request.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        def finish(start: float, result: Any, exc: BaseException | None) -> None:
+            registry.record(
+                kind, name, AuditLogger.elapsed_ms(start),
+                payload_bytes=payload_size(result),
+                error_code=error_code_of(exc) if exc is not None else None,
+            )
+
+        async def audit_error(exc: BaseException) -> None:
+            logger = audit_logger() if audit_logger is not None else None
+            if logger is not None:
+                await logger.log(
+                    action="error",
+                    tool_name=name,
+                    kind=kind,
+                    error_code=error_code_of(exc),
+                    result_summary=str(exc)[:200],
+                    success=False,
+                )
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                registry.begin(kind, name)
+                start = AuditLogger.start_timer()
+                token = call_started.set(start)
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as exc:
+                    await audit_error(exc)
+                    finish(start, None, exc)
+                    raise
+                finally:
+                    call_started.reset(token)
+                    registry.end(kind, name)
+                finish(start, result, None)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def sync_wrapper(*args, **kwargs):
+            registry.begin(kind, name)
+            start = AuditLogger.start_timer()
+            token = call_started.set(start)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                finish(start, None, exc)
+                raise
+            finally:
+                call_started.reset(token)
+                registry.end(kind, name)
+            finish(start, result, None)
+            return result
+
+        return sync_wrapper
+
+    return decorator
+
+
+def instrument_server(mcp, registry: MetricsRegistry = REGISTRY) -> None:
+    """Instrument every handler registered on ``mcp`` from now on."""
+
+    def current_audit_logger() -> AuditLogger | None:
+        try:
+            return mcp.get_context().request_context.lifespan_context["app"].audit_logger
+        except (LookupError, ValueError, AttributeError):
+            return None
+
+    def wrap_registrar(kind: str, registrar: Callable, name_of: Callable) -> Callable:
+        @functools.wraps(registrar)
+        def patched(*args, **kwargs):
+            register = registrar(*args, **kwargs)
+
+            def decorator(fn: Callable) -> Callable:
+                wrapped = instrument(
+                    kind, name_of(fn, args, kwargs), registry, current_audit_logger,
+                )(fn)
+                register(wrapped)
+                return fn
+
+            return decorator
+
+        return patched
+
+    def handler_name(fn: Callable, args: tuple, kwargs: dict) -> str:
+        return kwargs.get("name") or (args[0] if args else None) or fn.__name__
+
+    mcp.tool = wrap_registrar("tool", mcp.tool, handler_name)
+    mcp.prompt = wrap_registrar("prompt", mcp.prompt, handler_name)
+    # Resources are keyed by URI (template), the first positional argument
+    mcp.resource = wrap_registrar(
+        "resource", mcp.resource, lambda fn, a, kw: a[0] if a else kw["uri"],
+    )
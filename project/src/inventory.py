@@ -0,0 +1,402 @@
+"""
+Inventory store helpers.
+
+Owns the in-memory ``inventory`` table schema and its secondary indexes,
+the bulk CSV loader, the on-disk snapshot used to skip CSV parsing on
+startup, the FTS5 trigram index used for substring search, the
+per-thread read connections lookups run on, and the filtered, paginated
+query behind lookup_inventory.
+
+The trigram index turns ``LIKE '%term%'`` scans into index lookups; it
+needs SQLite >= 3.34 and queries of at least three characters, so shorter
+queries (and builds without FTS5) fall back to the LIKE scan.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+
+from src.startup import STARTUP
+
+logger = logging.getLogger(__name__)
+
+INVENTORY_COLUMNS = (
+    "item_id, name, category, quantity, location, status, last_updated"
+)
+CSV_FIELDS = tuple(INVENTORY_COLUMNS.split(", "))
+LOAD_BATCH_SIZE = 5000
+TRIGRAM_MIN_LENGTH = 3
+
+# Bump when the schema or index layout changes to invalidate old snapshots
+SNAPSHOT_SCHEMA_VERSION = "4"
+
+
+def create_schema(db: sqlite3.Connection) -> None:
+    """Create the inventory table; indexes come later (see create_indexes).
+
+    The filter columns compare case-insensitively (COLLATE NOCASE), and
+    the composite indexes on them inherit that collation, so "Laptop",
+    "laptop" and "LAPTOP" all match the same rows through the index.
+    """
+    db.execute("""CREATE TABLE inventory (
+        item_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        category TEXT NOT NULL COLLATE NOCASE,
+        quantity INTEGER NOT NULL CHECK (typeof(quantity) = 'integer'),
+        location TEXT NOT NULL COLLATE NOCASE,
+        status TEXT NOT NULL COLLATE NOCASE,
+        last_updated TEXT NOT NULL
+    )""")
+
+
+def create_indexes(db: sqlite3.Connection) -> None:
+    """Create indexes once the bulk load is done (cheaper than per-row upkeep).
+
+    The composite indexes serve lookup_inventory's structured filters:
+    equality on category / location / status, then a quantity range.
+    """
+    db.execute("CREATE UNIQUE INDEX idx_inventory_item_id ON inventory(item_id)")
+    db.execute(
+        "CREATE INDEX idx_inventory_category ON inventory(category, status, quantity)"
+    )
+    db.execute(
+        "CREATE INDEX idx_inventory_location ON inventory(location, status, quantity)"
+    )
+    db.execute("CREATE INDEX idx_inventory_status ON inventory(status, quantity)")
+    # Sampled statistics so the planner can pick between the indexes
+    db.execute("PRAGMA analysis_limit = 1000")
+    db.execute("ANALYZE")
+    db.commit()
+
+
+def load_csv(
+    db: sqlite3.Connection,
+    csv_path: Path,
+    batch_size: int = LOAD_BATCH_SIZE,
+) -> int:
+    """Stream ``csv_path`` into the inventory table and return the row count.
+
+    Rows go through ``executemany`` in batches inside a single transaction,
+    with journaling and fsync disabled for the duration of the load.
+    ``quantity`` is converted by the column's INTEGER affinity rather than
+    per-row ``int()`` calls in Python; a CHECK constraint rejects values
+    that do not convert, and the load fails with ValueError.
+    """
+    start = time.perf_counter()
+    journal_mode = db.execute("PRAGMA journal_mode").fetchone()[0]
+    synchronous = db.execute("PRAGMA synchronous").fetchone()[0]
+    db.execute("PRAGMA journal_mode = OFF")
+    db.execute("PRAGMA synchronous = OFF")
+
+    total = 0
+    try:
+        with csv_path.open(newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return 0
+            positions = [header.index(name) for name in CSV_FIELDS]
+            rows = filter(None, reader)  # skip blank lines like DictReader
+            if positions != list(range(len(header))):
+                rows = map(itemgetter(*positions), rows)
+
+            # sqlite3 opens one implicit transaction for all batches
+            while batch := list(islice(rows, batch_size)):
+                try:
+                    db.executemany(
+                        "INSERT INTO inventory VALUES (?,?,?,?,?,?,?)", batch,
+                    )
+                except sqlite3.IntegrityError as exc:
+                    raise ValueError(f"{csv_path}: invalid inventory row ({exc})") from exc
+                total += len(batch)
+        db.commit()
+    finally:
+        if db.in_transaction:  # failed load; PRAGMAs can't change mid-transaction
+            db.rollback()
+        db.execute(f"PRAGMA journal_mode = {journal_mode}")
+        db.execute(f"PRAGMA synchronous = {synchronous}")
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed else 0.0
+    STARTUP.note(f"inventory csv: {total} rows in {elapsed:.3f}s ({rate:.0f} rows/s)")
+    logger.info("Loaded %d inventory rows in %.3fs (%.0f rows/s)", total, elapsed, rate)
+    return total
+
+
+def build_search_index(db: sqlite3.Connection) -> bool:
+    """Create and populate the trigram index over name/category.
+
+    Returns False (leaving the DB untouched) if this SQLite build lacks
+    FTS5 or the trigram tokenizer.
+    """
+    try:
+        db.execute("""CREATE VIRTUAL TABLE inventory_fts USING fts5(
+            name, category,
+            content='inventory', content_rowid='rowid',
+            tokenize='trigram'
+        )""")
+    except sqlite3.OperationalError:
+        return False
+    db.execute("INSERT INTO inventory_fts(inventory_fts) VALUES ('rebuild')")
+    db.commit()
+    return True
+
+
+def has_search_index(db: sqlite3.Connection) -> bool:
+    row = db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'inventory_fts'"
+    ).fetchone()
+    return row is not None
+
+
+# ---------------------------------------------------------------------------
+# On-disk snapshot
+# ---------------------------------------------------------------------------
+
+def snapshot_path_for(csv_path: Path) -> Path:
+    return csv_path.with_suffix(".snapshot.sqlite3")
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_is_current(csv_path: Path, snapshot_path: Path) -> bool:
+    """Whether ``snapshot_path`` holds the inventory of the current CSV.
+
+    The snapshot is keyed by the CSV's size and mtime; if only the mtime
+    differs (e.g. a fresh checkout) the content hash decides. A current
+    snapshot is read in place (see InventoryReaders).
+    """
+    if not snapshot_path.exists() or not csv_path.exists():
+        return False
+    stat = csv_path.stat()
+    try:
+        disk = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+        try:
+            meta = dict(disk.execute("SELECT key, value FROM snapshot_meta"))
+        finally:
+            disk.close()
+    except sqlite3.Error:
+        logger.warning("Ignoring unreadable inventory snapshot %s", snapshot_path)
+        return False
+    if meta.get("schema_version") != SNAPSHOT_SCHEMA_VERSION:
+        return False
+    if meta.get("csv_size") != str(stat.st_size):
+        return False
+    if meta.get("csv_mtime_ns") != str(stat.st_mtime_ns):
+        return meta.get("csv_sha256") == file_sha256(csv_path)
+    return True
+
+
+def save_snapshot(db: sqlite3.Connection, csv_path: Path, snapshot_path: Path) -> bool:
+    """Write ``db`` to ``snapshot_path`` atomically, tagged with the CSV key."""
+    stat = csv_path.stat()
+    meta = {
+        "schema_version": SNAPSHOT_SCHEMA_VERSION,
+        "csv_size": str(stat.st_size),
+        "csv_mtime_ns": str(stat.st_mtime_ns),
+        "csv_sha256": file_sha256(csv_path),
+    }
+    tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    try:
+        disk = sqlite3.connect(tmp_path)
+        try:
+            db.backup(disk)
+            disk.execute("CREATE TABLE snapshot_meta (key TEXT PRIMARY KEY, value TEXT)")
+            disk.executemany("INSERT INTO snapshot_meta VALUES (?, ?)", meta.items())
+            disk.commit()
+        finally:
+            disk.close()
+        os.replace(tmp_path, snapshot_path)
+    except (OSError, sqlite3.Error):
+        logger.warning("Could not write inventory snapshot %s", snapshot_path, exc_info=True)
+        tmp_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Read connections
+# ---------------------------------------------------------------------------
+
+class InventoryReaders:
+    """Per-thread read-only connections to an on-disk inventory file.
+
+    A single shared connection behind a lock serializes every lookup; with
+    one connection per executor thread, queries overlap (sqlite3 releases
+    the GIL while a statement runs). The file is never written after it is
+    created (a snapshot is only ever replaced by rename), so it is opened
+    ``immutable`` (no file locking), and all connections share its pages
+    through the OS page cache.
+
+    The file is either a current snapshot, read in place, or a temporary
+    copy owned by the readers. ``close()`` deletes an owned file; the
+    server calls it on shutdown, including SIGTERM (see server.main).
+    """
+
+    def __init__(self, path: Path, owned: bool = False) -> None:
+        self.path = path
+        self._uri = f"{path.resolve().as_uri()}?mode=ro&immutable=1"
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        # Only the creating process deletes an owned file, never a forked worker
+        self._owner_pid = os.getpid() if owned else None
+
+    @classmethod
+    def from_connection(cls, db: sqlite3.Connection) -> "InventoryReaders":
+        """Copy ``db`` into a temporary file owned by the returned readers."""
+        fd, name = tempfile.mkstemp(prefix="inventory-", suffix=".sqlite3")
+        os.close(fd)
+        path = Path(name)
+        try:
+            disk = sqlite3.connect(path)
+            try:
+                db.backup(disk)
+            finally:
+                disk.close()
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return cls(path, owned=True)
+
+    def open(self) -> sqlite3.Connection:
+        """A new read-only connection, closed by ``close_connections``."""
+        db = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        db.row_factory = sqlite3.Row
+        with self._lock:
+            self._connections.append(db)
+        return db
+
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = self.open()
+        return db
+
+    def close_connections(self) -> None:
+        """Close every connection; threads reopen theirs on next use."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for db in connections:
+            db.close()
+
+    def close(self) -> None:
+        self.close_connections()
+        if self._owner_pid == os.getpid():
+            self._owner_pid = None
+            self.path.unlink(missing_ok=True)
+
+
+def fts_phrase(text: str) -> str:
+    """Quote ``text`` as a single FTS5 phrase (trigram = substring match)."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+@dataclass
+class InventoryFilters:
+    """Structured lookup_inventory filters (all optional, AND-combined)."""
+
+    category: str | None = None
+    location: str | None = None  # prefix, e.g. "HQ" or "HQ-Floor3"
+    status: str | None = None
+    min_quantity: int | None = None
+    max_quantity: int | None = None
+
+    def __bool__(self) -> bool:
+        return any(v is not None for v in vars(self).values())
+
+    def where(self) -> tuple[list[str], list]:
+        clauses: list[str] = []
+        params: list = []
+        if self.category is not None:
+            clauses.append("category = ?")
+            params.append(self.category)
+        if self.location is not None:
+            # Range instead of LIKE so the location index can be used; the
+            # column's NOCASE collation makes the bounds case-insensitive
+            clauses.append("location >= ? AND location < ?")
+            params += [self.location, self.location + "\U0010ffff"]
+        if self.status is not None:
+            clauses.append("status = ?")
+            params.append(self.status)
+        if self.min_quantity is not None:
+            clauses.append("quantity >= ?")
+            params.append(self.min_quantity)
+        if self.max_quantity is not None:
+            clauses.append("quantity <= ?")
+            params.append(self.max_quantity)
+        return clauses, params
+
+
+@dataclass
+class InventoryPage:
+    items: list[dict]
+    next_cursor: str | None = None
+
+
+def search_inventory(
+    db: sqlite3.Connection,
+    sanitized: str,
+    limit: int,
+    use_fts: bool = False,
+    filters: InventoryFilters | None = None,
+    after: int | None = None,
+) -> InventoryPage:
+    """Substring search over name/category combined with structured filters.
+
+    Results are ordered by rowid (CSV order); ``after`` is the rowid cursor
+    of the previous page, and ``next_cursor`` is set when more rows exist.
+    """
+    clauses: list[str] = []
+    params: list = []
+    if sanitized:
+        if use_fts and len(sanitized) >= TRIGRAM_MIN_LENGTH:
+            clauses.append(
+                "rowid IN (SELECT rowid FROM inventory_fts WHERE inventory_fts MATCH ?)"
+            )
+            params.append(fts_phrase(sanitized))
+        else:
+            like_pattern = f"%{sanitized}%"
+            clauses.append("(LOWER(name) LIKE ? OR LOWER(category) LIKE ?)")
+            params += [like_pattern, like_pattern]
+    if filters:
+        filter_clauses, filter_params = filters.where()
+        clauses += filter_clauses
+        params += filter_params
+    if after is not None:
+        clauses.append("rowid > ?")
+        params.append(after)
+
+    rows = db.execute(
+        f"""SELECT rowid, {INVENTORY_COLUMNS}
+            FROM inventory
+            WHERE {" AND ".join(clauses) or "1"}
+            ORDER BY rowid
+            LIMIT ?""",
+        (*params, limit + 1),
+    ).fetchall()
+
+    page = rows[:limit]
+    return InventoryPage(
+        items=[{name: row[name] for name in CSV_FIELDS} for row in page],
+        next_cursor=str(page[-1]["rowid"]) if len(rows) > limit else None,
+    )
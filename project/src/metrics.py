@@ -0,0 +1,213 @@
+"""
+In-process call metrics — latency histograms and outcomes per tool,
+resource and prompt, without an external APM.
+
+Latencies go into fixed log-scale buckets (milliseconds), so recording is
+O(buckets) with no allocation, and p50/p95/p99 are estimated by linear
+interpolation inside the bucket holding the target rank. The same buckets
+can be exported as-is in Prometheus histogram format.
+
+``REGISTRY`` is the process-wide registry the ``instrument`` decorator
+records into; ``REGISTRY.timer("db", ...)`` times DB work the same way.
+Extra gauges (audit queue depth, cache stats) are pulled from collectors
+at export time only, so they add nothing per request.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+# Upper bounds (ms) of the latency buckets; a final +Inf bucket is implicit
+LATENCY_BUCKETS_MS = (
+    0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Per-bucket (non-cumulative) counts plus sum/min/max."""
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile; clamped to the observed min/max."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / n
+                return min(max(estimate, self.min), self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            **{f"p{int(q * 100)}_ms": round(self.quantile(q), 3) for q in QUANTILES},
+        }
+
+
+@dataclass
+class CallStats:
+    latency: Histogram = field(default_factory=Histogram)
+    errors: Counter = field(default_factory=Counter)
+    payload_bytes: int = 0
+    max_payload_bytes: int = 0
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.latency.count,
+            "errors": dict(self.errors),
+            "latency": self.latency.summary(),
+            "payload_bytes": {
+                "total": self.payload_bytes,
+                "mean": (
+                    round(self.payload_bytes / self.latency.count, 1)
+                    if self.latency.count else 0.0
+                ),
+                "max": self.max_payload_bytes,
+            },
+        }
+
+
+@dataclass
+class MetricFamily:
+    """One exported metric: name, Prometheus type, help text and samples."""
+
+    name: str
+    type: str
+    help: str
+    samples: list[tuple[dict[str, str], float]] = field(default_factory=list)
+
+
+class MetricsRegistry:
+    """Thread-safe map of (kind, name) -> CallStats."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, str], CallStats] = {}
+        self._in_flight: Counter = Counter()
+        self._collectors: list[Callable[[], list[MetricFamily]]] = []
+        self._labels: dict[str, str] = {}
+
+    @property
+    def labels(self) -> dict[str, str]:
+        """Constant labels exported on every series (e.g. ``worker``)."""
+        with self._lock:
+            return dict(self._labels)
+
+    def set_labels(self, **labels: str) -> None:
+        with self._lock:
+            self._labels = dict(labels)
+
+    def begin(self, kind: str, name: str) -> None:
+        """Mark a call as in flight; pair with ``end()``."""
+        with self._lock:
+            self._in_flight[(kind, name)] += 1
+
+    def end(self, kind: str, name: str) -> None:
+        with self._lock:
+            self._in_flight[(kind, name)] -= 1
+
+    def in_flight(self) -> dict[tuple[str, str], int]:
+        with self._lock:
+            return dict(self._in_flight)
+
+    @contextmanager
+    def timer(self, kind: str, name: str) -> Iterator[None]:
+        """Record the duration of the ``with`` block (errors included)."""
+        start = time.perf_counter()
+        error_code = None
+        try:
+            yield
+        except Exception as exc:
+            error_code = type(exc).__name__
+            raise
+        finally:
+            self.record(
+                kind, name, (time.perf_counter() - start) * 1000,
+                error_code=error_code,
+            )
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        duration_ms: float,
+        payload_bytes: int = 0,
+        error_code: str | None = None,
+    ) -> None:
+        with self._lock:
+            stats = self._stats.get((kind, name))
+            if stats is None:
+                stats = self._stats[(kind, name)] = CallStats()
+            stats.latency.observe(duration_ms)
+            stats.payload_bytes += payload_bytes
+            stats.max_payload_bytes = max(stats.max_payload_bytes, payload_bytes)
+            if error_code is not None:
+                stats.errors[error_code] += 1
+
+    def get(self, kind: str, name: str) -> CallStats | None:
+        return self._stats.get((kind, name))
+
+    def items(self) -> list[tuple[tuple[str, str], CallStats]]:
+        """Sorted (kind, name), stats pairs; stats are live objects."""
+        with self._lock:
+            return sorted(self._stats.items())
+
+    def add_collector(self, collector: Callable[[], list[MetricFamily]]) -> None:
+        """Register a callable polled for extra metrics at export time."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect_extra(self) -> list[MetricFamily]:
+        with self._lock:
+            collectors = list(self._collectors)
+        families: list[MetricFamily] = []
+        for collector in collectors:
+            families.extend(collector())
+        return families
+
+    def snapshot(self) -> dict:
+        """{kind: {name: summary}} — e.g. {"tool": {"search_policy": {...}}}."""
+        with self._lock:
+            result: dict[str, dict[str, dict]] = {}
+            for (kind, name), stats in sorted(self._stats.items()):
+                result.setdefault(kind, {})[name] = stats.summary()
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._in_flight.clear()
+            self._collectors.clear()
+            self._labels.clear()
+
+
+REGISTRY = MetricsRegistry()
@@ -7,15 +7,42 @@ and the shared AppContext that is initialized at server startup via lifespan.
 
 from __future__ import annotations
 
-import csv
-import json
+import os
 import re
 import sqlite3
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
 
 from src.audit import AuditLogger
+from src.cache import ByteLRUCache, SingleFlight
+from src.executor import BlockingExecutor, ExecutorSaturated
+from src.inventory import (
+    InventoryFilters,
+    InventoryReaders,
+    InventoryPage,
+    build_search_index,
+    create_indexes,
+    create_schema,
+    has_search_index,
+    load_csv,
+    save_snapshot,
+    search_inventory,
+    snapshot_is_current,
+    snapshot_path_for,
+)
+from src.metrics import REGISTRY
+from src.policy_watcher import PolicyWatcher
+from src.search_index import IndexedPolicy, PolicyIndex
+from src.startup import STARTUP
+from src.ticket_store import (
+    TicketFilters,
+    TicketPage,
+    TicketRepository,
+    open_ticket_repository,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -28,6 +55,7 @@ class ErrorCode(str, Enum):
     PERMISSION_DENIED = "PERMISSION_DENIED"
     INTERNAL_ERROR = "INTERNAL_ERROR"
     CONFLICT = "CONFLICT"
+    UNAVAILABLE = "UNAVAILABLE"
 
 
 class ToolError(Exception):
@@ -78,6 +106,19 @@ class Ticket:
 # Application context — initialised once in lifespan
 # ---------------------------------------------------------------------------
 
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+T = TypeVar("T")
+
+# Upper bound for rendered policy:// payloads kept in memory
+POLICY_CACHE_BYTES = 8 * 1024 * 1024
+# Encoded lookup_inventory results, invalidated by inventory_version
+INVENTORY_CACHE_BYTES = int(os.environ.get("INVENTORY_CACHE_BYTES", 4 * 1024 * 1024))
+INVENTORY_CACHE_TTL = float(os.environ.get("INVENTORY_CACHE_TTL", 300))
+
+
 @dataclass
 class AppContext:
     db: sqlite3.Connection
@@ -85,23 +126,75 @@ class AppContext:
     policy_dir: Path
     tickets_file: Path
     audit_logger: AuditLogger
+    policy_index: PolicyIndex | None = None
+    inventory_fts: bool = False
+    # Created (and its mtime/size baseline taken) with the context, so edits
+    # made before the first session starts polling are still picked up
+    policy_watcher: PolicyWatcher | None = field(default=None, repr=False)
+    policy_cache: ByteLRUCache = field(
+        default_factory=lambda: ByteLRUCache(POLICY_CACHE_BYTES), repr=False,
+    )
+    inventory_cache: ByteLRUCache = field(
+        default_factory=lambda: ByteLRUCache(INVENTORY_CACHE_BYTES, ttl=INVENTORY_CACHE_TTL),
+        repr=False,
+    )
+    # Part of every inventory cache key. The inventory is loaded once per
+    # process and never mutated, so this stays fixed for the process
+    # lifetime; anything that reloads or changes ``db`` must bump it.
+    inventory_version: int = 0
+    # Identical concurrent searches share one computation
+    inflight: SingleFlight = field(default_factory=SingleFlight, repr=False)
+    ticket_store: TicketRepository | None = field(default=None, repr=False)
+    executor: BlockingExecutor = field(default_factory=BlockingExecutor, repr=False)
+    # Per-thread read connections lookups run on; built from ``db`` if not given
+    inventory_readers: InventoryReaders | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.policy_index is None:
+            self.policy_index = PolicyIndex.build(self.policies)
+        if self.ticket_store is None:
+            self.ticket_store = open_ticket_repository(self.tickets_file)
+        if self.inventory_readers is None:
+            self.inventory_readers = InventoryReaders.from_connection(self.db)
+        if self.policy_watcher is None:
+            self.policy_watcher = PolicyWatcher(self)
 
     # ------------------------------------------------------------------
     # Factory
     # ------------------------------------------------------------------
     @classmethod
-    def load(cls, base_dir: Path | None = None) -> "AppContext":
+    def load(
+        cls,
+        base_dir: Path | None = None,
+        inventory_snapshot: bool | None = None,
+        ticket_backend: str | None = None,
+    ) -> "AppContext":
         base = base_dir or Path(__file__).resolve().parent.parent
         data_dir = base / "data"
         policy_dir = data_dir / "policies"
 
-        db = cls._init_db(data_dir / "inventory.csv")
-        policies = cls._load_policy_index(policy_dir)
+        if inventory_snapshot is None:
+            inventory_snapshot = _env_flag("INVENTORY_SNAPSHOT")
+        with STARTUP.phase("load: inventory"):
+            inventory_readers = cls._open_inventory(
+                data_dir / "inventory.csv", snapshot=inventory_snapshot,
+            )
+            db = inventory_readers.open()
+            inventory_fts = has_search_index(db)
+        with STARTUP.phase("load: policy scan"):
+            policies = cls._scan_policies(policy_dir)
+        # The search index is parsed on first use, after ``initialize``
+        policy_index = PolicyIndex.build(policies)
 
-        tickets_file = data_dir / "tickets" / "tickets.jsonl"
-        tickets_file.parent.mkdir(parents=True, exist_ok=True)
+        with STARTUP.phase("load: ticket store"):
+            tickets_file = data_dir / "tickets" / "tickets.jsonl"
+            tickets_file.parent.mkdir(parents=True, exist_ok=True)
+            if ticket_backend is None:
+                ticket_backend = os.environ.get("TICKET_BACKEND", "jsonl").strip().lower()
+            ticket_store = open_ticket_repository(tickets_file, ticket_backend)
 
-        audit_logger = AuditLogger(log_dir=base / "logs")
+        with STARTUP.phase("load: audit log"):
+            audit_logger = AuditLogger(log_dir=base / "logs")
 
         return cls(
             db=db,
@@ -109,78 +202,291 @@ class AppContext:
             policy_dir=policy_dir,
             tickets_file=tickets_file,
             audit_logger=audit_logger,
+            policy_index=policy_index,
+            inventory_fts=inventory_fts,
+            inventory_readers=inventory_readers,
+            ticket_store=ticket_store,
+            executor=BlockingExecutor.from_env(),
         )
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
+    @staticmethod
+    def _open_inventory(csv_path: Path, snapshot: bool = False) -> InventoryReaders:
+        """Open the read-only inventory file lookups run on.
+
+        With ``snapshot`` enabled, the DB materialized next to the CSV is
+        read in place while the CSV is unchanged, and rewritten after a
+        re-parse. Otherwise the in-memory build is copied to a temporary
+        file that ``close()`` removes.
+        """
+        snapshot_path = snapshot_path_for(csv_path)
+        if snapshot and snapshot_is_current(csv_path, snapshot_path):
+            return InventoryReaders(snapshot_path)
+
+        db = AppContext._init_db(csv_path)
+        try:
+            if snapshot and csv_path.exists() and save_snapshot(db, csv_path, snapshot_path):
+                return InventoryReaders(snapshot_path)
+            return InventoryReaders.from_connection(db)
+        finally:
+            db.close()
+
     @staticmethod
     def _init_db(csv_path: Path) -> sqlite3.Connection:
-        db = sqlite3.connect(":memory:")
+        """Build the inventory DB in memory from ``csv_path``."""
+        db = sqlite3.connect(":memory:", check_same_thread=False)
         db.row_factory = sqlite3.Row
-        db.execute("""CREATE TABLE inventory (
-            item_id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            category TEXT NOT NULL,
-            quantity INTEGER NOT NULL,
-            location TEXT NOT NULL,
-            status TEXT NOT NULL,
-            last_updated TEXT NOT NULL
-        )""")
+        create_schema(db)
         if csv_path.exists():
-            with csv_path.open(newline="", encoding="utf-8") as f:
-                for row in csv.DictReader(f):
-                    db.execute(
-                        "INSERT INTO inventory VALUES (?,?,?,?,?,?,?)",
-                        (row["item_id"], row["name"], row["category"],
-                         int(row["quantity"]), row["location"],
-                         row["status"], row["last_updated"]),
-                    )
-            db.commit()
+            load_csv(db, csv_path)
+        create_indexes(db)
+        build_search_index(db)
         return db
 
     @staticmethod
-    def _load_policy_index(policy_dir: Path) -> list[PolicyDoc]:
+    def _scan_policies(policy_dir: Path) -> list[PolicyDoc]:
+        """Read each policy file's title and tags (no YAML parsing)."""
         docs: list[PolicyDoc] = []
         if not policy_dir.exists():
             return docs
         for md_file in sorted(policy_dir.glob("*.md")):
-            doc_id = md_file.stem
-            title = doc_id.replace("-", " ").title()
-            tags: list[str] = []
-            # Parse front-matter for title & tags
             text = md_file.read_text(encoding="utf-8")
-            fm_match = re.search(r"^---\s*\n(.*?)\n---", text, re.DOTALL)
-            if fm_match:
-                for line in fm_match.group(1).splitlines():
-                    if line.startswith("title:"):
-                        title = line.split(":", 1)[1].strip()
-                    if line.startswith("tags:"):
-                        raw = line.split(":", 1)[1].strip().strip("[]")
-                        tags = [t.strip() for t in raw.split(",")]
-            docs.append(PolicyDoc(doc_id=doc_id, title=title, path=md_file, tags=tags))
+            docs.append(AppContext._parse_policy_doc(md_file, text))
         return docs
 
+    @staticmethod
+    def _parse_policy_doc(md_file: Path, text: str) -> PolicyDoc:
+        doc_id = md_file.stem
+        title = doc_id.replace("-", " ").title()
+        tags: list[str] = []
+        # Parse front-matter for title & tags
+        fm_match = re.search(r"^---\s*\n(.*?)\n---", text, re.DOTALL)
+        if fm_match:
+            for line in fm_match.group(1).splitlines():
+                if line.startswith("title:"):
+                    title = line.split(":", 1)[1].strip()
+                if line.startswith("tags:"):
+                    raw = line.split(":", 1)[1].strip().strip("[]")
+                    tags = [t.strip() for t in raw.split(",")]
+        return PolicyDoc(doc_id=doc_id, title=title, path=md_file, tags=tags)
+
+    def close(self) -> None:
+        """Release threads, connections and files held by this context.
+
+        Removes the temporary inventory file, if any; the server calls this
+        on shutdown (see server.main).
+        """
+        self.stop_policy_watcher()
+        self.executor.shutdown()
+        self.audit_logger.close()
+        self.ticket_store.close()
+        self.inventory_readers.close()
+        self.db.close()
+
+    # ------------------------------------------------------------------
+    # Pre-forked workers (see src/workers.py)
+    # ------------------------------------------------------------------
+    def before_fork(self) -> None:
+        """Release process-bound handles in the parent before forking.
+
+        SQLite connections must not cross a fork, so the inventory and
+        ticket store connections are closed until ``after_fork`` reopens
+        them. The inventory file itself stays; every worker reads it. The
+        policy search index is built here, once, rather than in every worker.
+        """
+        self.policy_index.warm()
+        self.stop_policy_watcher()
+        self.audit_logger.close()
+        self.ticket_store.close()
+        self.inventory_readers.close_connections()
+        self.db.close()
+
+    def after_fork(self, worker_id: int) -> None:
+        """Re-create per-process state in worker ``worker_id``.
+
+        Policies, the search index and caches stay shared copy-on-write,
+        and the inventory is read from the parent's file, whose pages the
+        OS page cache shares between workers. Connections, threads, the
+        audit log and metrics are per worker; the policy watcher keeps the
+        parent's baseline and polls from the worker once started.
+        """
+        self.db = self.inventory_readers.open()
+        self.ticket_store.reopen()
+        self.executor = BlockingExecutor(self.executor.max_workers, self.executor.max_queue)
+        self.audit_logger = self.audit_logger.for_worker(worker_id)
+        # Each worker counts on its own; keep their /metrics series apart
+        REGISTRY.set_labels(worker=str(worker_id))
+
+    # ------------------------------------------------------------------
+    # Blocking work
+    # ------------------------------------------------------------------
+    async def run_blocking(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run blocking ``fn`` on the shared executor and await its result.
+
+        Raises ToolError(UNAVAILABLE) when the executor queue is full.
+        """
+        try:
+            return await self.executor.run(fn, *args, **kwargs)
+        except ExecutorSaturated:
+            raise ToolError(
+                ErrorCode.UNAVAILABLE,
+                "서버가 혼잡합니다. 잠시 후 다시 시도하세요",
+            ) from None
+
+    # ------------------------------------------------------------------
+    # Policy lookup & hot reload
+    # ------------------------------------------------------------------
+    def get_policy(self, doc_id: str) -> PolicyDoc | None:
+        """O(1) lookup by doc_id in the current policy snapshot."""
+        return self.policy_index.get_policy(doc_id)
+
+    def reload_policies(self, changed: set[Path]) -> None:
+        """Re-parse only ``changed`` policy files and swap in a new index.
+
+        Unchanged documents are reused from the current snapshot, deleted
+        files drop out, and the new PolicyIndex (which carries the PolicyDoc
+        list) replaces the old one in a single assignment, so concurrent
+        readers always see a consistent snapshot.
+        """
+        current = self.policy_index
+        previous = {doc.doc_id: doc for doc in current.policies}
+        # A snapshot nobody has searched yet has no parsed entries to reuse;
+        # its replacement stays deferred as well
+        parsed = current.parsed
+
+        policies: list[PolicyDoc] = []
+        indexed: list[IndexedPolicy] = []
+        for md_file in sorted(self.policy_dir.glob("*.md")):
+            doc_id = md_file.stem
+            entry = current.get(doc_id) if parsed else None
+            if md_file in changed or doc_id not in previous or (parsed and entry is None):
+                try:
+                    text = md_file.read_text(encoding="utf-8")
+                except OSError:
+                    continue  # removed between glob and read
+                doc = self._parse_policy_doc(md_file, text)
+                if parsed:
+                    entry = IndexedPolicy.from_doc(doc, text)
+            else:
+                doc = previous[doc_id]
+            policies.append(doc)
+            if parsed:
+                indexed.append(entry)
+
+        self.policy_index = PolicyIndex(indexed if parsed else None, policies=policies)
+        self.policies = policies
+
+    # ------------------------------------------------------------------
+    # Inventory
+    # ------------------------------------------------------------------
+    def search_inventory(
+        self,
+        sanitized: str,
+        limit: int,
+        filters: InventoryFilters | None = None,
+        after: int | None = None,
+    ) -> InventoryPage:
+        """One page of inventory matches (timed as db/inventory.search).
+
+        Runs on the calling thread's own read connection, so lookups from
+        different executor threads overlap instead of queueing on one lock.
+        """
+        db = self.inventory_readers.connection()
+        with REGISTRY.timer("db", "inventory.search"):
+            return search_inventory(
+                db, sanitized, limit,
+                use_fts=self.inventory_fts, filters=filters, after=after,
+            )
+
+    def start_policy_watcher(self, interval: float = 2.0) -> None:
+        """Start polling the policy directory for edits (no-op if running).
+
+        Changes since the context was loaded are picked up on the first poll.
+        """
+        self.policy_watcher.start(interval)
+
+    def stop_policy_watcher(self) -> None:
+        self.policy_watcher.stop()
+
     # ------------------------------------------------------------------
     # Ticket helpers
     # ------------------------------------------------------------------
+    def iter_tickets(
+        self,
+        predicate: Callable[[Ticket], bool] | None = None,
+        limit: int | None = None,
+    ) -> Iterator[Ticket]:
+        """Stream tickets in creation order, holding one record at a time.
+
+        Stops reading as soon as ``limit`` matching tickets were yielded.
+        """
+        if limit is not None and limit <= 0:
+            return
+        yielded = 0
+        for d in self.ticket_store.iter_all():
+            ticket = Ticket(**d)
+            if predicate is not None and not predicate(ticket):
+                continue
+            yield ticket
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+
     def load_tickets(self) -> list[Ticket]:
-        tickets: list[Ticket] = []
-        if not self.tickets_file.exists():
-            return tickets
-        for line in self.tickets_file.read_text(encoding="utf-8").strip().splitlines():
-            if line.strip():
-                d = json.loads(line)
-                tickets.append(Ticket(**d))
-        return tickets
+        return list(self.iter_tickets())
 
     def next_ticket_id(self) -> str:
-        existing = self.load_tickets()
-        if not existing:
-            return "TKT-006"
-        nums = [int(t.ticket_id.split("-")[1]) for t in existing]
-        return f"TKT-{max(nums) + 1:03d}"
+        with REGISTRY.timer("db", "tickets.allocate_id"):
+            return self.ticket_store.allocate_id()
+
+    def get_ticket(self, ticket_id: str) -> Ticket | None:
+        with REGISTRY.timer("db", "tickets.get"):
+            d = self.ticket_store.get(ticket_id)
+        return Ticket(**d) if d else None
+
+    def query_tickets(
+        self,
+        filters: TicketFilters | None = None,
+        limit: int = 20,
+        after: int | None = None,
+    ) -> TicketPage:
+        """Indexed, cursor-paged ticket listing (records stay plain dicts)."""
+        with REGISTRY.timer("db", "tickets.query"):
+            return self.ticket_store.query(filters, limit=limit, after=after)
+
+    def find_ticket_by_idempotency_key(self, key: str) -> Ticket | None:
+        """Indexed lookup in the ticket store instead of a full file scan."""
+        with REGISTRY.timer("db", "tickets.find_by_idempotency_key"):
+            d = self.ticket_store.find_by_idempotency_key(key)
+        return Ticket(**d) if d else None
 
     def append_ticket(self, ticket: Ticket) -> None:
-        with self.tickets_file.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(ticket.__dict__, ensure_ascii=False) + "\n")
+        with REGISTRY.timer("db", "tickets.append"):
+            self.ticket_store.append(asdict(ticket))
+
+    def create_ticket(
+        self,
+        title: str,
+        priority: str,
+        body: str,
+        idempotency_key: str | None = None,
+    ) -> tuple[Ticket, bool]:
+        """Create an open ticket with the next ID, or return the ticket
+        already created for ``idempotency_key`` (by any process).
+
+        The flag is True if a ticket was created.
+        """
+        ticket = Ticket(
+            ticket_id="",  # assigned by the store
+            title=title,
+            priority=priority,
+            body=body,
+            status="open",
+            created_at=datetime.now(timezone.utc).isoformat(),
+            idempotency_key=idempotency_key,
+        )
+        with REGISTRY.timer("db", "tickets.create"):
+            d, created = self.ticket_store.create_if_new(asdict(ticket))
+        return Ticket(**d), created
@@ -0,0 +1,82 @@
+"""
+Policy watcher — hot-reloads policy documents without a server restart.
+
+Polls ``data/policies/*.md`` for (mtime, size) changes on a daemon thread
+and hands the changed paths to ``AppContext.reload_policies``, which
+re-parses only those files and atomically swaps in a new search index.
+Polling keeps this dependency-free and portable (inotify is Linux-only).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.models import AppContext
+
+logger = logging.getLogger(__name__)
+
+
+class PolicyWatcher:
+    def __init__(self, app: "AppContext", interval: float = 2.0) -> None:
+        self._app = app
+        self._interval = interval
+        self._signatures = self._scan()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        signatures: dict[Path, tuple[int, int]] = {}
+        if not self._app.policy_dir.exists():
+            return signatures
+        for md_file in self._app.policy_dir.glob("*.md"):
+            try:
+                stat = md_file.stat()
+            except OSError:
+                continue
+            signatures[md_file] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def poll(self) -> bool:
+        """Check once for changes; returns True if the index was swapped."""
+        current = self._scan()
+        if current == self._signatures:
+            return False
+        changed = {
+            path for path, sig in current.items()
+            if self._signatures.get(path) != sig
+        }
+        self._app.reload_policies(changed)
+        self._signatures = current
+        return True
+
+    def start(self, interval: float | None = None) -> None:
+        if self.running:
+            return
+        if interval is not None:
+            self._interval = interval
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="policy-watcher", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Policy reload failed; keeping previous index")
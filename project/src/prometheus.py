@@ -0,0 +1,178 @@
+"""
+Prometheus text exposition of the in-process metrics.
+
+Served at ``GET /metrics`` next to ``/mcp`` on the streamable-http
+transport. Everything is rendered from in-memory counters at scrape time:
+
+  mcp_requests_total{kind,name}             counter
+  mcp_request_errors_total{kind,name,code}  counter
+  mcp_requests_in_flight{kind,name}         gauge
+  mcp_request_duration_seconds{kind,name}   histogram
+  mcp_db_query_duration_seconds{name}       histogram
+  mcp_response_bytes_total{kind,name}       counter
+  mcp_audit_queue_depth                     gauge
+  mcp_executor_pending                      gauge
+  mcp_executor_rejected_total               counter
+  mcp_singleflight_shared_total             counter
+  mcp_cache_{hits,misses}_total{cache}      counter
+  mcp_cache_hit_ratio{cache}                gauge
+
+The registry's constant labels are added to every series; in ``--workers``
+mode that is ``worker="<n>"``, since each worker counts on its own (sum
+with ``without (worker)`` for the server-wide view).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+from src.metrics import REGISTRY, CallStats, MetricFamily, MetricsRegistry
+
+if TYPE_CHECKING:
+    from src.models import AppContext
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+    return f"{{{inner}}}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, labels: dict[str, str], stats: CallStats) -> list[str]:
+    hist = stats.latency
+    lines: list[str] = []
+    cumulative = 0
+    for bound, count in zip(hist.bounds, hist.counts):
+        cumulative += count
+        le = _number(bound / 1000)
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': le})} {cumulative}")
+    lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {hist.count}")
+    lines.append(f"{name}_sum{_labels(labels)} {_number(hist.total / 1000)}")
+    lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+    return lines
+
+
+def _family(family: MetricFamily, base: dict[str, str]) -> list[str]:
+    lines = [
+        f"# HELP {family.name} {family.help}",
+        f"# TYPE {family.name} {family.type}",
+    ]
+    lines.extend(
+        f"{family.name}{_labels({**base, **labels})} {_number(value)}"
+        for labels, value in family.samples
+    )
+    return lines
+
+
+def render(registry: MetricsRegistry = REGISTRY) -> str:
+    """Render the registry (and its collectors) in text format 0.0.4."""
+    items = registry.items()
+    base = registry.labels
+    calls = [(key, stats) for key, stats in items if key[0] != "db"]
+    queries = [(key, stats) for key, stats in items if key[0] == "db"]
+
+    requests = MetricFamily("mcp_requests_total", "counter", "Completed MCP handler calls.")
+    errors = MetricFamily("mcp_request_errors_total", "counter", "Failed MCP handler calls by error code.")
+    payload = MetricFamily("mcp_response_bytes_total", "counter", "Response payload bytes.")
+    for (kind, name), stats in calls:
+        labels = {"kind": kind, "name": name}
+        requests.samples.append((labels, stats.latency.count))
+        payload.samples.append((labels, stats.payload_bytes))
+        for code, count in sorted(stats.errors.items()):
+            errors.samples.append(({**labels, "code": code}, count))
+
+    in_flight = MetricFamily("mcp_requests_in_flight", "gauge", "MCP handler calls in progress.")
+    for (kind, name), count in sorted(registry.in_flight().items()):
+        in_flight.samples.append(({"kind": kind, "name": name}, count))
+
+    lines: list[str] = []
+    for family in (requests, errors, in_flight, payload):
+        lines.extend(_family(family, base))
+
+    lines += [
+        "# HELP mcp_request_duration_seconds MCP handler latency.",
+        "# TYPE mcp_request_duration_seconds histogram",
+    ]
+    for (kind, name), stats in calls:
+        lines += _histogram_lines(
+            "mcp_request_duration_seconds", {**base, "kind": kind, "name": name}, stats,
+        )
+    lines += [
+        "# HELP mcp_db_query_duration_seconds Inventory and ticket store query latency.",
+        "# TYPE mcp_db_query_duration_seconds histogram",
+    ]
+    for (_, name), stats in queries:
+        lines += _histogram_lines(
+            "mcp_db_query_duration_seconds", {**base, "name": name}, stats,
+        )
+
+    for family in registry.collect_extra():
+        lines.extend(_family(family, base))
+    return "\n".join(lines) + "\n"
+
+
+def app_collector(app: "AppContext") -> Callable[[], list[MetricFamily]]:
+    """Gauges read from the AppContext at scrape time."""
+
+    def collect() -> list[MetricFamily]:
+        caches = {
+            "policy": app.policy_cache.stats(),
+            "inventory": app.inventory_cache.stats(),
+        }
+        hits = MetricFamily("mcp_cache_hits_total", "counter", "Cache hits.")
+        misses = MetricFamily("mcp_cache_misses_total", "counter", "Cache misses.")
+        ratio = MetricFamily("mcp_cache_hit_ratio", "gauge", "Cache hits / lookups.")
+        for cache, stats in caches.items():
+            labels = {"cache": cache}
+            hits.samples.append((labels, stats["hits"]))
+            misses.samples.append((labels, stats["misses"]))
+            ratio.samples.append((labels, stats["hit_ratio"]))
+        return [
+            MetricFamily(
+                "mcp_audit_queue_depth", "gauge", "Audit entries buffered but not yet written.",
+                [({}, app.audit_logger.pending)],
+            ),
+            MetricFamily(
+                "mcp_executor_pending", "gauge",
+                "Blocking calls running or queued on the shared executor.",
+                [({}, app.executor.pending)],
+            ),
+            MetricFamily(
+                "mcp_executor_rejected_total", "counter",
+                "Blocking calls rejected because the executor queue was full.",
+                [({}, app.executor.rejected)],
+            ),
+            MetricFamily(
+                "mcp_singleflight_shared_total", "counter",
+                "Calls that joined an identical in-flight search instead of running it.",
+                [({}, app.inflight.shared)],
+            ),
+            hits,
+            misses,
+            ratio,
+        ]
+
+    return collect
+
+
+def register(mcp, registry: MetricsRegistry = REGISTRY) -> None:
+    """Register the /metrics HTTP route (streamable-http / sse transports)."""
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    @mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+    async def metrics(request: Request) -> Response:
+        return Response(render(registry), media_type=CONTENT_TYPE)
@@ -0,0 +1,62 @@
+"""
+Deferred registration of tools, resources and prompts.
+
+A stdio server is spawned per UI connection and has to answer
+``initialize`` before anything else; the handler modules under
+``src/tools``, ``src/resources`` and ``src/prompts`` are only needed once
+the client lists or calls something. ``LazyFastMCP`` runs its ``register``
+callback (which imports those modules) on the first such request, or when
+``ensure_registered()`` is called, e.g. before forking HTTP workers.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from mcp.server.fastmcp import FastMCP
+
+
+class LazyFastMCP(FastMCP):
+    """FastMCP that registers its handlers on first use."""
+
+    def __init__(self, *args: Any, register: Callable[[FastMCP], None], **kwargs: Any) -> None:
+        self._register = register
+        self._registered = False
+        super().__init__(*args, **kwargs)
+
+    @property
+    def registered(self) -> bool:
+        return self._registered
+
+    def ensure_registered(self) -> None:
+        if not self._registered:
+            self._registered = True
+            self._register(self)
+
+    async def list_tools(self):
+        self.ensure_registered()
+        return await super().list_tools()
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]):
+        self.ensure_registered()
+        return await super().call_tool(name, arguments)
+
+    async def list_resources(self):
+        self.ensure_registered()
+        return await super().list_resources()
+
+    async def read_resource(self, uri):
+        self.ensure_registered()
+        return await super().read_resource(uri)
+
+    async def list_resource_templates(self):
+        self.ensure_registered()
+        return await super().list_resource_templates()
+
+    async def list_prompts(self):
+        self.ensure_registered()
+        return await super().list_prompts()
+
+    async def get_prompt(self, name: str, arguments: dict[str, Any] | None = None):
+        self.ensure_registered()
+        return await super().get_prompt(name, arguments)
@@ -0,0 +1,25 @@
+"""
+Resources: metrics
+
+Exposes in-process call metrics as an MCP resource:
+- metrics://calls — per tool/resource/prompt call counts, error codes,
+  latency percentiles (p50/p95/p99) and payload sizes (JSON)
+"""
+
+from __future__ import annotations
+
+from src.encoding import encode
+from src.metrics import REGISTRY
+
+
+def register(mcp) -> None:
+    """Register metrics resources on the MCP server."""
+
+    @mcp.resource("metrics://calls", mime_type="application/json")
+    async def call_metrics() -> str:
+        """Return latency and outcome metrics for every instrumented handler.
+
+        Keys are grouped by kind ("tool", "resource", "prompt") and then by
+        tool/prompt name or resource URI.
+        """
+        return encode(REGISTRY.snapshot())
@@ -3,13 +3,13 @@ Resources: policy
 
 Exposes policy documents as MCP resources:
 - policy://index  — list of all available policies (JSON)
+- policy://index/version — content hash of the index, for cheap change checks
 - policy://{doc_id} — full content of a specific policy (JSON)
 """
 
 from __future__ import annotations
 
-import json
-
+from src.encoding import encode
 from src.models import AppContext, ErrorCode, ToolError
 from src.validation import validate_doc_id
 
@@ -27,15 +27,24 @@ def register(mcp) -> None:
         ctx = mcp.get_context()
         app: AppContext = ctx.request_context.lifespan_context["app"]
 
-        index = [
-            {
-                "doc_id": doc.doc_id,
-                "title": doc.title,
-                "tags": doc.tags,
-            }
-            for doc in app.policies
-        ]
-        return json.dumps(index, ensure_ascii=False, indent=2)
+        # Serialized once per index snapshot; hot reload swaps in a new one
+        return app.policy_index.index_payload
+
+    @mcp.resource("policy://index/version", mime_type="application/json")
+    async def policy_index_version() -> str:
+        """Return the current version (content hash) of policy://index.
+
+        Clients can poll this small payload and re-fetch policy://index
+        only when the version changes.
+        """
+        ctx = mcp.get_context()
+        app: AppContext = ctx.request_context.lifespan_context["app"]
+
+        index = app.policy_index
+        return encode({
+            "version": index.index_version,
+            "count": len(index.policies),
+        }, "compact")
 
     @mcp.resource("policy://{doc_id}", mime_type="application/json")
     async def policy_detail(doc_id: str) -> str:
@@ -55,24 +64,36 @@ def register(mcp) -> None:
         ctx = mcp.get_context()
         app: AppContext = ctx.request_context.lifespan_context["app"]
 
-        policy = next(
-            (p for p in app.policies if p.doc_id == validated_id),
-            None,
-        )
+        policy = app.get_policy(validated_id)
         if policy is None:
             raise ToolError(
                 ErrorCode.NOT_FOUND,
                 f"No policy document found with ID '{validated_id}'.",
             )
-        if not policy.path.exists():
-            raise ToolError(
-                ErrorCode.NOT_FOUND,
-                f"Policy file for '{validated_id}' not found on disk.",
-            )
 
-        content = policy.path.read_text(encoding="utf-8")
-        return json.dumps({
-            "doc_id": policy.doc_id,
-            "title": policy.title,
-            "content": content,
-        }, ensure_ascii=False, indent=2)
+        def render() -> str:
+            try:
+                stat = policy.path.stat()
+            except FileNotFoundError:
+                raise ToolError(
+                    ErrorCode.NOT_FOUND,
+                    f"Policy file for '{validated_id}' not found on disk.",
+                ) from None
+
+            # Rendered payloads are cached until the file's mtime/size changes
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = app.policy_cache.get(policy.doc_id, version)
+            if cached is not None:
+                return cached
+
+            content = policy.path.read_text(encoding="utf-8")
+            payload = encode({
+                "doc_id": policy.doc_id,
+                "title": policy.title,
+                "content": content,
+            })
+            app.policy_cache.put(policy.doc_id, version, payload)
+            return payload
+
+        # stat() and the file read happen on the shared executor
+        return await app.run_blocking(render)
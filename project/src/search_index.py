@@ -0,0 +1,333 @@
+"""
+Policy search index.
+
+Parses every policy document once (front-matter + body) and keeps a
+tokenized inverted index in memory so that ``search_policy`` never has to
+touch the disk or re-run YAML parsing per query.
+
+Index layout:
+  term -> {doc_id: Posting(title_tf, tag_tf, body_tf)}
+
+Alongside the postings the index keeps per-field document lengths and
+their averages, which is everything BM25F needs at query time.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from src.encoding import encode
+
+if TYPE_CHECKING:
+    from src.models import PolicyDoc
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# BM25F parameters — field boosts mirror the legacy title/tag/body weights
+FIELDS = ("title", "tag", "body")
+FIELD_WEIGHTS = {"title": 3.0, "tag": 2.0, "body": 0.5}
+FIELD_B = {"title": 0.75, "tag": 0.0, "body": 0.75}
+BM25_K1 = 1.2
+
+
+# ---------------------------------------------------------------------------
+# Parsing helpers
+# ---------------------------------------------------------------------------
+
+def parse_frontmatter(content: str) -> tuple[dict, str]:
+    """YAML front-matter와 본문을 분리합니다.
+
+    yaml은 첫 파싱 때 import합니다 (서버 import 시간 절약).
+    """
+    pattern = r"^---\s*\n(.*?)\n---\s*\n(.*)$"
+    match = re.match(pattern, content, re.DOTALL)
+    if match:
+        import yaml
+
+        meta = yaml.safe_load(match.group(1)) or {}
+        body = match.group(2)
+        return meta, body
+    return {}, content
+
+
+def tokenize(text: str) -> list[str]:
+    """소문자화한 텍스트를 단어 토큰으로 분리합니다."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def select_page(
+    scored: list[tuple["IndexedPolicy", float]],
+    limit: int,
+    offset: int = 0,
+) -> list[tuple["IndexedPolicy", float]]:
+    """점수 상위 offset+limit 건만 힙으로 선택해 요청한 페이지를 반환합니다.
+
+    동점인 항목은 전체 정렬(stable sort)과 동일하게 원래 순서를 유지합니다.
+    """
+    top = heapq.nlargest(offset + limit, scored, key=lambda item: item[1])
+    return top[offset:]
+
+
+# ---------------------------------------------------------------------------
+# Index records
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Posting:
+    title_tf: int = 0
+    tag_tf: int = 0
+    body_tf: int = 0
+
+    def tf(self, field_name: str) -> int:
+        return getattr(self, f"{field_name}_tf")
+
+
+@dataclass
+class IndexedPolicy:
+    """A policy document parsed once and kept in memory for searching."""
+
+    doc_id: str
+    title: str
+    tags: list[str]
+    last_updated: str
+    body: str
+    title_lower: str = ""
+    tags_lower: list[str] = field(default_factory=list)
+    body_lower: str = ""
+
+    def __post_init__(self) -> None:
+        self.title_lower = self.title.lower()
+        self.tags_lower = [t.lower() for t in self.tags]
+        self.body_lower = self.body.lower()
+
+    @classmethod
+    def from_doc(cls, doc: "PolicyDoc", content: str | None = None) -> "IndexedPolicy":
+        if content is None:
+            content = doc.path.read_text(encoding="utf-8")
+        meta, body = parse_frontmatter(content)
+        return cls(
+            doc_id=doc.doc_id,
+            title=str(meta.get("title", doc.title)),
+            tags=[str(t) for t in meta.get("tags", [])],
+            last_updated=str(meta.get("last_updated", "")),
+            body=body,
+        )
+
+    @cached_property
+    def term_frequencies(self) -> dict[str, Posting]:
+        """필드별 토큰 출현 빈도를 계산합니다 (문서당 한 번만 계산)."""
+        postings: dict[str, Posting] = {}
+        fields = (
+            ("title_tf", tokenize(self.title)),
+            ("tag_tf", [tok for tag in self.tags for tok in tokenize(tag)]),
+            ("body_tf", tokenize(self.body)),
+        )
+        for attr, tokens in fields:
+            for term, count in Counter(tokens).items():
+                posting = postings.setdefault(term, Posting())
+                setattr(posting, attr, getattr(posting, attr) + count)
+        return postings
+
+
+# ---------------------------------------------------------------------------
+# Inverted index
+# ---------------------------------------------------------------------------
+
+class PolicyIndex:
+    """Immutable snapshot of all searchable policy documents.
+
+    The snapshot also carries the ``PolicyDoc`` list it was built from, so a
+    reload can replace both with a single attribute assignment.
+
+    Without pre-parsed ``docs``, the policy files are parsed (YAML
+    front-matter included) and indexed on first search or lookup, not when
+    the snapshot is created; the policy://index listing only needs the
+    ``PolicyDoc`` list. ``warm()`` builds everything up front.
+    """
+
+    def __init__(
+        self,
+        docs: list[IndexedPolicy] | None = None,
+        policies: list["PolicyDoc"] | None = None,
+    ) -> None:
+        self.policies = policies if policies is not None else []
+        self._policies_by_id = {doc.doc_id: doc for doc in self.policies}
+        if docs is not None:
+            self.docs = docs
+
+    @classmethod
+    def build(cls, policies: list["PolicyDoc"]) -> "PolicyIndex":
+        return cls(policies=policies)
+
+    @cached_property
+    def docs(self) -> list[IndexedPolicy]:
+        """Parsed documents, read from the ``policies`` files on first use."""
+        return [IndexedPolicy.from_doc(doc) for doc in self.policies if doc.path.exists()]
+
+    @cached_property
+    def postings(self) -> dict[str, dict[str, Posting]]:
+        postings: dict[str, dict[str, Posting]] = {}
+        for doc in self.docs:
+            for term, posting in doc.term_frequencies.items():
+                postings.setdefault(term, {})[doc.doc_id] = posting
+        return postings
+
+    @cached_property
+    def field_lengths(self) -> dict[str, dict[str, int]]:
+        field_lengths: dict[str, dict[str, int]] = {}
+        for doc in self.docs:
+            lengths = dict.fromkeys(FIELDS, 0)
+            for posting in doc.term_frequencies.values():
+                for name in FIELDS:
+                    lengths[name] += posting.tf(name)
+            field_lengths[doc.doc_id] = lengths
+        return field_lengths
+
+    @cached_property
+    def avg_field_lengths(self) -> dict[str, float]:
+        docs = self.field_lengths.values()
+        return {
+            name: sum(l[name] for l in docs) / len(docs) if docs else 0.0
+            for name in FIELDS
+        }
+
+    @cached_property
+    def vocabulary(self) -> list[str]:
+        return sorted(self.postings)
+
+    @cached_property
+    def _by_id(self) -> dict[str, IndexedPolicy]:
+        return {doc.doc_id: doc for doc in self.docs}
+
+    @property
+    def parsed(self) -> bool:
+        """Whether the policy files have been parsed into ``docs`` yet."""
+        return "docs" in vars(self)
+
+    def warm(self) -> None:
+        """Parse and index now (e.g. in a pre-fork parent, to share it)."""
+        for name in ("postings", "field_lengths", "avg_field_lengths", "vocabulary", "_by_id"):
+            getattr(self, name)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def get(self, doc_id: str) -> IndexedPolicy | None:
+        return self._by_id.get(doc_id)
+
+    def get_policy(self, doc_id: str) -> "PolicyDoc | None":
+        return self._policies_by_id.get(doc_id)
+
+    # ------------------------------------------------------------------
+    # policy://index payload (computed once per snapshot)
+    # ------------------------------------------------------------------
+    @cached_property
+    def index_listing(self) -> list[dict]:
+        """policy://index entries for this snapshot."""
+        return [
+            {"doc_id": doc.doc_id, "title": doc.title, "tags": doc.tags}
+            for doc in self.policies
+        ]
+
+    @cached_property
+    def index_payload(self) -> str:
+        """Serialized policy://index listing for this snapshot."""
+        return encode(self.index_listing)
+
+    @cached_property
+    def index_version(self) -> str:
+        """Content hash of ``index_listing``; usable as an ETag.
+
+        Hashed over a canonical form, not ``index_payload``, so the version
+        does not depend on the configured response format.
+        """
+        canonical = json.dumps(
+            self.index_listing, ensure_ascii=False, sort_keys=True, separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def matching_terms(self, token: str) -> list[str]:
+        """Return indexed terms containing ``token`` (substring semantics).
+
+        This walks the vocabulary, not the corpus: Korean particles glue onto
+        nouns ("VPN을"), so an exact term lookup alone would miss matches.
+        """
+        return [term for term in self.postings if token in term]
+
+    def candidates(self, query: str) -> list[IndexedPolicy]:
+        """Return the documents that can possibly contain ``query``.
+
+        A substring match of the query in a title, tag or body implies that
+        every query token is a substring of some token in that field, so
+        intersecting the postings of the expanded terms never drops a
+        document the substring scorer would have matched.
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return list(self.docs)
+
+        doc_ids: set[str] | None = None
+        for token in tokens:
+            matched: set[str] = set()
+            for term in self.matching_terms(token):
+                matched.update(self.postings[term])
+            doc_ids = matched if doc_ids is None else doc_ids & matched
+            if not doc_ids:
+                return []
+        return [doc for doc in self.docs if doc.doc_id in doc_ids]
+
+    # ------------------------------------------------------------------
+    # BM25F
+    # ------------------------------------------------------------------
+    def prefix_terms(self, token: str) -> list[str]:
+        """Return indexed terms starting with ``token`` (binary search)."""
+        terms: list[str] = []
+        pos = bisect.bisect_left(self.vocabulary, token)
+        while pos < len(self.vocabulary) and self.vocabulary[pos].startswith(token):
+            terms.append(self.vocabulary[pos])
+            pos += 1
+        return terms
+
+    def bm25f(self, query: str) -> list[tuple[IndexedPolicy, float]]:
+        """Score documents with BM25F using the precomputed field statistics.
+
+        Each query token is matched as a prefix so that Korean particles
+        ("VPN을", "보안은") still count towards the stem. Only documents in
+        the postings of the query terms are ever touched.
+        """
+        total_docs = len(self.docs)
+        scores: dict[str, float] = {}
+
+        for token in set(tokenize(query)):
+            field_tf: dict[str, dict[str, int]] = {}
+            for term in self.prefix_terms(token):
+                for doc_id, posting in self.postings[term].items():
+                    tf = field_tf.setdefault(doc_id, dict.fromkeys(FIELDS, 0))
+                    for name in FIELDS:
+                        tf[name] += posting.tf(name)
+            if not field_tf:
+                continue
+
+            df = len(field_tf)
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in field_tf.items():
+                lengths = self.field_lengths[doc_id]
+                weighted = 0.0
+                for name in FIELDS:
+                    if not tf[name]:
+                        continue
+                    avg = self.avg_field_lengths[name] or 1.0
+                    norm = 1 - FIELD_B[name] + FIELD_B[name] * lengths[name] / avg
+                    weighted += FIELD_WEIGHTS[name] * tf[name] / norm
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * weighted / (BM25_K1 + weighted)
+
+        return [(self._by_id[doc_id], score) for doc_id, score in scores.items()]
@@ -9,40 +9,139 @@ Streamable HTTP transports.
 from __future__ import annotations
 
 import argparse
+import os
+import signal
 import sys
 from contextlib import asynccontextmanager
 
-from mcp.server.fastmcp import FastMCP
+from src.startup import STARTUP
 
-from src.models import AppContext
+# Stdio servers start once per UI connection; time every phase so the
+# cost before ``initialize`` shows up in --startup-report
+with STARTUP.phase("imports: mcp"):
+    from mcp.server.fastmcp import FastMCP
 
+    from src.registration import LazyFastMCP
 
-@asynccontextmanager
-async def app_lifespan(server: FastMCP):
-    """Load shared state once at startup and inject via context."""
-    ctx = AppContext.load()
-    yield {"app": ctx}
+with STARTUP.phase("imports: app"):
+    from src.encoding import set_default_format
+    from src.instrument import instrument_server
+    from src.metrics import REGISTRY
+    from src.models import AppContext
+    from src.prometheus import app_collector
+    from src.prometheus import register as register_prometheus
 
+# Seconds between policy directory polls; 0 disables hot reload
+POLICY_RELOAD_INTERVAL = float(os.environ.get("POLICY_RELOAD_INTERVAL", "2.0"))
 
-mcp = FastMCP(
-    "internal-ops-assistant",
-    lifespan=app_lifespan,
-)
+_app: AppContext | None = None
+_active_sessions = 0
 
-# ------------------------------------------------------------------
-# Register components (imported for side-effects)
-# ------------------------------------------------------------------
-from src.tools.lookup_inventory import register as _reg_inv      # noqa: E402, F401
-from src.tools.search_policy import register as _reg_search       # noqa: E402, F401
-from src.tools.create_ticket import register as _reg_ticket       # noqa: E402, F401
-from src.resources.policy import register as _reg_policy          # noqa: E402, F401
-from src.prompts.templates import register as _reg_prompts        # noqa: E402, F401
 
-_reg_inv(mcp)
-_reg_search(mcp)
-_reg_ticket(mcp)
-_reg_policy(mcp)
-_reg_prompts(mcp)
+def load_app() -> AppContext:
+    """Load the shared AppContext once per process (or pre-fork parent)."""
+    global _app
+    if _app is None:
+        _app = AppContext.load()
+        REGISTRY.add_collector(app_collector(_app))
+    return _app
+
+
+def start_app(app: AppContext) -> None:
+    """Count one more active session; the first starts the policy watcher."""
+    global _active_sessions
+    if _active_sessions == 0 and POLICY_RELOAD_INTERVAL > 0:
+        app.start_policy_watcher(POLICY_RELOAD_INTERVAL)
+    _active_sessions += 1
+
+
+def close_app() -> None:
+    """Release the process's AppContext on shutdown.
+
+    Removes the temporary inventory file (see ``InventoryReaders``), which
+    outlives every MCP session, so this runs when the server exits rather
+    than in the lifespan.
+    """
+    global _app
+    if _app is not None:
+        _app.close()
+        _app = None
+
+
+def _exit_on_signal(signum: int, frame) -> None:
+    # SIGTERM would otherwise kill the process without running close_app().
+    # SystemExit can't stop the stdio transport (it waits on a thread blocked
+    # reading stdin), so clean up here and exit at once. uvicorn and the
+    # pre-fork parent install their own handlers and shut down gracefully.
+    close_app()
+    os._exit(128 + signum)
+
+
+def pin_worker_state() -> None:
+    """Keep per-process state alive for a pre-forked worker's lifetime.
+
+    Workers serve stateless requests, each entering the lifespan; holding
+    one extra "session" stops the watcher from being started and stopped
+    (and the audit log from being flushed) on every request.
+    """
+    start_app(load_app())
+
+
+@asynccontextmanager
+async def app_lifespan(server: FastMCP):
+    """Load shared state once at startup and inject via context.
+
+    Streamable HTTP enters the lifespan once per session, so the context is
+    loaded by the first session and reused afterwards; the policy watcher
+    runs while at least one session is active, and buffered audit entries
+    are flushed when the last one ends.
+    """
+    global _active_sessions
+    ctx = load_app()
+    start_app(ctx)
+    try:
+        yield {"app": ctx}
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            ctx.stop_policy_watcher()
+            await ctx.audit_logger.aclose()
+
+
+def register_handlers(server: FastMCP) -> None:
+    """Import and register every tool, resource and prompt.
+
+    LazyFastMCP defers this to the first list/call request, so a stdio
+    session answers ``initialize`` without importing the handler modules.
+    """
+    with STARTUP.phase("registration"):
+        from src.prompts.templates import register as register_prompts
+        from src.resources.metrics import register as register_metrics_resource
+        from src.resources.policy import register as register_policy_resources
+        from src.tools.create_ticket import register as register_create_ticket
+        from src.tools.list_tickets import register as register_list_tickets
+        from src.tools.lookup_inventory import register as register_inventory
+        from src.tools.search_policy import register as register_search_policy
+
+        register_inventory(server)
+        register_search_policy(server)
+        register_create_ticket(server)
+        register_list_tickets(server)
+        register_policy_resources(server)
+        register_metrics_resource(server)
+        register_prompts(server)
+
+
+with STARTUP.phase("server setup"):
+    mcp = LazyFastMCP(
+        "internal-ops-assistant",
+        lifespan=app_lifespan,
+        register=register_handlers,
+    )
+    # Every handler registered from now on is timed into src.metrics.REGISTRY
+    instrument_server(mcp)
+    # /metrics is a plain HTTP route, not an MCP request: added up front
+    register_prometheus(mcp)
 
 
 # ------------------------------------------------------------------
@@ -58,16 +157,80 @@ def main() -> None:
     )
     parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--inventory-snapshot",
+        action="store_true",
+        help="Reuse an on-disk inventory DB next to the CSV while it is unchanged",
+    )
+    parser.add_argument(
+        "--ticket-backend",
+        choices=["jsonl", "sqlite"],
+        default=None,
+        help="Ticket storage backend (default: $TICKET_BACKEND or jsonl)",
+    )
+    parser.add_argument(
+        "--response-format",
+        choices=["pretty", "compact", "columnar"],
+        default=None,
+        help="Default encoding of tool/resource responses (default: $RESPONSE_FORMAT or pretty)",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Load the server, print a per-phase startup breakdown and exit",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Pre-forked worker processes for streamable-http (default: 1)",
+    )
     args = parser.parse_args()
-
-    if args.transport == "stdio":
-        mcp.run(transport="stdio")
-    else:
-        mcp.run(
-            transport="streamable-http",
-            host=args.host,
-            port=args.port,
-        )
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1:
+        if args.transport != "streamable-http":
+            parser.error("--workers requires --transport streamable-http")
+        if not hasattr(os, "fork"):
+            parser.error("--workers is not supported on this platform")
+
+    if args.inventory_snapshot:
+        os.environ["INVENTORY_SNAPSHOT"] = "1"
+    if args.ticket_backend:
+        os.environ["TICKET_BACKEND"] = args.ticket_backend
+    if args.response_format:
+        set_default_format(args.response_format)
+
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    try:
+        if args.startup_report:
+            load_app()
+            mcp.ensure_registered()
+            print(STARTUP.report())
+        elif args.transport == "stdio":
+            mcp.run(transport="stdio")
+        else:
+            # Long-lived HTTP servers register up front (before forking workers)
+            mcp.ensure_registered()
+            # FastMCP.run() takes no host/port; they live on the settings
+            mcp.settings.host = args.host
+            mcp.settings.port = args.port
+            if args.workers > 1:
+                from src.workers import serve
+
+                # Requests of one client may land on any worker: no sessions
+                mcp.settings.stateless_http = True
+                # Loaded once here; workers share it (see src/workers.py)
+                serve(
+                    mcp, load_app(), args.host, args.port, args.workers,
+                    worker_init=pin_worker_state,
+                )
+            else:
+                mcp.run(transport="streamable-http")
+    finally:
+        # Workers never get here (they leave through os._exit); the parent
+        # removes the inventory file once they are gone
+        close_app()
 
 
 if __name__ == "__main__":
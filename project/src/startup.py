@@ -0,0 +1,55 @@
+"""
+Startup phase timing for ``--startup-report``.
+
+Stdio servers are spawned once per UI connection, so everything that runs
+before ``initialize`` is answered is paid per session. ``STARTUP`` records
+the wall time of each startup phase (imports, CSV load, policy scan,
+registration, ...) and renders the breakdown, followed by free-form notes
+such as the inventory load rate. It only imports ``time`` so
+the server can import it before anything else.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class StartupTimer:
+    """Ordered (phase, milliseconds) measurements."""
+
+    def __init__(self) -> None:
+        self.phases: list[tuple[str, float]] = []
+        self.notes: list[str] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    def note(self, text: str) -> None:
+        """Add a line printed under the phase table."""
+        self.notes.append(text)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(ms for _, ms in self.phases)
+
+    def as_dict(self) -> dict[str, float]:
+        return {name: round(ms, 3) for name, ms in self.phases}
+
+    def report(self) -> str:
+        width = max((len(name) for name, _ in self.phases), default=0)
+        width = max(width, len("total"))
+        lines = ["Startup phases (ms)"]
+        lines += [f"  {name:<{width}}  {ms:9.1f}" for name, ms in self.phases]
+        lines.append(f"  {'total':<{width}}  {self.total_ms:9.1f}")
+        lines += [f"  {note}" for note in self.notes]
+        return "\n".join(lines)
+
+
+STARTUP = StartupTimer()
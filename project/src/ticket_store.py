@@ -0,0 +1,461 @@
+"""
+Ticket repositories — pluggable storage behind the AppContext ticket helpers.
+
+Two backends share one interface:
+  jsonl   append-only ``tickets.jsonl`` + sidecar TicketIndex (default)
+  sqlite  ``tickets.sqlite3`` in WAL mode with secondary indexes
+
+Tickets cross this boundary as plain dicts keyed by the ``Ticket`` fields,
+so the repositories stay independent of ``src.models``. The SQLite backend
+imports any ``tickets.jsonl`` it finds next to it, resuming from the last
+imported byte offset on later starts.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from src.tickets import (
+    DEFAULT_HIGH_WATER,
+    TICKET_ID_PATTERN,
+    TicketIndex,
+    TicketRef,
+    format_ticket_id,
+)
+
+TICKET_BACKENDS = ("jsonl", "sqlite")
+# Read buffer for streaming tickets.jsonl and batch size for SQLite scans
+STREAM_BUFFER_BYTES = 1024 * 1024
+STREAM_BATCH_SIZE = 500
+TICKET_COLUMNS = (
+    "ticket_id", "title", "priority", "body", "status",
+    "created_at", "idempotency_key", "assigned_to",
+)
+
+
+@dataclass
+class TicketFilters:
+    """Structured list_tickets filters; every field given must match (AND).
+
+    ``created_from`` is an inclusive and ``created_before`` an exclusive
+    bound on the ISO-8601 ``created_at`` string, so both compare
+    lexicographically and can use the created_at index.
+    """
+
+    status: str | None = None
+    priority: str | None = None
+    assigned_to: str | None = None
+    created_from: str | None = None
+    created_before: str | None = None
+
+    def __bool__(self) -> bool:
+        return any(v is not None for v in vars(self).values())
+
+    def matches(self, ref: TicketRef) -> bool:
+        return (
+            (self.status is None or ref.status == self.status)
+            and (self.priority is None or ref.priority == self.priority)
+            and (
+                self.assigned_to is None
+                or (ref.assigned_to or "").lower() == self.assigned_to.lower()
+            )
+            and (self.created_from is None or ref.created_at >= self.created_from)
+            and (self.created_before is None or ref.created_at < self.created_before)
+        )
+
+    def where(self) -> tuple[list[str], list]:
+        clauses: list[str] = []
+        params: list = []
+        if self.status is not None:
+            clauses.append("status = ?")
+            params.append(self.status)
+        if self.priority is not None:
+            clauses.append("priority = ?")
+            params.append(self.priority)
+        if self.assigned_to is not None:
+            clauses.append("assigned_to = ? COLLATE NOCASE")
+            params.append(self.assigned_to)
+        if self.created_from is not None:
+            clauses.append("created_at >= ?")
+            params.append(self.created_from)
+        if self.created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(self.created_before)
+        return clauses, params
+
+
+@dataclass
+class TicketPage:
+    records: list[dict]
+    next_cursor: str | None = None
+
+
+class TicketRepository(ABC):
+    """Storage interface used by AppContext."""
+
+    backend = ""
+
+    @property
+    def lock(self) -> AbstractContextManager:
+        """Held by writers so an append and its index update stay in step."""
+        return self._lock
+
+    @abstractmethod
+    def append(self, record: dict) -> None: ...
+
+    def create_if_new(self, record: dict) -> tuple[dict, bool]:
+        """Give ``record`` the next ticket_id and append it, unless a ticket
+        with its idempotency_key exists; returns ``(ticket, created)``.
+
+        The key check, the ID allocation and the append are one atomic step
+        across processes, so a caller that finds an existing ticket does
+        not use up an ID.
+        """
+        with self.lock:
+            key = record.get("idempotency_key")
+            existing = self.find_by_idempotency_key(key) if key else None
+            if existing is not None:
+                return existing, False
+            record = {**record, "ticket_id": self.allocate_id()}
+            self.append(record)
+            return record, True
+
+    @abstractmethod
+    def get(self, ticket_id: str) -> dict | None: ...
+
+    @abstractmethod
+    def find_by_idempotency_key(self, key: str) -> dict | None: ...
+
+    @abstractmethod
+    def allocate_id(self) -> str: ...
+
+    @abstractmethod
+    def iter_all(self) -> Iterator[dict]:
+        """Stream every ticket in creation order without materializing them."""
+
+    @abstractmethod
+    def query(
+        self,
+        filters: TicketFilters | None = None,
+        limit: int = 20,
+        after: int | None = None,
+    ) -> TicketPage:
+        """One page of tickets in creation order; ``after`` is a prior next_cursor."""
+
+    def close(self) -> None:
+        pass
+
+    def reopen(self) -> None:
+        """Re-create OS handles in a forked worker (after ``close()`` in the parent)."""
+
+
+# ---------------------------------------------------------------------------
+# JSONL
+# ---------------------------------------------------------------------------
+
+class JsonlTicketRepository(TicketRepository):
+    backend = "jsonl"
+
+    def __init__(self, tickets_file: Path) -> None:
+        self.tickets_file = tickets_file
+        self.index = TicketIndex(tickets_file)
+        self._lock = self.index.lock
+
+    def append(self, record: dict) -> None:
+        with self._lock:
+            with self.tickets_file.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.index.refresh()
+
+    def get(self, ticket_id: str) -> dict | None:
+        return self.index.get(ticket_id)
+
+    def find_by_idempotency_key(self, key: str) -> dict | None:
+        return self.index.find_by_idempotency_key(key)
+
+    def allocate_id(self) -> str:
+        return self.index.allocate_id()
+
+    def iter_all(self) -> Iterator[dict]:
+        if not self.tickets_file.exists():
+            return
+        with self.tickets_file.open("rb", buffering=STREAM_BUFFER_BYTES) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def query(
+        self,
+        filters: TicketFilters | None = None,
+        limit: int = 20,
+        after: int | None = None,
+    ) -> TicketPage:
+        """Filter on the index metadata; read only the matched page from disk."""
+        filters = filters or TicketFilters()
+        hits: list[tuple[int, TicketRef]] = []
+        for pos, ref in self.index.scan(after or 0):
+            if filters.matches(ref):
+                hits.append((pos, ref))
+                if len(hits) > limit:
+                    break
+        next_cursor = str(hits[limit - 1][0]) if len(hits) > limit else None
+        records = [self.index.read_at(ref.offset) for _, ref in hits[:limit]]
+        return TicketPage(records=records, next_cursor=next_cursor)
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+class SqliteTicketRepository(TicketRepository):
+    """Tickets in a WAL-mode SQLite file shared safely across processes."""
+
+    backend = "sqlite"
+
+    def __init__(self, db_path: Path, import_from: Path | None = None) -> None:
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self.db = self._connect()
+        self._create_schema()
+        if import_from is not None:
+            self.import_jsonl(import_from)
+
+    def _connect(self) -> sqlite3.Connection:
+        # autocommit; writes use explicit BEGIN IMMEDIATE transactions
+        db = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None,
+        )
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA busy_timeout=5000")
+        return db
+
+    def _create_schema(self) -> None:
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                ticket_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                body TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                idempotency_key TEXT,
+                assigned_to TEXT
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_tickets_id ON tickets (ticket_id);
+            CREATE INDEX IF NOT EXISTS idx_tickets_idempotency_key
+                ON tickets (idempotency_key) WHERE idempotency_key IS NOT NULL;
+            CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets (status);
+            CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets (priority);
+            CREATE INDEX IF NOT EXISTS idx_tickets_created_at ON tickets (created_at);
+            CREATE TABLE IF NOT EXISTS ticket_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+
+    # ------------------------------------------------------------------
+    # Meta helpers (call inside a transaction)
+    # ------------------------------------------------------------------
+    def _meta(self, key: str, default: int = 0) -> int:
+        row = self.db.execute(
+            "SELECT value FROM ticket_meta WHERE key = ?", (key,),
+        ).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key: str, value: int) -> None:
+        self.db.execute(
+            "INSERT INTO ticket_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def _insert(self, records: list[dict], skip_existing: bool = False) -> None:
+        """Insert ``records``; a duplicate ticket_id raises IntegrityError
+        unless ``skip_existing`` (used when re-importing tickets.jsonl)."""
+        verb = "INSERT OR IGNORE" if skip_existing else "INSERT"
+        self.db.executemany(
+            f"{verb} INTO tickets ({', '.join(TICKET_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(TICKET_COLUMNS))})",
+            [tuple(r.get(c) for c in TICKET_COLUMNS) for r in records],
+        )
+        numbers = [
+            int(m.group(1))
+            for m in (TICKET_ID_PATTERN.match(r["ticket_id"]) for r in records)
+            if m
+        ]
+        if numbers:
+            high_water = self._meta("high_water", DEFAULT_HIGH_WATER)
+            self._set_meta("high_water", max(high_water, *numbers))
+
+    # ------------------------------------------------------------------
+    # Import
+    # ------------------------------------------------------------------
+    def import_jsonl(self, tickets_file: Path) -> int:
+        """Copy tickets appended to ``tickets_file`` since the last import.
+
+        Returns the number of lines read. Rows already present (same
+        ticket_id) are skipped, so re-importing a replaced file is safe.
+        """
+        if not tickets_file.exists():
+            return 0
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                start = self._meta("jsonl_imported_bytes")
+                if tickets_file.stat().st_size < start:
+                    start = 0  # file truncated or replaced
+                records: list[dict] = []
+                with tickets_file.open("rb") as f:
+                    f.seek(start)
+                    for line in f:
+                        if not line.strip():
+                            start += len(line)
+                            continue
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            break  # partially written line
+                        start += len(line)
+                if records:
+                    self._insert(records, skip_existing=True)
+                self._set_meta("jsonl_imported_bytes", start)
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return len(records)
+
+    # ------------------------------------------------------------------
+    # Repository interface
+    # ------------------------------------------------------------------
+    def append(self, record: dict) -> None:
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self._insert([record])
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+
+    def create_if_new(self, record: dict) -> tuple[dict, bool]:
+        """Lookup, ID allocation and insert in one write transaction.
+
+        ``lock`` only excludes threads of this process; BEGIN IMMEDIATE
+        takes SQLite's write lock, so pre-forked workers sharing the file
+        cannot both create a ticket for one idempotency_key, and the
+        high-water mark only moves when a ticket is inserted.
+        """
+        key = record.get("idempotency_key")
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                existing = self._fetch_one("idempotency_key", key) if key else None
+                if existing is None:
+                    number = self._meta("high_water", DEFAULT_HIGH_WATER) + 1
+                    record = {**record, "ticket_id": format_ticket_id(number)}
+                    self._insert([record])  # also advances high_water
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        if existing is not None:
+            return existing, False
+        return record, True
+
+    def _fetch_one(self, where: str, value: str) -> dict | None:
+        with self._lock:
+            row = self.db.execute(
+                f"SELECT {', '.join(TICKET_COLUMNS)} FROM tickets "
+                f"WHERE {where} = ? ORDER BY rowid LIMIT 1",
+                (value,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get(self, ticket_id: str) -> dict | None:
+        return self._fetch_one("ticket_id", ticket_id)
+
+    def find_by_idempotency_key(self, key: str) -> dict | None:
+        return self._fetch_one("idempotency_key", key)
+
+    def allocate_id(self) -> str:
+        """Bump the high-water mark in one write transaction (multi-process safe)."""
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                number = self._meta("high_water", DEFAULT_HIGH_WATER) + 1
+                self._set_meta("high_water", number)
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return format_ticket_id(number)
+
+    def iter_all(self) -> Iterator[dict]:
+        """Keyset-paged scan; the lock is released while the caller consumes a batch."""
+        last = 0
+        while True:
+            with self._lock:
+                rows = self.db.execute(
+                    f"SELECT rowid, {', '.join(TICKET_COLUMNS)} FROM tickets "
+                    "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last, STREAM_BATCH_SIZE),
+                ).fetchall()
+            for row in rows:
+                yield {c: row[c] for c in TICKET_COLUMNS}
+            if len(rows) < STREAM_BATCH_SIZE:
+                return
+            last = rows[-1]["rowid"]
+
+    def query(
+        self,
+        filters: TicketFilters | None = None,
+        limit: int = 20,
+        after: int | None = None,
+    ) -> TicketPage:
+        clauses, params = (filters or TicketFilters()).where()
+        if after is not None:
+            clauses.append("rowid > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self.db.execute(
+                f"SELECT rowid, {', '.join(TICKET_COLUMNS)} FROM tickets "
+                f"{where}ORDER BY rowid LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        next_cursor = str(rows[limit - 1]["rowid"]) if len(rows) > limit else None
+        records = [
+            {c: row[c] for c in TICKET_COLUMNS} for row in rows[:limit]
+        ]
+        return TicketPage(records=records, next_cursor=next_cursor)
+
+    def close(self) -> None:
+        with self._lock:
+            self.db.close()
+
+    def reopen(self) -> None:
+        self._lock = threading.RLock()
+        self.db = self._connect()
+
+
+def open_ticket_repository(tickets_file: Path, backend: str = "jsonl") -> TicketRepository:
+    """Open the ticket store for ``backend`` next to ``tickets_file``."""
+    if backend == "jsonl":
+        return JsonlTicketRepository(tickets_file)
+    if backend == "sqlite":
+        return SqliteTicketRepository(
+            tickets_file.with_suffix(".sqlite3"), import_from=tickets_file,
+        )
+    raise ValueError(
+        f"Unknown ticket backend '{backend}'. Choose from {', '.join(TICKET_BACKENDS)}"
+    )
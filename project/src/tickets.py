@@ -0,0 +1,292 @@
+"""
+Ticket index — O(1) lookups over the append-only ``tickets.jsonl``.
+
+Keeps ticket_id / idempotency_key -> byte offset maps in memory and
+persists them to a sidecar ``tickets.idx.jsonl`` so restarts only scan
+the tail of the ticket file written since the last run. Also hands out
+monotonic ticket IDs, persisting the high-water mark in ``tickets.hwm``.
+
+Sidecar schema per line:
+  {ticket_id, idempotency_key, status, priority, assigned_to, created_at,
+   offset, end}
+
+The filterable fields ride along in the sidecar so ``list_tickets`` can
+select tickets without parsing ticket bodies; only the page it returns is
+read from ``tickets.jsonl``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread-level locking only
+    fcntl = None
+
+TICKET_ID_PATTERN = re.compile(r"^TKT-(\d+)$")
+# Seed data holds TKT-001..005, so an empty store starts at TKT-006
+DEFAULT_HIGH_WATER = 5
+
+
+def format_ticket_id(number: int) -> str:
+    """TKT-NNN, growing past three digits as needed (TKT-1000)."""
+    return f"TKT-{number:03d}"
+
+
+class InterProcessLock:
+    """Re-entrant lock that also excludes other processes.
+
+    The outermost ``acquire`` takes an exclusive ``flock`` on ``path``, so
+    pre-forked workers (or several servers on one data directory) append
+    tickets and hand out IDs one at a time.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except BaseException:
+                os.close(fd)
+                self._lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fd, self._fd = self._fd, None
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        self._lock.release()
+
+    def __enter__(self) -> "InterProcessLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+@dataclass
+class TicketRef:
+    ticket_id: str
+    offset: int
+    idempotency_key: str | None = None
+    status: str = ""
+    priority: str = ""
+    assigned_to: str | None = None
+    created_at: str = ""
+
+    @classmethod
+    def from_record(cls, d: dict, offset: int) -> "TicketRef":
+        return cls(
+            ticket_id=d["ticket_id"],
+            offset=offset,
+            idempotency_key=d.get("idempotency_key"),
+            status=d["status"],
+            priority=d["priority"],
+            assigned_to=d.get("assigned_to"),
+            created_at=d["created_at"],
+        )
+
+
+class TicketIndex:
+    def __init__(self, tickets_file: Path) -> None:
+        self.tickets_file = tickets_file
+        self.index_file = tickets_file.with_name(f"{tickets_file.stem}.idx.jsonl")
+        self.hwm_file = tickets_file.with_name(f"{tickets_file.stem}.hwm")
+        self._lock = InterProcessLock(tickets_file.with_name(f"{tickets_file.stem}.lock"))
+        self._by_id: dict[str, TicketRef] = {}
+        self._by_key: dict[str, TicketRef] = {}
+        self._refs: list[TicketRef] = []  # file order; cursor = position
+        self._covered = 0  # bytes of tickets_file reflected in the index
+        self._high_water = DEFAULT_HIGH_WATER
+        self._load_sidecar()
+        self._load_high_water()
+        self.refresh()
+
+    @property
+    def lock(self) -> InterProcessLock:
+        """Held by writers so appends and index updates stay in step."""
+        return self._lock
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _reset(self) -> None:
+        self._by_id.clear()
+        self._by_key.clear()
+        self._refs.clear()
+        self._covered = 0
+        self.index_file.unlink(missing_ok=True)
+
+    def _add(self, ref: TicketRef) -> None:
+        self._refs.append(ref)
+        self._by_id[ref.ticket_id] = ref
+        if ref.idempotency_key:
+            # The first ticket created with a key is the one it maps to
+            self._by_key.setdefault(ref.idempotency_key, ref)
+        match = TICKET_ID_PATTERN.match(ref.ticket_id)
+        if match:
+            self._high_water = max(self._high_water, int(match.group(1)))
+
+    def _load_high_water(self) -> None:
+        try:
+            persisted = int(self.hwm_file.read_text(encoding="utf-8").strip())
+        except (OSError, ValueError):
+            return
+        self._high_water = max(self._high_water, persisted)
+
+    def _load_sidecar(self) -> None:
+        if not self.index_file.exists():
+            return
+        size = self.tickets_file.stat().st_size if self.tickets_file.exists() else 0
+        try:
+            with self.index_file.open(encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    d = json.loads(line)
+                    if d["offset"] < self._covered:
+                        continue  # another process indexed the same tail
+                    self._add(TicketRef.from_record(d, d["offset"]))
+                    self._covered = max(self._covered, d["end"])
+        except (ValueError, KeyError, TypeError):
+            # corrupt or older-format sidecar: rebuild from the ticket file
+            self._reset()
+            return
+        if self._covered > size or not self._tail_matches():
+            self._reset()  # ticket file was truncated or replaced
+
+    def _tail_matches(self) -> bool:
+        """Check the last indexed ticket is still where the index says.
+
+        Catches a ticket file replaced by one of equal or larger size, whose
+        offsets the sidecar no longer describes.
+        """
+        if not self._refs:
+            return True
+        ref = self._refs[-1]
+        try:
+            with self.tickets_file.open("rb") as f:
+                f.seek(ref.offset)
+                line = f.readline()
+                end = f.tell()
+            return end == self._covered and json.loads(line)["ticket_id"] == ref.ticket_id
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def refresh(self) -> None:
+        """Index tickets appended since the last refresh (by any process).
+
+        Costs one ``stat()`` when nothing changed; otherwise reads only the
+        new tail of the ticket file and appends it to the sidecar.
+        """
+        try:
+            if self.tickets_file.stat().st_size == self._covered:
+                return  # nothing new; skip the (inter-process) lock
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if not self.tickets_file.exists():
+                return
+            size = self.tickets_file.stat().st_size
+            if size == self._covered:
+                return
+            if size < self._covered or not self._tail_matches():
+                self._reset()
+
+            records: list[dict] = []
+            with self.tickets_file.open("rb") as f:
+                f.seek(self._covered)
+                while True:
+                    offset = f.tell()
+                    line = f.readline()
+                    if not line:
+                        break
+                    if line.strip():
+                        try:
+                            d = json.loads(line)
+                        except ValueError:
+                            break  # partially written line; retry next refresh
+                        ref = TicketRef.from_record(d, offset)
+                        self._add(ref)
+                        records.append({
+                            "ticket_id": ref.ticket_id,
+                            "idempotency_key": ref.idempotency_key,
+                            "status": ref.status,
+                            "priority": ref.priority,
+                            "assigned_to": ref.assigned_to,
+                            "created_at": ref.created_at,
+                            "offset": offset,
+                            "end": f.tell(),
+                        })
+                    self._covered = f.tell()
+
+            if records:
+                with self.index_file.open("a", encoding="utf-8") as f:
+                    f.writelines(
+                        json.dumps(r, ensure_ascii=False) + "\n" for r in records
+                    )
+
+    # ------------------------------------------------------------------
+    # ID allocation
+    # ------------------------------------------------------------------
+    def allocate_id(self) -> str:
+        """Hand out the next ticket ID in O(1).
+
+        The high-water mark is persisted before the ID is returned, so an ID
+        is never reissued, even if the ticket write that follows fails.
+        The persisted mark is re-read under the lock so IDs stay unique
+        across processes sharing the ticket file.
+        """
+        with self._lock:
+            self.refresh()
+            self._load_high_water()
+            self._high_water += 1
+            self.hwm_file.write_text(str(self._high_water), encoding="utf-8")
+            return format_ticket_id(self._high_water)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def read_at(self, offset: int) -> dict:
+        with self.tickets_file.open("rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def get(self, ticket_id: str) -> dict | None:
+        self.refresh()
+        ref = self._by_id.get(ticket_id)
+        return self.read_at(ref.offset) if ref else None
+
+    def find_by_idempotency_key(self, key: str) -> dict | None:
+        self.refresh()
+        ref = self._by_key.get(key)
+        return self.read_at(ref.offset) if ref else None
+
+    def scan(self, after: int = 0) -> Iterator[tuple[int, TicketRef]]:
+        """Yield (position, ref) in file order, starting after ``after``."""
+        self.refresh()
+        refs = self._refs
+        for pos in range(after, len(refs)):
+            yield pos + 1, refs[pos]
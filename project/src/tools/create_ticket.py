@@ -6,14 +6,13 @@ Creates support tickets with a two-step confirm flow and idempotency support.
 
 from __future__ import annotations
 
-import json
 from dataclasses import asdict
-from datetime import datetime, timezone
 
 from mcp.server.fastmcp import Context
 
-from src.models import AppContext, Ticket
-from src.validation import validate_ticket_input
+from src.encoding import FORMATS, encode
+from src.models import AppContext
+from src.validation import validate_choice, validate_ticket_input
 
 
 def register(mcp) -> None:
@@ -26,6 +25,7 @@ def register(mcp) -> None:
         priority: str,
         confirm: bool = False,
         idempotency_key: str | None = None,
+        format: str | None = None,
         ctx: Context = None,
     ) -> str:
         """Create a new support ticket.
@@ -44,6 +44,8 @@ def register(mcp) -> None:
             priority: One of 'low', 'medium', 'high', 'critical'.
             confirm: Set to True to actually create the ticket.
             idempotency_key: Optional unique key to prevent duplicate creation.
+            format: Response encoding: "pretty" or "compact" (default: server
+                setting); "columnar" is accepted and encodes as compact.
             ctx: MCP request context (injected automatically).
 
         Returns:
@@ -57,6 +59,7 @@ def register(mcp) -> None:
         validated_title = validated["title"]
         validated_body = validated["description"]
         validated_priority = validated["priority"]
+        fmt = validate_choice(format, FORMATS, "format") if format else None
 
         # Preview mode
         if not confirm:
@@ -73,44 +76,31 @@ def register(mcp) -> None:
             )
             return preview
 
-        # Idempotency check
-        if idempotency_key:
-            existing_tickets = app.load_tickets()
-            for ticket in existing_tickets:
-                if ticket.idempotency_key == idempotency_key:
-                    result_json = json.dumps(asdict(ticket), ensure_ascii=False, indent=2)
-                    await logger.log(
-                        action="idempotent_return",
-                        tool_name="create_ticket",
-                        input_summary=f"idempotency_key={idempotency_key}",
-                        result_summary=f"Returned existing ticket {ticket.ticket_id}",
-                        success=True,
-                    )
-                    return result_json
-
-        # Create the ticket
-        ticket_id = app.next_ticket_id()
-        now = datetime.now(timezone.utc).isoformat()
-
-        ticket = Ticket(
-            ticket_id=ticket_id,
-            title=validated_title,
-            priority=validated_priority,
-            body=validated_body,
-            status="open",
-            created_at=now,
-            idempotency_key=idempotency_key,
+        # The store checks the key, allocates the ID and appends atomically
+        ticket, created = await app.run_blocking(
+            app.create_ticket,
+            validated_title, validated_priority, validated_body, idempotency_key,
         )
 
-        app.append_ticket(ticket)
+        # Same idempotency_key seen before: return the existing ticket
+        if not created:
+            result_json = encode(asdict(ticket), fmt)
+            await logger.log(
+                action="idempotent_return",
+                tool_name="create_ticket",
+                input_summary=f"idempotency_key={idempotency_key}",
+                result_summary=f"Returned existing ticket {ticket.ticket_id}",
+                success=True,
+            )
+            return result_json
 
-        result_json = json.dumps(asdict(ticket), ensure_ascii=False, indent=2)
+        result_json = encode(asdict(ticket), fmt)
 
-        logger.log(
+        await logger.log(
             action="create",
             tool_name="create_ticket",
             input_summary=f"title={validated_title}, priority={validated_priority}",
-            result_summary=f"Created ticket {ticket_id}",
+            result_summary=f"Created ticket {ticket.ticket_id}",
             success=True,
         )
         return result_json
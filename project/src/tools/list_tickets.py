@@ -0,0 +1,188 @@
+"""
+Tools: list_tickets, get_ticket
+
+Read tickets back from the ticket store. Filtering (status, priority,
+assignee, created date range) and cursor paging are served by the ticket
+index, and only the requested fields of the returned page are projected.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import timedelta
+
+from mcp.server.fastmcp import Context
+
+from src.encoding import FORMATS, encode
+from src.models import AppContext, ErrorCode, ToolError
+from src.ticket_store import TICKET_COLUMNS, TicketFilters
+from src.validation import (
+    sanitize_string,
+    validate_choice,
+    validate_cursor,
+    validate_date,
+    validate_int_range,
+    validate_ticket_id,
+)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+PRIORITIES = ("low", "medium", "high", "critical")
+# list_tickets omits the (long) body unless asked for
+LIST_FIELDS = ("ticket_id", "title", "status", "priority", "assigned_to", "created_at")
+
+
+def validate_fields(fields: list[str] | None, default: tuple[str, ...]) -> tuple[str, ...]:
+    """Validate a projection list against the Ticket fields."""
+    if not fields:
+        return default
+    projected: list[str] = []
+    for name in fields:
+        cleaned = str(name).strip().lower()
+        if cleaned not in TICKET_COLUMNS:
+            raise ToolError(
+                ErrorCode.INVALID_ARGUMENT,
+                f"유효하지 않은 field: {name}. Must be one of: {', '.join(TICKET_COLUMNS)}.",
+            )
+        if cleaned not in projected:
+            projected.append(cleaned)
+    return tuple(projected)
+
+
+def project(record: dict, fields: tuple[str, ...]) -> dict:
+    return {name: record.get(name) for name in fields}
+
+
+def register(mcp) -> None:
+    """Register the list_tickets and get_ticket tools on the MCP server."""
+
+    @mcp.tool()
+    async def list_tickets(
+        status: str | None = None,
+        priority: str | None = None,
+        assigned_to: str | None = None,
+        created_from: str | None = None,
+        created_to: str | None = None,
+        fields: list[str] | None = None,
+        limit: int = DEFAULT_LIMIT,
+        cursor: str | None = None,
+        format: str | None = None,
+        ctx: Context = None,
+    ) -> str:
+        """List support tickets, oldest first, with optional filters.
+
+        Args:
+            status: Exact status, e.g. "open", "in_progress", "resolved".
+            priority: One of 'low', 'medium', 'high', 'critical'.
+            assigned_to: Assignee name (case-insensitive exact match).
+            created_from: Only tickets created on or after this date (YYYY-MM-DD).
+            created_to: Only tickets created on or before this date (YYYY-MM-DD).
+            fields: Ticket fields to return (default: all but body).
+            limit: Page size (default 20, max 100).
+            cursor: next_cursor from a previous response to fetch the next page.
+            format: Response encoding: "pretty", "compact" or "columnar"
+                (tickets as columns + rows; default: server setting).
+            ctx: MCP request context (injected automatically).
+
+        Returns:
+            JSON object with the projected tickets and next_cursor (null on
+            the last page), or a message if none found.
+        """
+        app: AppContext = ctx.request_context.lifespan_context["app"]
+        logger = app.audit_logger
+
+        start = validate_date(created_from, "created_from") if created_from else None
+        end = validate_date(created_to, "created_to") if created_to else None
+        if start and end and start > end:
+            raise ToolError(
+                ErrorCode.INVALID_ARGUMENT,
+                "created_from는 created_to보다 늦을 수 없습니다",
+            )
+        filters = TicketFilters(
+            status=sanitize_string(status, 50).lower() if status else None,
+            priority=validate_choice(priority, PRIORITIES, "priority") if priority else None,
+            assigned_to=sanitize_string(assigned_to, 100) if assigned_to else None,
+            created_from=start.isoformat() if start else None,
+            created_before=(end + timedelta(days=1)).isoformat() if end else None,
+        )
+        projected = validate_fields(fields, LIST_FIELDS)
+        limit = validate_int_range(limit, "limit", 1, MAX_LIMIT)
+        after = validate_cursor(cursor) if cursor else None
+        fmt = validate_choice(format, FORMATS, "format") if format else None
+
+        page = await app.run_blocking(app.query_tickets, filters, limit=limit, after=after)
+        filter_summary = {k: v for k, v in vars(filters).items() if v is not None}
+        input_summary = f"filters={filter_summary}, cursor={after}"
+
+        if not page.records:
+            result = "No tickets found"
+            if filter_summary:
+                result += f" with filters {filter_summary}"
+            await logger.log(
+                action="list",
+                tool_name="list_tickets",
+                input_summary=input_summary,
+                result_summary=result,
+                success=True,
+            )
+            return result
+
+        result_json = encode(
+            {
+                "filters": filter_summary,
+                "count": len(page.records),
+                "tickets": [project(r, projected) for r in page.records],
+                "next_cursor": page.next_cursor,
+            },
+            fmt,
+            table="tickets",
+        )
+
+        await logger.log(
+            action="list",
+            tool_name="list_tickets",
+            input_summary=input_summary,
+            result_summary=f"Found {len(page.records)} ticket(s)",
+            success=True,
+        )
+        return result_json
+
+    @mcp.tool()
+    async def get_ticket(
+        ticket_id: str,
+        fields: list[str] | None = None,
+        format: str | None = None,
+        ctx: Context = None,
+    ) -> str:
+        """Fetch a single support ticket by ID.
+
+        Args:
+            ticket_id: Ticket ID, e.g. "TKT-001".
+            fields: Ticket fields to return (default: all).
+            format: Response encoding: "pretty" or "compact" (default: server
+                setting); "columnar" is accepted and encodes as compact.
+            ctx: MCP request context (injected automatically).
+
+        Returns:
+            JSON of the ticket.
+        """
+        app: AppContext = ctx.request_context.lifespan_context["app"]
+        logger = app.audit_logger
+
+        ticket_id = validate_ticket_id(ticket_id)
+        projected = validate_fields(fields, TICKET_COLUMNS)
+        fmt = validate_choice(format, FORMATS, "format") if format else None
+
+        ticket = await app.run_blocking(app.get_ticket, ticket_id)
+        if ticket is None:
+            # audited as an "error" entry by the instrumentation wrapper
+            raise ToolError(ErrorCode.NOT_FOUND, f"Ticket not found: {ticket_id}")
+
+        await logger.log(
+            action="get",
+            tool_name="get_ticket",
+            input_summary=f"ticket_id={ticket_id}",
+            result_summary=f"Returned ticket {ticket_id}",
+            success=True,
+        )
+        return encode(project(asdict(ticket), projected), fmt)
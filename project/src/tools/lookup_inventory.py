@@ -1,77 +1,178 @@
 """
 Tool: lookup_inventory
 
-Searches the inventory by name or category using SQL LIKE pattern matching.
+Searches the inventory by name or category, optionally narrowed by
+structured filters (category, location, status, quantity range) and paged
+with a cursor. Substring matching is served by an FTS5 trigram index when
+available, falling back to SQL LIKE; filters use composite indexes.
+
+Encoded responses are cached per normalized query (search term, filters,
+page, format) and inventory data version, so repeated lookups skip both
+the query and the encoding until the entry's TTL expires (or the version
+changes; see AppContext.inventory_version). Concurrent identical misses
+share a single query (see SingleFlight); the encoding is still per call.
 """
 
 from __future__ import annotations
 
-import json
 import re
+from functools import partial
 
 from mcp.server.fastmcp import Context
 
-from src.models import AppContext
-from src.validation import validate_query
+from src.encoding import FORMATS, default_format, encode
+from src.inventory import InventoryFilters
+from src.models import AppContext, ErrorCode, ToolError
+from src.validation import (
+    sanitize_string,
+    validate_cursor,
+    validate_int_range,
+    validate_choice,
+    validate_query,
+)
 
 MAX_RESULTS = 10
+MAX_LIMIT = 100
+MAX_QUANTITY = 1_000_000_000
 
 
 def register(mcp) -> None:
     """Register the lookup_inventory tool on the MCP server."""
 
     @mcp.tool()
-    async def lookup_inventory(query: str, ctx: Context) -> str:
-        """Search inventory items by name or category.
+    async def lookup_inventory(
+        query: str = "",
+        category: str | None = None,
+        location: str | None = None,
+        status: str | None = None,
+        min_quantity: int | None = None,
+        max_quantity: int | None = None,
+        limit: int = MAX_RESULTS,
+        cursor: str | None = None,
+        format: str | None = None,
+        ctx: Context = None,
+    ) -> str:
+        """Search inventory items by name or category, with optional filters.
 
         Performs a case-insensitive substring match against item names
-        and categories using SQL LIKE. Returns up to 10 matching items as JSON.
+        and categories, combined (AND) with any structured filters given.
+        Filters are case-insensitive too. At least a query or one filter is
+        required.
 
         Args:
             query: Search term to match against item name or category.
+            category: Exact category, e.g. "laptop", "monitor".
+            location: Location prefix, e.g. "HQ" or "HQ-Floor3".
+            status: Exact status, e.g. "in_stock", "low_stock", "reserved".
+            min_quantity: Only items with at least this quantity.
+            max_quantity: Only items with at most this quantity.
+            limit: Page size (default 10, max 100).
+            cursor: next_cursor from a previous response to fetch the next page.
+            format: Response encoding: "pretty", "compact" or "columnar"
+                (items as columns + rows; default: server setting).
             ctx: MCP request context (injected automatically).
 
         Returns:
-            JSON array of matching inventory items, or a message if none found.
+            JSON object with matching items and next_cursor (null on the last
+            page), or a message if none found.
         """
         app: AppContext = ctx.request_context.lifespan_context["app"]
         logger = app.audit_logger
 
-        validated = validate_query(query, min_length=1, max_length=100)
-        sanitized = re.sub(r"\s+", " ", validated).lower()
-        like_pattern = f"%{sanitized}%"
-
-        rows = app.db.execute(
-            """SELECT item_id, name, category, quantity,
-                      location, status, last_updated
-               FROM inventory
-               WHERE LOWER(name) LIKE ? OR LOWER(category) LIKE ?
-               LIMIT ?""",
-            (like_pattern, like_pattern, MAX_RESULTS),
-        ).fetchall()
+        sanitized = ""
+        if query:
+            validated = validate_query(query, min_length=1, max_length=100)
+            sanitized = re.sub(r"\s+", " ", validated).lower()
+
+        filters = InventoryFilters(
+            category=sanitize_string(category, 100).lower() if category else None,
+            location=sanitize_string(location, 100).lower() if location else None,
+            status=sanitize_string(status, 50).lower() if status else None,
+            min_quantity=(
+                validate_int_range(min_quantity, "min_quantity", 0, MAX_QUANTITY)
+                if min_quantity is not None else None
+            ),
+            max_quantity=(
+                validate_int_range(max_quantity, "max_quantity", 0, MAX_QUANTITY)
+                if max_quantity is not None else None
+            ),
+        )
+        if not sanitized and not filters:
+            raise ToolError(
+                ErrorCode.INVALID_ARGUMENT,
+                "query 또는 필터(category, location, status, min/max_quantity) 중 하나는 필요합니다",
+            )
+        if (
+            filters.min_quantity is not None and filters.max_quantity is not None
+            and filters.min_quantity > filters.max_quantity
+        ):
+            raise ToolError(
+                ErrorCode.INVALID_ARGUMENT,
+                "min_quantity는 max_quantity보다 클 수 없습니다",
+            )
+        limit = validate_int_range(limit, "limit", 1, MAX_LIMIT)
+        after = validate_cursor(cursor) if cursor else None
+        fmt = validate_choice(format, FORMATS, "format") if format else None
+        filter_summary = {k: v for k, v in vars(filters).items() if v is not None}
+        input_summary = f"query={sanitized}, filters={filter_summary}, cursor={after}"
+
+        query_key = (sanitized, tuple(vars(filters).values()), limit, after)
+        cache_key = (*query_key, fmt or default_format())
+        version = app.inventory_version
+        cached = app.inventory_cache.get(cache_key, version)
+        if cached is not None:
+            await logger.log(
+                action="lookup",
+                tool_name="lookup_inventory",
+                input_summary=input_summary,
+                result_summary="Served from cache",
+                success=True,
+            )
+            return cached
+
+        page = await app.inflight.do(
+            ("lookup_inventory", *query_key, version),
+            partial(
+                app.run_blocking,
+                app.search_inventory, sanitized, limit, filters=filters, after=after,
+            ),
+        )
+        rows = page.items
 
         if not rows:
-            result = f"No items found matching '{sanitized}'"
+            result = "No items found"
+            if sanitized:
+                result += f" matching '{sanitized}'"
+            if filter_summary:
+                result += f" with filters {filter_summary}"
             await logger.log(
                 action="lookup",
                 tool_name="lookup_inventory",
-                input_summary=f"query={sanitized}",
+                input_summary=input_summary,
                 result_summary=result,
                 success=True,
             )
+            app.inventory_cache.put(cache_key, version, result)
             return result
 
-        result_json = json.dumps(
-            [dict(row) for row in rows],
-            ensure_ascii=False,
-            indent=2,
+        result_json = encode(
+            {
+                "query": sanitized,
+                "filters": filter_summary,
+                "count": len(rows),
+                "items": rows,
+                "next_cursor": page.next_cursor,
+            },
+            fmt,
+            table="items",
         )
 
         await logger.log(
             action="lookup",
             tool_name="lookup_inventory",
-            input_summary=f"query={sanitized}",
+            input_summary=input_summary,
             result_summary=f"Found {len(rows)} item(s)",
             success=True,
         )
+        app.inventory_cache.put(cache_key, version, result_json)
         return result_json
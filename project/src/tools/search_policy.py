@@ -2,53 +2,48 @@
 Tool: search_policy
 
 Keyword search across policy markdown documents with weighted relevance
-ranking. Parses YAML front-matter for metadata, scores matches across
-title / tags / body, and returns ranked results with snippets.
+ranking. Candidates come from the in-memory inverted index built at
+startup (see src/search_index.py); matches are scored across
+title / tags / body and returned ranked with snippets. Identical
+concurrent searches share one ranking pass (see SingleFlight).
 """
 
 from __future__ import annotations
 
-import json
-import re
+from functools import partial
 
-import yaml
 from mcp.server.fastmcp import Context
 
+from src.encoding import FORMATS, encode
 from src.models import AppContext
-from src.validation import validate_query
+from src.search_index import IndexedPolicy, PolicyIndex, select_page
+from src.validation import validate_choice, validate_int_range, validate_query
+
+RANKINGS = ("legacy", "bm25")
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MAX_OFFSET = 10_000
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """YAML front-matter와 본문을 분리합니다."""
-    pattern = r"^---\s*\n(.*?)\n---\s*\n(.*)$"
-    match = re.match(pattern, content, re.DOTALL)
-    if match:
-        meta = yaml.safe_load(match.group(1)) or {}
-        body = match.group(2)
-        return meta, body
-    return {}, content
-
-
-def calculate_relevance(query: str, meta: dict, body: str) -> float:
+def calculate_relevance(query: str, doc: IndexedPolicy) -> float:
     """검색 관련도 점수를 계산합니다."""
     q = query.lower()
     score = 0.0
 
     # 제목 매칭 (가중치 3)
-    if q in meta.get("title", "").lower():
+    if q in doc.title_lower:
         score += 3.0
 
     # 태그 매칭 (가중치 2)
-    tags = [t.lower() for t in meta.get("tags", [])]
-    if q in tags:
+    if q in doc.tags_lower:
         score += 2.0
 
     # 본문 매칭 (출현 횟수 기반, 최대 3점)
-    occurrences = body.lower().count(q)
+    occurrences = doc.body_lower.count(q)
     score += min(occurrences * 0.5, 3.0)
 
     return score
@@ -72,6 +67,47 @@ def extract_snippet(body: str, query: str, context_chars: int = 150) -> str:
     return snippet
 
 
+def rank_policies(
+    index: PolicyIndex,
+    query: str,
+    ranking: str,
+    limit: int,
+    offset: int,
+) -> tuple[int, list[dict]]:
+    """관련도 순으로 정렬한 뒤 요청한 페이지의 결과만 만듭니다.
+
+    Returns:
+        (전체 매칭 문서 수, 페이지 결과 목록)
+    """
+    if ranking == "bm25":
+        scored = index.bm25f(query)
+        precision = 3
+    else:
+        scored = [
+            (doc, calculate_relevance(query, doc))
+            for doc in index.candidates(query)
+        ]
+        precision = 1
+    scored = [
+        (doc, round(score, precision)) for doc, score in scored if score > 0
+    ]
+
+    # 관련도 상위 페이지만 선택 — 스니펫도 반환할 문서에 대해서만 생성
+    results = [
+        {
+            "slug": doc.doc_id,
+            "title": doc.title,
+            "tags": doc.tags,
+            "last_updated": doc.last_updated,
+            "relevance_score": score,
+            "snippet": extract_snippet(doc.body, query),
+            "resource_uri": f"ops://policies/{doc.doc_id}",
+        }
+        for doc, score in select_page(scored, limit, offset)
+    ]
+    return len(scored), results
+
+
 # ---------------------------------------------------------------------------
 # Registration
 # ---------------------------------------------------------------------------
@@ -80,7 +116,14 @@ def register(mcp) -> None:
     """Register the search_policy tool on the MCP server."""
 
     @mcp.tool()
-    async def search_policy(query: str, ctx: Context) -> str:
+    async def search_policy(
+        query: str,
+        ctx: Context,
+        ranking: str = "legacy",
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0,
+        format: str | None = None,
+    ) -> str:
         """사내 정책 문서를 검색합니다.
 
         키워드를 기반으로 관련 정책 문서를 찾아 스니펫을 반환합니다.
@@ -88,38 +131,36 @@ def register(mcp) -> None:
 
         Args:
             query: 검색 키워드 (예: "VPN", "재택근무", "비밀번호")
+            ranking: 정렬 방식. "legacy" (기본값, 부분 문자열 가중치) 또는
+                "bm25" (제목/태그/본문 가중치를 필드 부스트로 사용하는 BM25F)
+            limit: 반환할 최대 결과 수 (기본 10, 최대 50)
+            offset: 건너뛸 결과 수 (페이지네이션)
+            format: 응답 인코딩. "pretty", "compact" 또는 "columnar"
+                (results를 columns + rows로; 기본값은 서버 설정)
         """
         app: AppContext = ctx.request_context.lifespan_context["app"]
         logger = app.audit_logger
 
         sanitized = validate_query(query)
-
-        results: list[dict] = []
-        for doc in app.policies:
-            if not doc.path.exists():
-                continue
-
-            content = doc.path.read_text(encoding="utf-8")
-            meta, body = parse_frontmatter(content)
-            score = calculate_relevance(sanitized, meta, body)
-
-            if score > 0:
-                results.append({
-                    "slug": doc.doc_id,
-                    "title": meta.get("title", doc.title),
-                    "tags": meta.get("tags", []),
-                    "last_updated": str(meta.get("last_updated", "")),
-                    "relevance_score": round(score, 1),
-                    "snippet": extract_snippet(body, sanitized),
-                    "resource_uri": f"ops://policies/{doc.doc_id}",
-                })
-
-        # 관련도 순 정렬
-        results.sort(key=lambda x: x["relevance_score"], reverse=True)
+        ranking = validate_choice(ranking, RANKINGS, "ranking")
+        limit = validate_int_range(limit, "limit", 1, MAX_LIMIT)
+        offset = validate_int_range(offset, "offset", 0, MAX_OFFSET)
+        fmt = validate_choice(format, FORMATS, "format") if format else None
+
+        index = app.policy_index  # one snapshot per call (hot reload swaps it)
+        # Scoring and snippet extraction run off the event loop, once per
+        # set of identical in-flight searches
+        total, results = await app.inflight.do(
+            ("search_policy", id(index), sanitized, ranking, limit, offset),
+            partial(app.run_blocking, rank_policies, index, sanitized, ranking, limit, offset),
+        )
 
         response = {
             "query": sanitized,
-            "total_results": len(results),
+            "ranking": ranking,
+            "total_results": total,
+            "offset": offset,
+            "limit": limit,
             "results": results,
         }
 
@@ -128,13 +169,13 @@ def register(mcp) -> None:
                 "검색 결과가 없습니다. 다른 키워드를 시도해보세요."
             )
 
-        result_json = json.dumps(response, ensure_ascii=False, indent=2)
+        result_json = encode(response, fmt, table="results")
 
         await logger.log(
             action="search",
             tool_name="search_policy",
-            input_summary=f"query={sanitized}",
-            result_summary=f"Found {len(results)} matching policy/policies",
+            input_summary=f"query={sanitized}, ranking={ranking}",
+            result_summary=f"Found {total} matching policy/policies, returned {len(results)}",
             success=True,
         )
         return result_json
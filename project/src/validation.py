@@ -9,11 +9,14 @@ ErrorCode values when inputs are invalid.
 - validate_path(): 경로 검증 (Path Traversal)
 - validate_ticket_input(): 티켓 입력 검증 (Injection)
 - validate_query(): 검색어 검증 (Injection, DoS)
+
+Plus validate_choice() / validate_int_range() for option and paging arguments.
 """
 
 from __future__ import annotations
 
 import re
+from datetime import date
 from pathlib import Path
 
 from src.models import ErrorCode, ToolError
@@ -168,6 +171,115 @@ def validate_query(
     return query
 
 
+def validate_choice(value: str, choices: tuple[str, ...], name: str) -> str:
+    """열거형 옵션 값을 검증합니다 (대소문자 무시).
+
+    Args:
+        value: 사용자가 입력한 값.
+        choices: 허용되는 값 목록.
+        name: 오류 메시지에 사용할 인자 이름.
+
+    Returns:
+        소문자로 정규화된 값.
+
+    Raises:
+        ToolError: 허용되지 않은 값인 경우.
+    """
+    normalized = str(value).strip().lower()
+    if normalized not in choices:
+        raise ToolError(
+            ErrorCode.INVALID_ARGUMENT,
+            f"유효하지 않은 {name}: {value}. Must be one of: {', '.join(choices)}.",
+        )
+    return normalized
+
+
+def validate_int_range(value: int, name: str, minimum: int, maximum: int) -> int:
+    """정수 인자가 허용 범위 안에 있는지 검증합니다.
+
+    Args:
+        value: 검증할 값.
+        name: 오류 메시지에 사용할 인자 이름.
+        minimum: 최솟값 (포함).
+        maximum: 최댓값 (포함).
+
+    Returns:
+        검증된 정수 값.
+
+    Raises:
+        ToolError: 정수가 아니거나 범위를 벗어난 경우.
+    """
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ToolError(ErrorCode.INVALID_ARGUMENT, f"{name}은(는) 정수여야 합니다")
+    if not minimum <= value <= maximum:
+        raise ToolError(
+            ErrorCode.INVALID_ARGUMENT,
+            f"{name}은(는) {minimum}~{maximum} 범위여야 합니다",
+        )
+    return value
+
+
+def validate_cursor(cursor: str) -> int:
+    """페이지네이션 커서를 검증합니다 (이전 응답의 next_cursor 값).
+
+    Args:
+        cursor: 커서 문자열.
+
+    Returns:
+        커서가 가리키는 정수 위치.
+
+    Raises:
+        ToolError: 커서 형식이 올바르지 않은 경우.
+    """
+    cleaned = str(cursor).strip()
+    if not cleaned.isascii() or not cleaned.isdigit() or len(cleaned) > 19:
+        raise ToolError(ErrorCode.INVALID_ARGUMENT, f"유효하지 않은 cursor: {cursor}")
+    return int(cleaned)
+
+
+def validate_date(value: str, name: str) -> date:
+    """YYYY-MM-DD 형식의 날짜 인자를 검증합니다.
+
+    Args:
+        value: 날짜 문자열.
+        name: 오류 메시지에 사용할 인자 이름.
+
+    Returns:
+        파싱된 date 객체.
+
+    Raises:
+        ToolError: 형식이 올바르지 않거나 존재하지 않는 날짜인 경우.
+    """
+    cleaned = str(value).strip()
+    if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", cleaned):
+        raise ToolError(
+            ErrorCode.INVALID_ARGUMENT,
+            f"{name}은(는) YYYY-MM-DD 형식이어야 합니다: {value}",
+        )
+    try:
+        return date.fromisoformat(cleaned)
+    except ValueError:
+        raise ToolError(ErrorCode.INVALID_ARGUMENT, f"존재하지 않는 날짜: {value}") from None
+
+
+def validate_ticket_id(ticket_id: str) -> str:
+    """티켓 ID 형식(TKT-숫자)을 검증합니다.
+
+    Args:
+        ticket_id: 검증할 티켓 ID (대소문자 무시).
+
+    Returns:
+        대문자로 정규화된 티켓 ID.
+
+    Raises:
+        ToolError: 형식이 올바르지 않은 경우.
+    """
+    cleaned = str(ticket_id).strip().upper()
+    if not re.fullmatch(r"TKT-\d{1,12}", cleaned):
+        raise ToolError(ErrorCode.INVALID_ARGUMENT, f"유효하지 않은 ticket_id: {ticket_id}")
+    return cleaned
+
+
 def validate_doc_id(doc_id: str) -> str:
     """문서 ID를 검증합니다: 소문자 알파벳, 숫자, 하이픈만 허용 (1~50자).
 
@@ -0,0 +1,147 @@
+"""
+Pre-forked multi-worker mode for the streamable-http transport.
+
+``serve()`` binds the listening socket once in the parent and forks
+``workers`` children that all accept on that socket. The AppContext is
+loaded by the parent before forking, so the policy index and caches are
+shared copy-on-write; ``gc.freeze()`` moves them into the permanent
+generation so the children's collector never touches (and copies) those
+pages. The inventory lives in the parent's read-only SQLite file (see
+``InventoryReaders``); workers open their own connections to it and share
+its pages through the OS page cache rather than holding private copies.
+
+After the fork each worker re-creates what cannot be shared (see
+``AppContext.after_fork``): inventory and SQLite ticket store connections
+are reopened, and the executor and audit logger (``logs/worker-<n>/``)
+are new. Threads are only ever started in the workers. Ticket writes stay
+unique across workers: the JSONL store takes an flock, and the SQLite
+store checks idempotency keys inside its write transaction. Metrics are
+per worker and labelled ``worker="<n>"``, so a scrape returns the series
+of the worker that served it and series never mix between workers.
+
+Consecutive requests of one client may reach different workers, so the
+transport must run stateless (``mcp.settings.stateless_http``); state
+that outlives a request (policy watcher, audit writer) is owned by the
+worker process instead of the MCP session.
+
+POSIX only (``os.fork``).
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from src.models import AppContext
+
+logger = logging.getLogger(__name__)
+
+LISTEN_BACKLOG = 2048
+# A worker that dies sooner than this after starting is restarted with a delay
+MIN_UPTIME = 1.0
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Listening TCP socket inherited by every worker."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(LISTEN_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(mcp, sock: socket.socket) -> None:
+    """Serve the streamable-http app on ``sock`` until signalled."""
+    import uvicorn
+
+    config = uvicorn.Config(
+        mcp.streamable_http_app(),
+        log_level=mcp.settings.log_level.lower(),
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(
+    mcp,
+    app: "AppContext",
+    host: str,
+    port: int,
+    workers: int,
+    worker_init: Callable[[], None] | None = None,
+) -> None:
+    """Fork ``workers`` processes sharing ``app`` and restart any that die.
+
+    ``worker_init`` runs in each worker after ``app.after_fork``. On exit a
+    worker stops its policy watcher and flushes its audit log. SIGINT and
+    SIGTERM are forwarded to the workers; returns once all exited.
+    """
+    sock = bind_socket(host, port)
+    app.before_fork()
+    gc.collect()
+    gc.freeze()
+
+    children: dict[int, tuple[int, float]] = {}  # pid -> (worker_id, started)
+    stopping = False
+
+    def spawn(worker_id: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                app.after_fork(worker_id)
+                if worker_init is not None:
+                    worker_init()
+                run_worker(mcp, sock)
+            except BaseException:
+                logger.exception("Worker %d failed", worker_id)
+                code = 1
+            finally:
+                try:
+                    app.stop_policy_watcher()
+                    app.audit_logger.close()
+                finally:
+                    os._exit(code)
+        children[pid] = (worker_id, time.monotonic())
+
+    def stop(signum: int, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for worker_id in range(1, workers + 1):
+        spawn(worker_id)
+    logger.info("Serving on %s:%d with %d workers", host, port, workers)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        worker_id, started = children.pop(pid, (None, 0.0))
+        if worker_id is None or stopping:
+            continue
+        logger.warning(
+            "Worker %d (pid %d) exited with status %d; restarting",
+            worker_id, pid, os.waitstatus_to_exitcode(status),
+        )
+        if time.monotonic() - started < MIN_UPTIME:
+            time.sleep(MIN_UPTIME)
+        if not stopping:
+            spawn(worker_id)
+    sock.close()
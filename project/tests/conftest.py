@@ -9,10 +9,12 @@ from __future__ import annotations
 
 import sqlite3
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 
 from src.audit import AuditLogger
+from src.inventory import create_schema
 from src.models import AppContext, InventoryItem, PolicyDoc
 
 
@@ -53,17 +55,9 @@ def sample_inventory() -> list[InventoryItem]:
 @pytest.fixture
 def sample_db(sample_inventory: list[InventoryItem]) -> sqlite3.Connection:
     """In-memory SQLite DB populated with sample inventory data."""
-    db = sqlite3.connect(":memory:")
+    db = sqlite3.connect(":memory:", check_same_thread=False)
     db.row_factory = sqlite3.Row
-    db.execute("""CREATE TABLE inventory (
-        item_id TEXT PRIMARY KEY,
-        name TEXT NOT NULL,
-        category TEXT NOT NULL,
-        quantity INTEGER NOT NULL,
-        location TEXT NOT NULL,
-        status TEXT NOT NULL,
-        last_updated TEXT NOT NULL
-    )""")
+    create_schema(db)
     for item in sample_inventory:
         db.execute(
             "INSERT INTO inventory VALUES (?,?,?,?,?,?,?)",
@@ -138,7 +132,7 @@ def app_context(
     tmp_path: Path,
     sample_db: sqlite3.Connection,
     sample_policies: list[PolicyDoc],
-) -> AppContext:
+) -> Iterator[AppContext]:
     """Fully wired AppContext using temporary directories."""
     tickets_file = tmp_path / "tickets" / "tickets.jsonl"
     tickets_file.parent.mkdir(parents=True, exist_ok=True)
@@ -146,16 +140,20 @@ def app_context(
     policy_dir = tmp_path / "policies"
     audit_logger = AuditLogger(log_dir=tmp_path / "logs")
 
-    return AppContext(
+    app = AppContext(
         db=sample_db,
         policies=sample_policies,
         policy_dir=policy_dir,
         tickets_file=tickets_file,
         audit_logger=audit_logger,
     )
+    yield app
+    app.close()
 
 
 @pytest.fixture
-def audit_logger(tmp_path: Path) -> AuditLogger:
+def audit_logger(tmp_path: Path) -> Iterator[AuditLogger]:
     """AuditLogger that writes to a temporary directory."""
-    return AuditLogger(log_dir=tmp_path / "logs")
+    logger = AuditLogger(log_dir=tmp_path / "logs")
+    yield logger
+    logger.close()
@@ -4,7 +4,11 @@ Tests for AuditLogger (EP 14).
 
 from __future__ import annotations
 
+import asyncio
+import gzip
 import json
+import time
+from datetime import date
 
 import pytest
 
@@ -21,6 +25,7 @@ class TestAuditLogger:
             success=True,
             duration_ms=12.45,
         )
+        audit_logger.flush()
         content = audit_logger.log_path.read_text()
         entry = json.loads(content.strip())
 
@@ -43,6 +48,7 @@ class TestAuditLogger:
         """Multiple log calls should produce multiple JSONL lines."""
         await audit_logger.log(action="call_1", tool_name="tool_a", success=True)
         await audit_logger.log(action="call_2", tool_name="tool_b", success=False)
+        audit_logger.flush()
 
         lines = audit_logger.log_path.read_text().strip().split("\n")
         assert len(lines) == 2
@@ -51,3 +57,112 @@ class TestAuditLogger:
         entry2 = json.loads(lines[1])
         assert entry1["tool_name"] == "tool_a"
         assert entry2["success"] is False
+
+
+class TestBufferedWriter:
+    async def test_log_does_not_write_synchronously(self, tmp_path) -> None:
+        logger = AuditLogger(log_dir=tmp_path, flush_interval=60)
+        await logger.log(action="call", tool_name="tool_a")
+        assert logger.pending == 1
+        assert not logger.log_path.exists()
+        logger.close()
+        assert logger.pending == 0
+        assert len(logger.log_path.read_text().splitlines()) == 1
+
+    async def test_size_threshold_triggers_flush(self, tmp_path) -> None:
+        logger = AuditLogger(log_dir=tmp_path, flush_entries=3, flush_interval=60)
+        for i in range(3):
+            await logger.log(action=f"call_{i}", tool_name="tool_a")
+        deadline = time.monotonic() + 2
+        while logger.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        assert logger.pending == 0
+        logger.close()
+        assert len(logger.log_path.read_text().splitlines()) == 3
+
+    async def test_time_threshold_triggers_flush(self, tmp_path) -> None:
+        logger = AuditLogger(log_dir=tmp_path, flush_interval=0.05)
+        await logger.log(action="call", tool_name="tool_a")
+        deadline = time.monotonic() + 2
+        while not logger.log_path.exists() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        assert logger.log_path.exists()
+        await logger.aclose()
+
+    async def test_aclose_persists_everything_in_order(self, tmp_path) -> None:
+        logger = AuditLogger(log_dir=tmp_path, flush_entries=7, flush_interval=60)
+        await asyncio.gather(*(
+            logger.log(action=f"call_{i}", tool_name="tool_a") for i in range(50)
+        ))
+        await logger.aclose()
+        actions = [json.loads(l)["action"] for l in logger.log_path.read_text().splitlines()]
+        assert actions == [f"call_{i}" for i in range(50)]
+
+    async def test_usable_after_aclose(self, tmp_path) -> None:
+        logger = AuditLogger(log_dir=tmp_path)
+        await logger.log(action="first", tool_name="tool_a")
+        await logger.aclose()
+        await logger.log(action="second", tool_name="tool_a")
+        await logger.aclose()
+        assert len(logger.log_path.read_text().splitlines()) == 2
+
+
+class TestRotation:
+    async def write(self, logger: AuditLogger, n: int, prefix: str = "call") -> None:
+        for i in range(n):
+            await logger.log(action=f"{prefix}_{i}", tool_name="tool_a", note="x" * 100)
+            logger.flush()
+
+    async def test_rotates_by_size_and_compresses(self, tmp_path) -> None:
+        logger = AuditLogger(log_dir=tmp_path, max_bytes=1000)
+        await self.write(logger, 20)
+        logger.close()
+
+        archives = sorted(tmp_path.glob("audit-*.jsonl.gz"))
+        assert archives and not list(tmp_path.glob("audit-*.jsonl"))
+        assert logger.log_path.stat().st_size <= 1000
+        manifest = logger.load_manifest()
+        assert [seg["file"] for seg in manifest] == [p.name for p in archives]
+        assert sum(seg["entries"] for seg in manifest) + len(
+            logger.log_path.read_text().splitlines()
+        ) == 20
+        with gzip.open(archives[0], "rt") as f:
+            assert json.loads(f.readline())["action"] == "call_0"
+
+    async def test_rotates_on_utc_day_change(self, tmp_path, monkeypatch) -> None:
+        logger = AuditLogger(log_dir=tmp_path)
+        await self.write(logger, 2)
+        monkeypatch.setattr("src.audit._utc_today", lambda: date(2999, 1, 1))
+        await self.write(logger, 1, prefix="next_day")
+        logger.close()
+        assert len(logger.load_manifest()) == 1
+        assert len(logger.log_path.read_text().splitlines()) == 1
+
+    async def test_iter_entries_spans_segments(self, tmp_path) -> None:
+        logger = AuditLogger(log_dir=tmp_path, max_bytes=1000)
+        await self.write(logger, 20)
+        logger.close()
+        actions = [e["action"] for e in logger.iter_entries()]
+        assert actions == [f"call_{i}" for i in range(20)]
+
+    async def test_segments_skip_out_of_range(self, tmp_path) -> None:
+        logger = AuditLogger(log_dir=tmp_path, max_bytes=1000)
+        await self.write(logger, 20)
+        logger.close()
+        manifest = logger.load_manifest()
+        assert len(manifest) >= 2
+        newest = manifest[-1]
+        selected = logger.segments(since=newest["first_timestamp"])
+        assert tmp_path / manifest[0]["file"] not in selected
+        assert tmp_path / newest["file"] in selected
+        assert logger.segments(until="2000-01-01T00:00:00+00:00") == [logger.log_path]
+
+    async def test_leftover_segment_compressed_on_start(self, tmp_path) -> None:
+        leftover = tmp_path / "audit-20260101T000000Z-0000.jsonl"
+        leftover.write_text(
+            json.dumps({"timestamp": "2026-01-01T00:00:00+00:00", "action": "a"}) + "\n"
+        )
+        logger = AuditLogger(log_dir=tmp_path)
+        logger.close()
+        assert not leftover.exists()
+        assert logger.load_manifest()[0]["first_timestamp"] == "2026-01-01T00:00:00+00:00"
@@ -0,0 +1,189 @@
+"""
+Tests for the byte-bounded LRU cache used for pre-rendered payloads, the
+lookup_inventory result cache built on it, and single-flight coalescing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.cache import ByteLRUCache, SingleFlight
+from src.models import AppContext
+from src.tools import search_policy
+from src.tools.lookup_inventory import register as register_lookup_inventory
+
+
+class TestByteLRUCache:
+    def test_hit_requires_matching_version(self) -> None:
+        cache = ByteLRUCache(max_bytes=1024)
+        cache.put("vpn-setup", 1, "payload")
+        assert cache.get("vpn-setup", 1) == "payload"
+        assert cache.get("vpn-setup", 2) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used_by_bytes(self) -> None:
+        cache = ByteLRUCache(max_bytes=10)
+        cache.put("a", 0, "aaaa")
+        cache.put("b", 0, "bbbb")
+        cache.get("a", 0)
+        cache.put("c", 0, "cccc")
+        assert cache.get("b", 0) is None
+        assert cache.get("a", 0) == "aaaa"
+        assert cache.total_bytes == 8
+
+    def test_size_counts_utf8_bytes(self) -> None:
+        cache = ByteLRUCache(max_bytes=1024)
+        cache.put("k", 0, "보안")
+        assert cache.total_bytes == 6
+
+    def test_oversized_payload_not_cached(self) -> None:
+        cache = ByteLRUCache(max_bytes=4)
+        cache.put("k", 0, "too large")
+        assert len(cache) == 0
+
+    def test_replace_updates_size(self) -> None:
+        cache = ByteLRUCache(max_bytes=1024)
+        cache.put("k", 0, "aaaa")
+        cache.put("k", 1, "aa")
+        assert cache.total_bytes == 2
+        assert cache.stats()["entries"] == 1
+
+    def test_entries_expire_after_ttl(self) -> None:
+        now = [100.0]
+        cache = ByteLRUCache(max_bytes=1024, ttl=30, clock=lambda: now[0])
+        cache.put("k", 0, "payload")
+        now[0] += 29
+        assert cache.get("k", 0) == "payload"
+        now[0] += 1
+        assert cache.get("k", 0) is None
+        assert cache.total_bytes == 0
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+class TestInventoryResultCache:
+    @staticmethod
+    async def call(app: AppContext, *calls: dict) -> list[str]:
+        @asynccontextmanager
+        async def lifespan(server: FastMCP):
+            yield {"app": app}
+
+        server = FastMCP("test", lifespan=lifespan)
+        register_lookup_inventory(server)
+        async with create_connected_server_and_client_session(server._mcp_server) as client:
+            results = [await client.call_tool("lookup_inventory", args) for args in calls]
+        return [result.content[0].text for result in results]
+
+    async def test_repeat_lookup_is_served_from_cache(self, app_context: AppContext) -> None:
+        first, second, other = await self.call(
+            app_context,
+            {"query": "  Dell "},
+            {"query": "dell"},
+            {"query": "dell", "format": "compact"},
+        )
+        assert first == second
+        assert json.loads(other) == json.loads(first)
+        stats = app_context.inventory_cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+    async def test_version_change_invalidates(self, app_context: AppContext) -> None:
+        await self.call(app_context, {"query": "dell"})
+        app_context.inventory_version += 1
+        await self.call(app_context, {"query": "dell"})
+        stats = app_context.inventory_cache.stats()
+        assert (stats["hits"], stats["misses"]) == (0, 2)
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_computation(self) -> None:
+        flight = SingleFlight()
+        runs = 0
+
+        async def compute() -> str:
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("k", compute) for _ in range(5)))
+        assert results == ["result"] * 5
+        assert (runs, flight.calls, flight.shared, len(flight)) == (1, 1, 4, 0)
+
+        await flight.do("k", compute)  # nothing in flight any more
+        assert runs == 2
+
+    async def test_different_keys_run_separately(self) -> None:
+        flight = SingleFlight()
+
+        async def echo(value: int) -> int:
+            await asyncio.sleep(0)
+            return value
+
+        assert await asyncio.gather(
+            flight.do(1, lambda: echo(1)), flight.do(2, lambda: echo(2)),
+        ) == [1, 2]
+        assert flight.shared == 0
+
+    async def test_exception_reaches_every_caller(self) -> None:
+        flight = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do("k", fail), flight.do("k", fail), return_exceptions=True,
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+
+    async def test_cancelled_caller_does_not_cancel_others(self) -> None:
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute() -> str:
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("k", compute))
+        second = asyncio.ensure_future(flight.do("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_duplicate_searches_rank_once(
+        self, app_context: AppContext, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        runs = 0
+        rank = search_policy.rank_policies
+
+        def slow_rank(*args):
+            nonlocal runs
+            runs += 1
+            time.sleep(0.2)
+            return rank(*args)
+
+        monkeypatch.setattr(search_policy, "rank_policies", slow_rank)
+
+        @asynccontextmanager
+        async def lifespan(server: FastMCP):
+            yield {"app": app_context}
+
+        server = FastMCP("test", lifespan=lifespan)
+        search_policy.register(server)
+        async with create_connected_server_and_client_session(server._mcp_server) as client:
+            results = await asyncio.gather(*(
+                client.call_tool("search_policy", {"query": "VPN"}) for _ in range(4)
+            ))
+
+        assert runs == 1
+        assert app_context.inflight.shared == 3
+        assert len({r.content[0].text for r in results}) == 1
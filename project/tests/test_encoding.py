@@ -0,0 +1,115 @@
+"""
+Tests for the shared response encoder and the per-call ``format`` option.
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src import encoding
+from src.encoding import columnar, encode, set_default_format
+from src.models import AppContext
+from src.tools.lookup_inventory import register as register_lookup_inventory
+
+PAYLOAD = {
+    "query": "모니터",
+    "count": 2,
+    "items": [
+        {"item_id": "INV-001", "name": "27인치 모니터", "quantity": 3},
+        {"item_id": "INV-002", "name": "34인치 모니터", "quantity": 0},
+    ],
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(encoding, "orjson", None)
+    return request.param
+
+
+@pytest.fixture
+def default_format():
+    previous = encoding.default_format()
+    yield
+    set_default_format(previous)
+
+
+class TestEncode:
+    def test_pretty_is_indented_utf8(self, encoder: str) -> None:
+        text = encode(PAYLOAD, "pretty")
+        assert json.loads(text) == PAYLOAD
+        assert '\n  "query": "모니터"' in text
+
+    def test_compact_has_no_whitespace(self, encoder: str) -> None:
+        text = encode(PAYLOAD, "compact")
+        assert json.loads(text) == PAYLOAD
+        assert "\n" not in text and '": ' not in text
+        assert len(text) < len(encode(PAYLOAD, "pretty"))
+
+    def test_columnar_rewrites_table(self, encoder: str) -> None:
+        decoded = json.loads(encode(PAYLOAD, "columnar", table="items"))
+        assert decoded["items"] == {
+            "columns": ["item_id", "name", "quantity"],
+            "rows": [["INV-001", "27인치 모니터", 3], ["INV-002", "34인치 모니터", 0]],
+        }
+        assert decoded["query"] == "모니터"
+        assert PAYLOAD["items"][0]["item_id"] == "INV-001"  # input untouched
+
+    def test_columnar_without_table_is_compact(self) -> None:
+        assert encode(PAYLOAD, "columnar") == encode(PAYLOAD, "compact")
+
+    def test_large_int_falls_back_to_stdlib(self) -> None:
+        assert json.loads(encode({"n": 2**70}, "compact")) == {"n": 2**70}
+
+    def test_unknown_format(self) -> None:
+        with pytest.raises(ValueError):
+            encode(PAYLOAD, "yaml")
+
+    def test_server_default(self, default_format) -> None:
+        set_default_format("compact")
+        assert encode(PAYLOAD) == encode(PAYLOAD, "compact")
+        with pytest.raises(ValueError):
+            set_default_format("xml")
+
+
+class TestColumnar:
+    def test_union_of_columns_in_first_seen_order(self) -> None:
+        table = columnar([{"a": 1}, {"b": 2, "a": 3}])
+        assert table == {"columns": ["a", "b"], "rows": [[1, None], [3, 2]]}
+
+    def test_empty(self) -> None:
+        assert columnar([]) == {"columns": [], "rows": []}
+
+
+class TestToolFormat:
+    async def test_lookup_inventory_format(self, app_context: AppContext) -> None:
+        @asynccontextmanager
+        async def lifespan(server: FastMCP):
+            yield {"app": app_context}
+
+        server = FastMCP("test", lifespan=lifespan)
+        register_lookup_inventory(server)
+        async with create_connected_server_and_client_session(server._mcp_server) as client:
+            pretty = await client.call_tool("lookup_inventory", {"query": "e"})
+            table = await client.call_tool(
+                "lookup_inventory", {"query": "e", "format": "columnar"},
+            )
+            invalid = await client.call_tool(
+                "lookup_inventory", {"query": "e", "format": "xml"},
+            )
+
+        pretty_text = pretty.content[0].text
+        table_text = table.content[0].text
+        items = json.loads(table_text)["items"]
+        assert items["columns"][0] == "item_id"
+        assert len(items["rows"]) == json.loads(pretty_text)["count"]
+        assert len(table_text) < len(pretty_text)
+        assert invalid.isError and "INVALID_ARGUMENT" in invalid.content[0].text
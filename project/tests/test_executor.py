@@ -0,0 +1,84 @@
+"""
+Tests for the shared blocking executor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from src.executor import BlockingExecutor, ExecutorSaturated
+from src.inventory import InventoryFilters
+from src.models import AppContext, ErrorCode, ToolError
+
+marker: contextvars.ContextVar[str] = contextvars.ContextVar("marker", default="")
+
+
+@pytest.fixture
+def executor():
+    pool = BlockingExecutor(max_workers=2, max_queue=1)
+    yield pool
+    pool.shutdown()
+
+
+class TestBlockingExecutor:
+    async def test_runs_off_the_event_loop(self, executor: BlockingExecutor) -> None:
+        name = await executor.run(lambda: threading.current_thread().name)
+        assert name.startswith("blocking")
+        assert name != threading.current_thread().name
+
+    async def test_copies_context_variables(self, executor: BlockingExecutor) -> None:
+        marker.set("request-1")
+        assert await executor.run(marker.get) == "request-1"
+
+    async def test_calls_overlap(self, executor: BlockingExecutor) -> None:
+        # Both calls must be running at once for the barrier to release
+        barrier = threading.Barrier(2, timeout=5)
+        await asyncio.gather(executor.run(barrier.wait), executor.run(barrier.wait))
+
+    async def test_rejects_when_queue_full(self, executor: BlockingExecutor) -> None:
+        gate = threading.Event()
+        calls = [executor.submit(gate.wait, 5) for _ in range(executor.capacity)]
+        assert executor.pending == 3
+        with pytest.raises(ExecutorSaturated):
+            executor.submit(gate.wait, 5)
+        assert executor.rejected == 1
+
+        gate.set()
+        for call in calls:
+            call.result(timeout=5)
+        assert executor.pending == 0
+        assert await executor.run(lambda: "ok") == "ok"
+
+    async def test_exception_propagates(self, executor: BlockingExecutor) -> None:
+        def fail() -> None:
+            raise KeyError("x")
+
+        with pytest.raises(KeyError):
+            await executor.run(fail)
+        assert executor.pending == 0
+
+
+class TestRunBlocking:
+    async def test_inventory_search_on_pool_thread(self, app_context: AppContext) -> None:
+        page = await app_context.run_blocking(
+            app_context.search_inventory, "", 10,
+            filters=InventoryFilters(category="Electronics"),
+        )
+        assert {item["item_id"] for item in page.items} == {"INV-001", "INV-003"}
+
+    async def test_saturation_maps_to_unavailable(self, app_context: AppContext) -> None:
+        app_context.executor.shutdown()
+        app_context.executor = BlockingExecutor(max_workers=1, max_queue=0)
+        gate = threading.Event()
+        running = app_context.executor.submit(gate.wait, 5)
+        try:
+            with pytest.raises(ToolError) as exc_info:
+                await app_context.run_blocking(lambda: None)
+            assert exc_info.value.code == ErrorCode.UNAVAILABLE
+        finally:
+            gate.set()
+            running.result(timeout=5)
@@ -5,10 +5,14 @@ Integration tests — full workflow scenarios (EP 16).
 from __future__ import annotations
 
 import json
+from contextlib import asynccontextmanager
 
 import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
 
 from src.models import AppContext, Ticket
+from src.tools.lookup_inventory import register as register_lookup_inventory
 
 
 class TestInventoryWorkflow:
@@ -29,6 +33,34 @@ class TestInventoryWorkflow:
         ).fetchall()
         assert len(rows) == 0
 
+    async def test_tool_filters_ignore_case(self, app_context: AppContext) -> None:
+        """Mixed-case stored values match filters in any case via the tool."""
+        @asynccontextmanager
+        async def lifespan(server: FastMCP):
+            yield {"app": app_context}
+
+        server = FastMCP("test", lifespan=lifespan)
+        register_lookup_inventory(server)
+        calls = [
+            {"category": "Electronics"},
+            {"category": "ELECTRONICS", "status": "In_Stock"},
+            {"location": "warehouse a"},
+            {"location": "WAREHOUSE", "status": "OUT_OF_STOCK"},
+        ]
+        async with create_connected_server_and_client_session(server._mcp_server) as client:
+            results = [await client.call_tool("lookup_inventory", args) for args in calls]
+
+        item_ids = [
+            [item["item_id"] for item in json.loads(result.content[0].text)["items"]]
+            for result in results
+        ]
+        assert item_ids == [
+            ["INV-001", "INV-003"],
+            ["INV-001"],
+            ["INV-001", "INV-003"],
+            ["INV-003"],
+        ]
+
 
 class TestTicketCreationWorkflow:
     """Create and persist tickets via JSONL."""
@@ -82,5 +114,6 @@ class TestEndToEndScenario:
             success=True,
         )
 
+        logger.flush()
         lines = logger.log_path.read_text().strip().split("\n")
         assert len(lines) == 2
@@ -7,12 +7,31 @@ without spinning up the full MCP server.
 
 from __future__ import annotations
 
+import os
 import re
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import pytest
 
-from src.models import ErrorCode, ToolError
+from src import inventory
+from src.inventory import (
+    InventoryReaders,
+    build_search_index,
+    create_indexes,
+    create_schema,
+    fts_phrase,
+    InventoryFilters,
+    has_search_index,
+    load_csv,
+    search_inventory,
+    snapshot_is_current,
+    snapshot_path_for,
+)
+from src.models import AppContext, ErrorCode, ToolError
+from src.startup import StartupTimer
 from src.validation import validate_query
 
 
@@ -83,3 +102,304 @@ class TestInventorySearch:
         results = search_inventory_db(sample_db, "  office   chair  ")
         assert len(results) == 1
         assert results[0]["item_id"] == "INV-002"
+
+
+class TestTrigramSearch:
+    """Tests for the FTS5 trigram index path of search_inventory."""
+
+    @pytest.fixture
+    def fts_db(self, sample_db: sqlite3.Connection) -> sqlite3.Connection:
+        if not build_search_index(sample_db):
+            pytest.skip("SQLite build lacks FTS5 trigram support")
+        return sample_db
+
+    @pytest.mark.parametrize("query", [
+        "laptop", "electronics", "office chair", "usb-c", "ock", "printer",
+    ])
+    def test_matches_like_scan(self, fts_db: sqlite3.Connection, query: str) -> None:
+        """The trigram index returns the same rows, in the same order, as LIKE."""
+        fts = search_inventory(fts_db, query, 10, use_fts=True).items
+        like = search_inventory(fts_db, query, 10, use_fts=False).items
+        assert [r["item_id"] for r in fts] == [r["item_id"] for r in like]
+
+    def test_case_insensitive(self, fts_db: sqlite3.Connection) -> None:
+        rows = search_inventory(fts_db, "DOCKING", 10, use_fts=True).items
+        assert [r["item_id"] for r in rows] == ["INV-003"]
+
+    def test_short_query_falls_back_to_like(self, fts_db: sqlite3.Connection) -> None:
+        rows = search_inventory(fts_db, "us", 10, use_fts=True).items
+        assert [r["item_id"] for r in rows] == ["INV-003"]
+
+    def test_quotes_are_escaped(self, fts_db: sqlite3.Connection) -> None:
+        assert fts_phrase('14" pro') == '"14"" pro"'
+        assert search_inventory(fts_db, '14" pro', 10, use_fts=True).items == []
+
+    def test_respects_limit(self, fts_db: sqlite3.Connection) -> None:
+        page = search_inventory(fts_db, "electronics", 1, use_fts=True)
+        assert len(page.items) == 1
+        assert page.next_cursor is not None
+
+
+class TestFiltersAndPaging:
+    """Tests for structured filters and cursor pagination."""
+
+    def test_category_and_status(self, sample_db: sqlite3.Connection) -> None:
+        filters = InventoryFilters(category="Electronics", status="in_stock")
+        page = search_inventory(sample_db, "", 10, filters=filters)
+        assert [r["item_id"] for r in page.items] == ["INV-001"]
+
+    def test_location_prefix(self, sample_db: sqlite3.Connection) -> None:
+        filters = InventoryFilters(location="Warehouse")
+        page = search_inventory(sample_db, "", 10, filters=filters)
+        assert len(page.items) == 3
+        filters = InventoryFilters(location="Warehouse B")
+        page = search_inventory(sample_db, "", 10, filters=filters)
+        assert [r["item_id"] for r in page.items] == ["INV-002"]
+
+    def test_filters_ignore_case(self, sample_db: sqlite3.Connection) -> None:
+        create_indexes(sample_db)
+        filters = InventoryFilters(category="electronics", location="WAREHOUSE a", status="IN_STOCK")
+        page = search_inventory(sample_db, "", 10, filters=filters)
+        assert [r["item_id"] for r in page.items] == ["INV-001"]
+
+    def test_quantity_range(self, sample_db: sqlite3.Connection) -> None:
+        filters = InventoryFilters(min_quantity=1, max_quantity=30)
+        page = search_inventory(sample_db, "", 10, filters=filters)
+        assert [r["item_id"] for r in page.items] == ["INV-001"]
+
+    def test_query_combined_with_filters(self, sample_db: sqlite3.Connection) -> None:
+        filters = InventoryFilters(status="out_of_stock")
+        page = search_inventory(sample_db, "electronics", 10, filters=filters)
+        assert [r["item_id"] for r in page.items] == ["INV-003"]
+
+    def test_cursor_pagination(self, sample_db: sqlite3.Connection) -> None:
+        filters = InventoryFilters(location="Warehouse")
+        first = search_inventory(sample_db, "", 2, filters=filters)
+        assert [r["item_id"] for r in first.items] == ["INV-001", "INV-002"]
+        assert first.next_cursor is not None
+
+        second = search_inventory(
+            sample_db, "", 2, filters=filters, after=int(first.next_cursor),
+        )
+        assert [r["item_id"] for r in second.items] == ["INV-003"]
+        assert second.next_cursor is None
+
+    def test_items_exclude_rowid(self, sample_db: sqlite3.Connection) -> None:
+        page = search_inventory(sample_db, "chair", 10)
+        assert set(page.items[0]) == {
+            "item_id", "name", "category", "quantity",
+            "location", "status", "last_updated",
+        }
+
+    def test_filters_use_indexes(self, tmp_path: Path) -> None:
+        csv_path = tmp_path / "inventory.csv"
+        lines = ["item_id,name,category,quantity,location,status,last_updated"]
+        lines += [
+            f"INV-{i:03d},Item {i},cat-{i % 20},{i},HQ-{i % 7},in_stock,2026-01-01"
+            for i in range(400)
+        ]
+        csv_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        db = AppContext._init_db(csv_path)
+        plan = " ".join(
+            row[3] for row in db.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM inventory "
+                "WHERE category = ? AND status = ? AND quantity >= ?",
+                ("cat-3", "in_stock", 20),
+            )
+        )
+        assert "USING INDEX idx_inventory_category" in plan
+
+
+class TestBulkLoad:
+    """Tests for the batched CSV loader used by AppContext._init_db."""
+
+    @pytest.fixture
+    def empty_db(self) -> sqlite3.Connection:
+        db = sqlite3.connect(":memory:")
+        db.row_factory = sqlite3.Row
+        create_schema(db)
+        return db
+
+    def test_loads_rows_in_batches(self, empty_db: sqlite3.Connection, tmp_path: Path) -> None:
+        csv_path = tmp_path / "inventory.csv"
+        lines = ["item_id,name,category,quantity,location,status,last_updated"]
+        lines += [f"INV-{i:03d},Item {i},misc,{i},HQ,in_stock,2026-01-01" for i in range(7)]
+        csv_path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+        assert load_csv(empty_db, csv_path, batch_size=3) == 7
+        row = empty_db.execute(
+            "SELECT quantity, typeof(quantity) AS t FROM inventory WHERE item_id = 'INV-006'"
+        ).fetchone()
+        assert (row["quantity"], row["t"]) == (6, "integer")
+
+    def test_reordered_columns(self, empty_db: sqlite3.Connection, tmp_path: Path) -> None:
+        csv_path = tmp_path / "inventory.csv"
+        csv_path.write_text(
+            "name,item_id,status,category,quantity,location,last_updated,notes\n"
+            "Monitor,INV-001,in_stock,monitor,4,HQ,2026-01-01,spare\n",
+            encoding="utf-8",
+        )
+        load_csv(empty_db, csv_path)
+        row = dict(empty_db.execute("SELECT * FROM inventory").fetchone())
+        assert row["item_id"] == "INV-001"
+        assert row["name"] == "Monitor"
+        assert row["quantity"] == 4
+
+    def test_pragmas_restored(self, empty_db: sqlite3.Connection, tmp_path: Path) -> None:
+        before = empty_db.execute("PRAGMA journal_mode").fetchone()[0]
+        csv_path = tmp_path / "inventory.csv"
+        csv_path.write_text("item_id,name,category,quantity,location,status,last_updated\n")
+        load_csv(empty_db, csv_path)
+        assert empty_db.execute("PRAGMA journal_mode").fetchone()[0] == before
+
+    def test_non_integer_quantity_rejected(
+        self, empty_db: sqlite3.Connection, tmp_path: Path,
+    ) -> None:
+        csv_path = tmp_path / "inventory.csv"
+        csv_path.write_text(
+            "item_id,name,category,quantity,location,status,last_updated\n"
+            "INV-001,A,x,1,HQ,in_stock,2026-01-01\n"
+            "INV-002,B,x,twelve,HQ,in_stock,2026-01-01\n",
+            encoding="utf-8",
+        )
+        with pytest.raises(ValueError, match="invalid inventory row"):
+            load_csv(empty_db, csv_path)
+
+    def test_load_rate_in_startup_report(
+        self, empty_db: sqlite3.Connection, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        timer = StartupTimer()
+        monkeypatch.setattr(inventory, "STARTUP", timer)
+        csv_path = tmp_path / "inventory.csv"
+        csv_path.write_text(
+            "item_id,name,category,quantity,location,status,last_updated\n"
+            "INV-001,A,x,1,HQ,in_stock,2026-01-01\n",
+            encoding="utf-8",
+        )
+        load_csv(empty_db, csv_path)
+        assert "inventory csv: 1 rows in" in timer.report()
+        assert "rows/s" in timer.report()
+
+    def test_unique_index_after_load(self, empty_db: sqlite3.Connection, tmp_path: Path) -> None:
+        csv_path = tmp_path / "inventory.csv"
+        csv_path.write_text(
+            "item_id,name,category,quantity,location,status,last_updated\n"
+            "INV-001,A,x,1,HQ,in_stock,2026-01-01\n"
+            "INV-001,B,x,1,HQ,in_stock,2026-01-01\n",
+            encoding="utf-8",
+        )
+        load_csv(empty_db, csv_path)
+        with pytest.raises(sqlite3.IntegrityError):
+            create_indexes(empty_db)
+
+
+class TestSnapshot:
+    """Tests for the on-disk inventory snapshot used for fast startup."""
+
+    @pytest.fixture
+    def csv_path(self, tmp_path: Path) -> Path:
+        path = tmp_path / "inventory.csv"
+        path.write_text(
+            "item_id,name,category,quantity,location,status,last_updated\n"
+            "INV-001,Dell Latitude 5540,laptop,30,HQ,in_stock,2026-01-10\n",
+            encoding="utf-8",
+        )
+        return path
+
+    def test_snapshot_written_and_read_in_place(self, csv_path: Path) -> None:
+        snapshot = snapshot_path_for(csv_path)
+        for _ in range(2):  # written by the first open, reused by the second
+            readers = AppContext._open_inventory(csv_path, snapshot=True)
+            try:
+                assert readers.path == snapshot
+                db = readers.connection()
+                assert db.execute("SELECT name FROM inventory").fetchone()["name"] == "Dell Latitude 5540"
+                assert has_search_index(db) == has_search_index(AppContext._init_db(csv_path))
+            finally:
+                readers.close()
+            assert snapshot.exists()  # never deleted: not owned by the readers
+        assert snapshot_is_current(csv_path, snapshot)
+
+    def test_changed_csv_invalidates(self, csv_path: Path) -> None:
+        AppContext._open_inventory(csv_path, snapshot=True).close()
+        with csv_path.open("a", encoding="utf-8") as f:
+            f.write("INV-002,Monitor,monitor,5,HQ,in_stock,2026-01-11\n")
+        assert not snapshot_is_current(csv_path, snapshot_path_for(csv_path))
+
+        readers = AppContext._open_inventory(csv_path, snapshot=True)
+        try:
+            assert readers.connection().execute("SELECT COUNT(*) FROM inventory").fetchone()[0] == 2
+        finally:
+            readers.close()
+        assert snapshot_is_current(csv_path, snapshot_path_for(csv_path))
+
+    def test_touched_csv_with_same_content_reused(self, csv_path: Path) -> None:
+        AppContext._open_inventory(csv_path, snapshot=True).close()
+        stat = csv_path.stat()
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert snapshot_is_current(csv_path, snapshot_path_for(csv_path))
+
+    def test_missing_snapshot(self, csv_path: Path) -> None:
+        assert not snapshot_is_current(csv_path, snapshot_path_for(csv_path))
+
+    def test_without_snapshot_uses_temporary_copy(self, csv_path: Path) -> None:
+        readers = AppContext._open_inventory(csv_path)
+        assert readers.path.parent != csv_path.parent
+        assert not snapshot_path_for(csv_path).exists()
+        readers.close()
+        assert not readers.path.exists()
+
+
+class TestInventoryReaders:
+    """Tests for the per-thread read connections behind search_inventory."""
+
+    def test_connection_per_thread(self, sample_db: sqlite3.Connection) -> None:
+        readers = InventoryReaders.from_connection(sample_db)
+        try:
+            main = readers.connection()
+            assert readers.connection() is main
+            with ThreadPoolExecutor(1) as pool:
+                other = pool.submit(readers.connection).result()
+            assert other is not main
+            count = "SELECT COUNT(*) FROM inventory"
+            assert other.execute(count).fetchone()[0] == main.execute(count).fetchone()[0]
+        finally:
+            readers.close()
+
+    def test_threads_query_in_parallel(self, sample_db: sqlite3.Connection) -> None:
+        readers = InventoryReaders.from_connection(sample_db)
+        # Both statements must be running at once for the barrier to release
+        barrier = threading.Barrier(2, timeout=5)
+
+        def query() -> int:
+            db = readers.connection()
+            db.create_function("rendezvous", 0, barrier.wait)
+            return db.execute("SELECT rendezvous()").fetchone()[0]
+
+        try:
+            with ThreadPoolExecutor(2) as pool:
+                assert sorted(pool.map(lambda _: query(), range(2))) == [0, 1]
+        finally:
+            readers.close()
+
+    def test_read_only(self, sample_db: sqlite3.Connection) -> None:
+        readers = InventoryReaders.from_connection(sample_db)
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                readers.connection().execute("DELETE FROM inventory")
+        finally:
+            readers.close()
+
+    def test_close_removes_owned_file(self, sample_db: sqlite3.Connection) -> None:
+        readers = InventoryReaders.from_connection(sample_db)
+        db = readers.connection()
+        assert readers.path.exists()
+        readers.close()
+        assert not readers.path.exists()
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.execute("SELECT 1")
+
+    def test_app_context_searches_through_readers(self, app_context: AppContext) -> None:
+        app_context.db.close()  # lookups no longer touch the shared connection
+        page = app_context.search_inventory("dell", 10)
+        assert [item["item_id"] for item in page.items] == ["INV-001"]
@@ -0,0 +1,244 @@
+"""
+Tests for in-process call metrics and handler instrumentation.
+"""
+
+from __future__ import annotations
+
+import inspect
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.audit import AuditLogger
+from src.instrument import instrument, instrument_server, payload_size
+from src.metrics import Histogram, MetricsRegistry
+from src.models import AppContext, ErrorCode, ToolError
+from src.prometheus import app_collector, register, render
+from src.tools.list_tickets import register as register_list_tickets
+
+
+class TestHistogram:
+    def test_empty(self) -> None:
+        hist = Histogram()
+        assert hist.quantile(0.5) == 0.0
+        assert hist.summary()["count"] == 0
+
+    def test_quantiles_within_bucket_bounds(self) -> None:
+        hist = Histogram()
+        for value in [3.0] * 90 + [400.0] * 9 + [4000.0]:
+            hist.observe(value)
+        assert 2.5 <= hist.quantile(0.5) <= 5
+        assert 250 <= hist.quantile(0.95) <= 500
+        assert hist.quantile(0.99) <= 500
+        assert hist.quantile(1.0) == 4000.0
+
+    def test_overflow_bucket_uses_max(self) -> None:
+        hist = Histogram()
+        hist.observe(50_000.0)
+        assert hist.quantile(0.99) == 50_000.0
+
+    def test_summary_keys(self) -> None:
+        hist = Histogram()
+        hist.observe(1.5)
+        assert {"p50_ms", "p95_ms", "p99_ms", "mean_ms"} <= set(hist.summary())
+
+
+class TestRegistry:
+    def test_record_and_snapshot(self) -> None:
+        registry = MetricsRegistry()
+        registry.record("tool", "search_policy", 2.0, payload_bytes=100)
+        registry.record("tool", "search_policy", 4.0, payload_bytes=300,
+                        error_code="INVALID_ARGUMENT")
+        stats = registry.snapshot()["tool"]["search_policy"]
+        assert stats["calls"] == 2
+        assert stats["errors"] == {"INVALID_ARGUMENT": 1}
+        assert stats["payload_bytes"] == {"total": 400, "mean": 200.0, "max": 300}
+
+    def test_timer_records_db_kind(self) -> None:
+        registry = MetricsRegistry()
+        with registry.timer("db", "inventory.search"):
+            pass
+        with pytest.raises(KeyError):
+            with registry.timer("db", "inventory.search"):
+                raise KeyError("x")
+        stats = registry.get("db", "inventory.search")
+        assert stats.latency.count == 2
+        assert stats.errors == {"KeyError": 1}
+
+    async def test_in_flight_tracked_during_call(self) -> None:
+        registry = MetricsRegistry()
+        seen: list[dict] = []
+
+        @instrument("tool", "slow", registry)
+        async def slow() -> str:
+            seen.append(registry.in_flight())
+            return "ok"
+
+        await slow()
+        assert seen == [{("tool", "slow"): 1}]
+        assert registry.in_flight() == {("tool", "slow"): 0}
+
+    def test_reset(self) -> None:
+        registry = MetricsRegistry()
+        registry.record("prompt", "incident_report", 1.0)
+        registry.reset()
+        assert registry.snapshot() == {}
+
+
+class TestInstrument:
+    def test_payload_size(self) -> None:
+        assert payload_size("한글") == 6
+        assert payload_size(b"abc") == 3
+        assert payload_size(None) == 0
+
+    def test_preserves_signature(self) -> None:
+        async def handler(query: str, limit: int = 10, ctx: Context = None) -> str:
+            return query
+
+        wrapped = instrument("tool", "handler", MetricsRegistry())(handler)
+        assert inspect.iscoroutinefunction(wrapped)
+        assert inspect.signature(wrapped) == inspect.signature(handler)
+        assert wrapped.__name__ == "handler"
+
+    async def test_records_success_and_error(self) -> None:
+        registry = MetricsRegistry()
+
+        @instrument("tool", "flaky", registry)
+        async def flaky(fail: bool) -> str:
+            if fail:
+                raise ToolError(ErrorCode.NOT_FOUND, "missing")
+            return "ok"
+
+        assert await flaky(False) == "ok"
+        with pytest.raises(ToolError):
+            await flaky(True)
+        stats = registry.get("tool", "flaky")
+        assert stats.latency.count == 2
+        assert stats.errors == {"NOT_FOUND": 1}
+        assert stats.payload_bytes == 2
+
+    def test_sync_handler(self) -> None:
+        registry = MetricsRegistry()
+        wrapped = instrument("resource", "res://x", registry)(lambda: "data")
+        assert wrapped() == "data"
+        assert registry.get("resource", "res://x").latency.count == 1
+
+    async def test_stamps_duration_on_audit_entries(self, audit_logger: AuditLogger) -> None:
+        @instrument("tool", "logged", MetricsRegistry())
+        async def logged() -> str:
+            await audit_logger.log(action="call", tool_name="logged")
+            return "ok"
+
+        await logged()
+        await audit_logger.log(action="outside", tool_name="none")
+        audit_logger.flush()
+        inside, outside = map(json.loads, audit_logger.log_path.read_text().splitlines())
+        assert inside["duration_ms"] >= 0
+        assert "duration_ms" not in outside
+
+
+class TestInstrumentServer:
+    async def test_registered_handlers_are_timed(self) -> None:
+        registry = MetricsRegistry()
+        server = FastMCP("test")
+        instrument_server(server, registry)
+
+        @server.tool()
+        async def echo(text: str, ctx: Context = None) -> str:
+            """Echo text back."""
+            return text
+
+        @server.resource("demo://{item}")
+        async def demo(item: str) -> str:
+            return item
+
+        tool = (await server.list_tools())[0]
+        assert set(tool.inputSchema["properties"]) == {"text"}
+        await server.call_tool("echo", {"text": "hello"})
+        await server.read_resource("demo://abc")
+
+        snapshot = registry.snapshot()
+        assert snapshot["tool"]["echo"]["calls"] == 1
+        assert snapshot["tool"]["echo"]["payload_bytes"]["total"] == 5
+        assert snapshot["resource"]["demo://{item}"]["calls"] == 1
+
+    async def test_handler_failure_audited_once(self, app_context: AppContext) -> None:
+        @asynccontextmanager
+        async def lifespan(server: FastMCP):
+            yield {"app": app_context}
+
+        server = FastMCP("test", lifespan=lifespan)
+        instrument_server(server, MetricsRegistry())
+        register_list_tickets(server)
+        async with create_connected_server_and_client_session(server._mcp_server) as client:
+            result = await client.call_tool("get_ticket", {"ticket_id": "TKT-999"})
+
+        assert result.isError
+        app_context.audit_logger.flush()
+        entries = list(map(json.loads, app_context.audit_logger.log_path.read_text().splitlines()))
+        assert [(e["action"], e.get("error_code")) for e in entries] == [("error", "NOT_FOUND")]
+
+
+class TestPrometheus:
+    def test_render_counters_and_histograms(self) -> None:
+        registry = MetricsRegistry()
+        registry.record("tool", "search_policy", 3.0, payload_bytes=10)
+        registry.record("tool", "search_policy", 30.0, error_code="INVALID_ARGUMENT")
+        registry.record("db", "inventory.search", 0.2)
+        text = render(registry)
+
+        assert '# TYPE mcp_requests_total counter' in text
+        assert 'mcp_requests_total{kind="tool",name="search_policy"} 2' in text
+        assert (
+            'mcp_request_errors_total{kind="tool",name="search_policy",'
+            'code="INVALID_ARGUMENT"} 1'
+        ) in text
+        assert 'mcp_request_duration_seconds_bucket{kind="tool",name="search_policy",le="0.005"} 1' in text
+        assert 'mcp_request_duration_seconds_bucket{kind="tool",name="search_policy",le="+Inf"} 2' in text
+        assert 'mcp_request_duration_seconds_count{kind="tool",name="search_policy"} 2' in text
+        assert 'mcp_db_query_duration_seconds_count{name="inventory.search"} 1' in text
+        assert "inventory.search" not in text.split("mcp_db_query_duration_seconds")[0]
+
+    def test_constant_labels_on_every_series(self, app_context: AppContext) -> None:
+        registry = MetricsRegistry()
+        registry.set_labels(worker="2")
+        registry.record("tool", "search_policy", 3.0)
+        registry.record("db", "inventory.search", 0.2)
+        registry.add_collector(app_collector(app_context))
+        samples = [
+            line for line in render(registry).splitlines() if not line.startswith("#")
+        ]
+        assert samples and all('{worker="2"' in line for line in samples)
+        assert 'mcp_requests_total{worker="2",kind="tool",name="search_policy"} 1' in samples
+
+    def test_label_escaping(self) -> None:
+        registry = MetricsRegistry()
+        registry.record("resource", 'x://"a"\\b', 1.0)
+        assert 'name="x://\\"a\\"\\\\b"' in render(registry)
+
+    async def test_app_collector(self, app_context: AppContext, tmp_path) -> None:
+        app_context.audit_logger = AuditLogger(log_dir=tmp_path / "slow", flush_interval=60)
+        registry = MetricsRegistry()
+        registry.add_collector(app_collector(app_context))
+        await app_context.audit_logger.log(action="call", tool_name="t")
+        app_context.policy_cache.get("missing", 1)
+        text = render(registry)
+        assert "mcp_audit_queue_depth 1" in text
+        assert 'mcp_cache_misses_total{cache="policy"} 1' in text
+        assert 'mcp_cache_hit_ratio{cache="policy"} 0.0' in text
+        app_context.audit_logger.close()
+
+    def test_http_route(self) -> None:
+        from starlette.testclient import TestClient
+
+        registry = MetricsRegistry()
+        registry.record("tool", "echo", 1.0)
+        server = FastMCP("test")
+        register(server, registry)
+        response = TestClient(server.streamable_http_app()).get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'mcp_requests_total{kind="tool",name="echo"} 1' in response.text
@@ -10,7 +10,10 @@ from pathlib import Path
 
 import pytest
 
+from src import encoding
+from src.encoding import set_default_format
 from src.models import AppContext, ErrorCode, PolicyDoc, ToolError
+from src.search_index import PolicyIndex
 from src.validation import validate_doc_id
 
 
@@ -120,3 +123,51 @@ class TestPolicyDetail:
         with pytest.raises(ToolError) as exc_info:
             get_policy_content(sample_policies, "foo/bar")
         assert exc_info.value.code == ErrorCode.INVALID_ARGUMENT
+
+
+class TestPolicyLookup:
+    """Tests for the doc_id index on AppContext."""
+
+    def test_get_policy_by_id(self, app_context: AppContext) -> None:
+        policy = app_context.get_policy("security-guidelines")
+        assert policy is not None
+        assert policy.title == "보안 가이드라인"
+
+    def test_get_policy_unknown(self, app_context: AppContext) -> None:
+        assert app_context.get_policy("nonexistent-policy") is None
+
+
+class TestPolicyIndexPayload:
+    """Tests for the precomputed, versioned policy://index payload."""
+
+    def test_payload_matches_index_listing(self, app_context: AppContext) -> None:
+        payload = app_context.policy_index.index_payload
+        assert json.loads(payload) == build_policy_index(app_context.policies)
+
+    def test_payload_is_computed_once(self, app_context: AppContext) -> None:
+        index = app_context.policy_index
+        assert index.index_payload is index.index_payload
+
+    def test_version_changes_only_with_content(self, app_context: AppContext) -> None:
+        version = app_context.policy_index.index_version
+        app_context.reload_policies(set())
+        assert app_context.policy_index.index_version == version
+
+        (app_context.policy_dir / "travel.md").write_text(
+            "---\ntitle: 출장 정책\n---\n본문\n", encoding="utf-8",
+        )
+        app_context.reload_policies(set())
+        assert app_context.policy_index.index_version != version
+
+    def test_version_independent_of_response_format(self, app_context: AppContext) -> None:
+        previous = encoding.default_format()
+        versions = set()
+        try:
+            for fmt in ("pretty", "compact"):
+                set_default_format(fmt)
+                index = PolicyIndex.build(app_context.policies)
+                versions.add(index.index_version)
+                assert json.loads(index.index_payload) == index.index_listing
+        finally:
+            set_default_format(previous)
+        assert len(versions) == 1
@@ -0,0 +1,93 @@
+"""
+Tests for policy hot reload: change detection, incremental re-parsing
+and atomic index swaps.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from src import server
+from src.models import AppContext
+from src.policy_watcher import PolicyWatcher
+
+
+def touch_later(path, text: str) -> None:
+    """Rewrite a file and bump its mtime so the change is always visible."""
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestPolicyWatcher:
+    def test_no_change_keeps_index(self, app_context: AppContext) -> None:
+        watcher = PolicyWatcher(app_context)
+        before = app_context.policy_index
+        assert watcher.poll() is False
+        assert app_context.policy_index is before
+
+    def test_edit_reparses_only_changed_file(self, app_context: AppContext) -> None:
+        watcher = PolicyWatcher(app_context)
+        untouched = app_context.policy_index.get("security-guidelines")
+
+        path = app_context.policy_dir / "remote-work.md"
+        touch_later(path, "---\ntitle: 하이브리드 근무 정책\ntags: [hybrid]\n---\n본문\n")
+
+        assert watcher.poll() is True
+        index = app_context.policy_index
+        assert index.get("remote-work").title == "하이브리드 근무 정책"
+        assert index.get("security-guidelines") is untouched
+        assert [d.doc_id for d in index.candidates("hybrid")] == ["remote-work"]
+
+    def test_added_and_removed_files(self, app_context: AppContext) -> None:
+        watcher = PolicyWatcher(app_context)
+        (app_context.policy_dir / "remote-work.md").unlink()
+        (app_context.policy_dir / "travel.md").write_text(
+            "---\ntitle: 출장 정책\ntags: [travel]\n---\n출장 규정\n",
+            encoding="utf-8",
+        )
+
+        assert watcher.poll() is True
+        doc_ids = [d.doc_id for d in app_context.policies]
+        assert doc_ids == ["security-guidelines", "travel"]
+        assert app_context.policy_index.policies is app_context.policies
+        assert app_context.policy_index.get("remote-work") is None
+
+    def test_background_thread_picks_up_edits(self, app_context: AppContext) -> None:
+        app_context.start_policy_watcher(interval=0.01)
+        try:
+            touch_later(
+                app_context.policy_dir / "remote-work.md",
+                "---\ntitle: 변경된 정책\n---\n본문\n",
+            )
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                if app_context.policy_index.get("remote-work").title == "변경된 정책":
+                    break
+                time.sleep(0.01)
+            assert app_context.policy_index.get("remote-work").title == "변경된 정책"
+        finally:
+            app_context.stop_policy_watcher()
+        assert not app_context.policy_watcher.running
+
+    def test_edits_before_first_start_are_picked_up(self, app_context: AppContext) -> None:
+        # The baseline is taken at load, not when the first session starts
+        touch_later(
+            app_context.policy_dir / "remote-work.md",
+            "---\ntitle: 시작 전 변경\n---\n본문\n",
+        )
+        assert app_context.policy_watcher.poll() is True
+        assert app_context.policy_index.get("remote-work").title == "시작 전 변경"
+
+    def test_first_session_starts_watcher(self, app_context: AppContext, monkeypatch) -> None:
+        # Shared by the lifespan and pre-forked workers (pin_worker_state)
+        monkeypatch.setattr(server, "_active_sessions", 0)
+        monkeypatch.setattr(server, "POLICY_RELOAD_INTERVAL", 0.01)
+        server.start_app(app_context)
+        server.start_app(app_context)
+        try:
+            assert app_context.policy_watcher.running
+            assert server._active_sessions == 2
+        finally:
+            app_context.stop_policy_watcher()
@@ -0,0 +1,137 @@
+"""
+Tests for the policy search index: tokenization, candidate selection
+and relevance scoring over in-memory documents.
+"""
+
+from __future__ import annotations
+
+from src.models import AppContext, PolicyDoc
+from src.search_index import (
+    IndexedPolicy,
+    PolicyIndex,
+    parse_frontmatter,
+    select_page,
+    tokenize,
+)
+from src.tools.search_policy import calculate_relevance
+
+
+def search(index: PolicyIndex, query: str) -> list[tuple[str, float]]:
+    """Score every candidate the way the search_policy tool does."""
+    scored = [
+        (doc.doc_id, calculate_relevance(query, doc))
+        for doc in index.candidates(query)
+    ]
+    return [(doc_id, score) for doc_id, score in scored if score > 0]
+
+
+class TestTokenize:
+    def test_lowercases_and_splits(self) -> None:
+        assert tokenize("VPN을 사용해야 합니다.") == ["vpn을", "사용해야", "합니다"]
+
+    def test_punctuation_only(self) -> None:
+        assert tokenize("!!! ...") == []
+
+
+class TestFrontmatter:
+    def test_parsed_with_yaml(self) -> None:
+        meta, body = parse_frontmatter("---\ntitle: \"A: B\"\ntags:\n  - x\n---\nbody")
+        assert meta == {"title": "A: B", "tags": ["x"]}
+        assert body == "body"
+
+    def test_without_frontmatter(self) -> None:
+        assert parse_frontmatter("# Title\nbody") == ({}, "# Title\nbody")
+
+
+class TestPolicyIndex:
+    def test_built_by_app_context(self, app_context: AppContext) -> None:
+        """AppContext builds the index once from its policy list."""
+        assert len(app_context.policy_index) == 2
+        assert app_context.policy_index.get("remote-work").title == "재택근무 정책"
+
+    def test_postings_track_fields(self, sample_policies: list[PolicyDoc]) -> None:
+        index = PolicyIndex.build(sample_policies)
+        posting = index.postings["security"]["security-guidelines"]
+        assert posting.tag_tf == 1
+        assert posting.body_tf == 0
+
+    def test_substring_inside_token(self, sample_policies: list[PolicyDoc]) -> None:
+        """Korean particles attached to a term still match ("VPN을")."""
+        index = PolicyIndex.build(sample_policies)
+        assert [d.doc_id for d in index.candidates("vpn")] == ["security-guidelines"]
+
+    def test_no_candidates(self, sample_policies: list[PolicyDoc]) -> None:
+        index = PolicyIndex.build(sample_policies)
+        assert index.candidates("spaceship") == []
+
+    def test_parsed_on_first_use(self, sample_policies: list[PolicyDoc]) -> None:
+        index = PolicyIndex.build(sample_policies)
+        assert not index.parsed
+        assert index.get_policy("remote-work").title == "재택근무 정책"
+        assert not index.parsed  # the listing needs no parsing
+        assert search(index, "비밀번호") == [("security-guidelines", 1.0)]
+        assert index.parsed
+
+    def test_index_does_not_reread_files(self, sample_policies: list[PolicyDoc]) -> None:
+        """Once built, searching works even if the files disappear."""
+        index = PolicyIndex.build(sample_policies)
+        index.warm()
+        for doc in sample_policies:
+            doc.path.unlink()
+        assert search(index, "비밀번호") == [("security-guidelines", 1.0)]
+
+
+class TestRelevance:
+    def test_title_tag_and_body_weights(self, sample_policies: list[PolicyDoc]) -> None:
+        index = PolicyIndex.build(sample_policies)
+        # title (3.0) + body occurrences x2 (1.0)
+        assert search(index, "재택근무") == [("remote-work", 4.0)]
+        # exact tag (2.0)
+        assert search(index, "compliance") == [("security-guidelines", 2.0)]
+
+    def test_multi_word_query(self, sample_policies: list[PolicyDoc]) -> None:
+        index = PolicyIndex.build(sample_policies)
+        assert search(index, "노트북과 모니터") == [("remote-work", 0.5)]
+
+
+class TestBM25F:
+    def test_field_statistics(self, sample_policies: list[PolicyDoc]) -> None:
+        index = PolicyIndex.build(sample_policies)
+        lengths = index.field_lengths["remote-work"]
+        assert lengths["title"] == 2
+        assert lengths["tag"] == 5
+        assert index.avg_field_lengths["title"] == 2.0
+
+    def test_title_boost_outranks_body(self) -> None:
+        index = PolicyIndex([
+            IndexedPolicy("onboarding", "신규 입사자 안내", [], "", "입사 첫날 보안 교육을 받습니다."),
+            IndexedPolicy("security", "보안 가이드라인", [], "", "사내 시스템 접근 규칙입니다."),
+        ])
+        ranked = select_page(index.bm25f("보안"), limit=10)
+        assert [doc.doc_id for doc, _ in ranked] == ["security", "onboarding"]
+
+    def test_prefix_matches_particles(self, sample_policies: list[PolicyDoc]) -> None:
+        index = PolicyIndex.build(sample_policies)
+        assert index.prefix_terms("vpn") == ["vpn", "vpn을"]
+        assert [doc.doc_id for doc, _ in index.bm25f("VPN")] == ["security-guidelines"]
+
+    def test_no_match(self, sample_policies: list[PolicyDoc]) -> None:
+        index = PolicyIndex.build(sample_policies)
+        assert index.bm25f("spaceship") == []
+
+
+class TestSelectPage:
+    def test_top_k_in_score_order(self) -> None:
+        scored = [("a", 1.0), ("b", 3.0), ("c", 2.0), ("d", 0.5)]
+        assert select_page(scored, limit=2) == [("b", 3.0), ("c", 2.0)]
+
+    def test_offset(self) -> None:
+        scored = [("a", 1.0), ("b", 3.0), ("c", 2.0), ("d", 0.5)]
+        assert select_page(scored, limit=2, offset=2) == [("a", 1.0), ("d", 0.5)]
+
+    def test_ties_keep_original_order(self) -> None:
+        scored = [("a", 1.0), ("b", 1.0), ("c", 1.0)]
+        assert select_page(scored, limit=2) == [("a", 1.0), ("b", 1.0)]
+
+    def test_offset_past_end(self) -> None:
+        assert select_page([("a", 1.0)], limit=10, offset=5) == []
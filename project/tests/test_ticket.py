@@ -6,13 +6,23 @@ idempotency, and validation.
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
-from datetime import datetime, timezone
 
 import pytest
 
 from src.audit import AuditLogger
 from src.models import AppContext, ErrorCode, Ticket, ToolError
+from src.ticket_store import (
+    SqliteTicketRepository,
+    TicketFilters,
+    TicketRepository,
+    open_ticket_repository,
+)
+from src.tickets import InterProcessLock, TicketIndex
 from src.validation import validate_ticket_input
 
 
@@ -38,31 +48,9 @@ def create_ticket_logic(
 ) -> dict:
     """Reproduce the creation logic of create_ticket (confirm=True)."""
     validated = validate_ticket_input(title, body, priority)
-    validated_title = validated["title"]
-    validated_body = validated["description"]
-    validated_priority = validated["priority"]
-
-    # Idempotency check
-    if idempotency_key:
-        existing_tickets = app.load_tickets()
-        for ticket in existing_tickets:
-            if ticket.idempotency_key == idempotency_key:
-                return asdict(ticket)
-
-    ticket_id = app.next_ticket_id()
-    now = datetime.now(timezone.utc).isoformat()
-
-    ticket = Ticket(
-        ticket_id=ticket_id,
-        title=validated_title,
-        priority=validated_priority,
-        body=validated_body,
-        status="open",
-        created_at=now,
-        idempotency_key=idempotency_key,
+    ticket, _ = app.create_ticket(
+        validated["title"], validated["priority"], validated["description"], idempotency_key,
     )
-
-    app.append_ticket(ticket)
     return asdict(ticket)
 
 
@@ -167,6 +155,382 @@ class TestTicketIdempotency:
         t2 = create_ticket_logic(app_context, "Issue X-ray", "Body of issue x-ray", "low")
         assert t1["ticket_id"] != t2["ticket_id"]
 
+    def test_idempotent_return_uses_no_id(self, app_context: AppContext) -> None:
+        """Returning the existing ticket does not allocate a ticket ID."""
+        t1 = create_ticket_logic(app_context, "Issue Delta", "Body of issue delta", "low", "key-d")
+        create_ticket_logic(app_context, "Issue Delta", "Body of issue delta", "low", "key-d")
+        t2 = create_ticket_logic(app_context, "Issue Echo", "Body of issue echo", "low")
+        assert (t1["ticket_id"], t2["ticket_id"]) == ("TKT-006", "TKT-007")
+
+
+def make_ticket(num: int, key: str | None = None) -> Ticket:
+    return Ticket(
+        ticket_id=f"TKT-{num:03d}",
+        title=f"Ticket number {num}",
+        priority="low",
+        body="Body of the ticket.",
+        status="open",
+        created_at="2026-01-15T09:00:00+00:00",
+        idempotency_key=key,
+    )
+
+
+class TestTicketIndex:
+    """Tests for the persistent idempotency-key index."""
+
+    def test_lookup_by_key(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(1, "key-1"))
+        app_context.append_ticket(make_ticket(2))
+        found = app_context.find_ticket_by_idempotency_key("key-1")
+        assert found is not None and found.ticket_id == "TKT-001"
+        assert app_context.find_ticket_by_idempotency_key("missing") is None
+
+    def test_sidecar_persists_across_restarts(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(1, "key-1"))
+        app_context.append_ticket(make_ticket(2, "key-2"))
+        sidecar = app_context.ticket_store.index.index_file
+        assert len(sidecar.read_text().splitlines()) == 2
+
+        reopened = TicketIndex(app_context.tickets_file)
+        assert len(reopened) == 2
+        assert reopened.find_by_idempotency_key("key-2")["ticket_id"] == "TKT-002"
+        assert len(sidecar.read_text().splitlines()) == 2
+
+    def test_picks_up_external_appends(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(1))
+        # Another server process appends directly to the shared file
+        with app_context.tickets_file.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(make_ticket(2, "other-proc"))) + "\n")
+        found = app_context.find_ticket_by_idempotency_key("other-proc")
+        assert found is not None and found.ticket_id == "TKT-002"
+
+    def test_truncated_ticket_file_rebuilds(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(1, "key-1"))
+        app_context.tickets_file.write_text("", encoding="utf-8")
+        reopened = TicketIndex(app_context.tickets_file)
+        assert reopened.find_by_idempotency_key("key-1") is None
+
+    def test_replaced_ticket_file_rebuilds(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(1, "key-1"))
+        app_context.append_ticket(make_ticket(2, "key-2"))
+        # Same-size replacement: the sidecar offsets no longer line up
+        app_context.tickets_file.write_text(
+            "".join(json.dumps(asdict(make_ticket(n, f"new-{n}"))) + "\n" for n in (7, 8)),
+            encoding="utf-8",
+        )
+        reopened = TicketIndex(app_context.tickets_file)
+        assert reopened.find_by_idempotency_key("key-1") is None
+        assert reopened.find_by_idempotency_key("new-8")["ticket_id"] == "TKT-008"
+
+    def test_duplicate_key_maps_to_first_ticket(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(1, "dup"))
+        app_context.append_ticket(make_ticket(2, "dup"))
+        assert app_context.find_ticket_by_idempotency_key("dup").ticket_id == "TKT-001"
+        reopened = TicketIndex(app_context.tickets_file)
+        assert reopened.find_by_idempotency_key("dup")["ticket_id"] == "TKT-001"
+
+    def test_corrupt_sidecar_rebuilds(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(1, "key-1"))
+        app_context.ticket_store.index.index_file.write_text("{not json\n", encoding="utf-8")
+        reopened = TicketIndex(app_context.tickets_file)
+        assert reopened.find_by_idempotency_key("key-1")["ticket_id"] == "TKT-001"
+
+    def test_sidecar_tail_indexed_twice_loads_once(self, app_context: AppContext) -> None:
+        # Two worker processes both index the same appended tail
+        other = TicketIndex(app_context.tickets_file)
+        app_context.append_ticket(make_ticket(1, "key-1"))
+        other.refresh()
+        sidecar = app_context.ticket_store.index.index_file
+        assert len(sidecar.read_text().splitlines()) == 2
+
+        reopened = TicketIndex(app_context.tickets_file)
+        assert [ref.ticket_id for _, ref in reopened.scan()] == ["TKT-001"]
+
+
+class TestInterProcessLock:
+    def test_reentrant_and_excludes_other_descriptors(self, tmp_path) -> None:
+        fcntl = pytest.importorskip("fcntl")
+        lock = InterProcessLock(tmp_path / "tickets.lock")
+        with lock, lock:
+            fd = os.open(lock.path, os.O_RDWR)
+            try:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            finally:
+                os.close(fd)
+        fd = os.open(lock.path, os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        finally:
+            os.close(fd)
+
+
+class TestTicketIdAllocator:
+    """Tests for the monotonic ticket ID allocator."""
+
+    def test_empty_store_starts_after_seed_data(self, app_context: AppContext) -> None:
+        assert app_context.next_ticket_id() == "TKT-006"
+
+    def test_continues_from_existing_tickets(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(41))
+        assert app_context.next_ticket_id() == "TKT-042"
+
+    def test_ids_not_reused_without_append(self, app_context: AppContext) -> None:
+        first = app_context.next_ticket_id()
+        second = app_context.next_ticket_id()
+        assert (first, second) == ("TKT-006", "TKT-007")
+
+    def test_high_water_mark_persists(self, app_context: AppContext) -> None:
+        app_context.next_ticket_id()
+        app_context.next_ticket_id()
+        reopened = TicketIndex(app_context.tickets_file)
+        assert reopened.allocate_id() == "TKT-008"
+
+    def test_more_than_three_digits(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(999))
+        assert app_context.next_ticket_id() == "TKT-1000"
+        assert app_context.next_ticket_id() == "TKT-1001"
+
+    def test_concurrent_allocation_is_unique(self, app_context: AppContext) -> None:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            ids = list(pool.map(lambda _: app_context.next_ticket_id(), range(50)))
+        assert len(set(ids)) == 50
+
+    def test_unique_across_processes(self, app_context: AppContext) -> None:
+        # A second index on the same file stands in for another worker
+        other = TicketIndex(app_context.tickets_file)
+        ids = [app_context.next_ticket_id(), other.allocate_id(), app_context.next_ticket_id()]
+        assert ids == ["TKT-006", "TKT-007", "TKT-008"]
+
+
+class TestSqliteTicketStore:
+    """Tests for the SQLite ticket backend."""
+
+    @pytest.fixture
+    def sqlite_app(self, app_context: AppContext) -> AppContext:
+        app_context.ticket_store = open_ticket_repository(
+            app_context.tickets_file, "sqlite",
+        )
+        yield app_context
+        app_context.ticket_store.close()
+
+    def test_create_and_lookup(self, sqlite_app: AppContext) -> None:
+        created = create_ticket_logic(
+            sqlite_app, "Printer jam", "Floor 3 printer is jammed", "low",
+            idempotency_key="sq-1",
+        )
+        assert created["ticket_id"] == "TKT-006"
+        assert sqlite_app.get_ticket("TKT-006").title == "Printer jam"
+        again = create_ticket_logic(
+            sqlite_app, "Printer jam", "Floor 3 printer is jammed", "low",
+            idempotency_key="sq-1",
+        )
+        assert again == created
+        assert [t.ticket_id for t in sqlite_app.load_tickets()] == ["TKT-006"]
+
+    def test_wal_mode_and_indexes(self, sqlite_app: AppContext) -> None:
+        db = sqlite_app.ticket_store.db
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in db.execute("PRAGMA index_list(tickets)")}
+        assert {
+            "idx_tickets_id", "idx_tickets_idempotency_key", "idx_tickets_status",
+            "idx_tickets_priority", "idx_tickets_created_at",
+        } <= indexes
+
+    def test_imports_jsonl(self, app_context: AppContext) -> None:
+        app_context.append_ticket(make_ticket(1, "key-1"))
+        app_context.append_ticket(make_ticket(7))
+        store = open_ticket_repository(app_context.tickets_file, "sqlite")
+        try:
+            assert store.find_by_idempotency_key("key-1")["ticket_id"] == "TKT-001"
+            assert store.allocate_id() == "TKT-008"
+            # Only the tail written since the last import is read again
+            app_context.append_ticket(make_ticket(9, "key-9"))
+            assert store.import_jsonl(app_context.tickets_file) == 1
+            assert store.import_jsonl(app_context.tickets_file) == 0
+            assert store.get("TKT-009") is not None
+        finally:
+            store.close()
+
+    def test_state_persists_across_reopen(self, tmp_path) -> None:
+        db_path = tmp_path / "tickets.sqlite3"
+        store = SqliteTicketRepository(db_path)
+        store.append(asdict(make_ticket(41, "k")))
+        store.close()
+
+        reopened = SqliteTicketRepository(db_path)
+        try:
+            assert reopened.find_by_idempotency_key("k")["ticket_id"] == "TKT-041"
+            assert reopened.allocate_id() == "TKT-042"
+        finally:
+            reopened.close()
+
+    def test_idempotency_atomic_across_processes(self, tmp_path, monkeypatch) -> None:
+        # Two handles on one file stand in for two workers: their locks are
+        # process-local, so only the write transaction keeps keys unique
+        insert = SqliteTicketRepository._insert
+
+        def slow_insert(self, records, skip_existing=False):
+            time.sleep(0.01)  # widen the lookup -> insert window
+            insert(self, records, skip_existing)
+
+        monkeypatch.setattr(SqliteTicketRepository, "_insert", slow_insert)
+        db_path = tmp_path / "tickets.sqlite3"
+        stores = [SqliteTicketRepository(db_path) for _ in range(2)]
+        try:
+            def attempt(n: int) -> tuple[dict, bool]:
+                return stores[n % 2].create_if_new(asdict(make_ticket(0, "same")))
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(attempt, range(16)))
+            assert [created for _, created in results].count(True) == 1
+            assert {ticket["ticket_id"] for ticket, _ in results} == {"TKT-006"}
+            rows = stores[0].db.execute(
+                "SELECT COUNT(*) FROM tickets WHERE idempotency_key = 'same'"
+            ).fetchone()[0]
+            assert rows == 1
+            # Requests that found the existing ticket used up no IDs
+            assert stores[1].allocate_id() == "TKT-007"
+        finally:
+            for store in stores:
+                store.close()
+
+    def test_duplicate_ticket_id_is_an_error(self, tmp_path) -> None:
+        store = SqliteTicketRepository(tmp_path / "tickets.sqlite3")
+        try:
+            store.append(asdict(make_ticket(1)))
+            with pytest.raises(sqlite3.IntegrityError):
+                store.append(asdict(make_ticket(1, "retry")))
+            assert store.find_by_idempotency_key("retry") is None
+        finally:
+            store.close()
+
+    def test_repository_is_abstract(self) -> None:
+        with pytest.raises(TypeError):
+            TicketRepository()
+
+    def test_unknown_backend(self, app_context: AppContext) -> None:
+        with pytest.raises(ValueError, match="Unknown ticket backend"):
+            open_ticket_repository(app_context.tickets_file, "redis")
+
+
+def seed_listing(app: AppContext) -> None:
+    rows = [
+        (1, "open", "high", "Marcus Chen", "2026-02-18T09:23:00Z"),
+        (2, "resolved", "low", "IT Team", "2026-02-10T14:15:00Z"),
+        (3, "open", "critical", None, "2026-02-19T08:45:00Z"),
+        (4, "open", "high", "marcus chen", "2026-02-20T10:05:00Z"),
+    ]
+    for n, status, priority, assignee, created_at in rows:
+        ticket = make_ticket(n)
+        ticket.status = status
+        ticket.priority = priority
+        ticket.assigned_to = assignee
+        ticket.created_at = created_at
+        app.append_ticket(ticket)
+
+
+class TestTicketListing:
+    """Tests for indexed ticket filtering and cursor paging (both backends)."""
+
+    @pytest.fixture(params=["jsonl", "sqlite"])
+    def listing_app(self, request, app_context: AppContext) -> AppContext:
+        app_context.ticket_store = open_ticket_repository(
+            app_context.tickets_file, request.param,
+        )
+        seed_listing(app_context)
+        yield app_context
+        app_context.ticket_store.close()
+
+    def ids(self, page) -> list[str]:
+        return [r["ticket_id"] for r in page.records]
+
+    def test_unfiltered_in_creation_order(self, listing_app: AppContext) -> None:
+        page = listing_app.query_tickets()
+        assert self.ids(page) == ["TKT-001", "TKT-002", "TKT-003", "TKT-004"]
+        assert page.next_cursor is None
+
+    def test_status_and_priority(self, listing_app: AppContext) -> None:
+        page = listing_app.query_tickets(TicketFilters(status="open", priority="high"))
+        assert self.ids(page) == ["TKT-001", "TKT-004"]
+
+    def test_assignee_case_insensitive(self, listing_app: AppContext) -> None:
+        page = listing_app.query_tickets(TicketFilters(assigned_to="MARCUS CHEN"))
+        assert self.ids(page) == ["TKT-001", "TKT-004"]
+
+    def test_date_range(self, listing_app: AppContext) -> None:
+        page = listing_app.query_tickets(
+            TicketFilters(created_from="2026-02-18", created_before="2026-02-20"),
+        )
+        assert self.ids(page) == ["TKT-001", "TKT-003"]
+
+    def test_cursor_pagination(self, listing_app: AppContext) -> None:
+        filters = TicketFilters(status="open")
+        first = listing_app.query_tickets(filters, limit=2)
+        assert self.ids(first) == ["TKT-001", "TKT-003"]
+        assert first.next_cursor is not None
+        second = listing_app.query_tickets(
+            filters, limit=2, after=int(first.next_cursor),
+        )
+        assert self.ids(second) == ["TKT-004"]
+        assert second.next_cursor is None
+
+    def test_records_are_full_tickets(self, listing_app: AppContext) -> None:
+        record = listing_app.query_tickets(limit=1).records[0]
+        assert Ticket(**record).body
+
+    def test_old_sidecar_format_rebuilds(self, app_context: AppContext) -> None:
+        seed_listing(app_context)
+        sidecar = app_context.ticket_store.index.index_file
+        legacy = [
+            {k: d[k] for k in ("ticket_id", "idempotency_key", "offset", "end")}
+            for d in map(json.loads, sidecar.read_text().splitlines())
+        ]
+        sidecar.write_text("".join(json.dumps(d) + "\n" for d in legacy))
+        reopened = open_ticket_repository(app_context.tickets_file)
+        page = reopened.query(TicketFilters(priority="critical"))
+        assert [r["ticket_id"] for r in page.records] == ["TKT-003"]
+
+
+class TestIterTickets:
+    """Tests for the streaming ticket iterator."""
+
+    @pytest.fixture(params=["jsonl", "sqlite"])
+    def streaming_app(self, request, app_context: AppContext) -> AppContext:
+        app_context.ticket_store = open_ticket_repository(
+            app_context.tickets_file, request.param,
+        )
+        seed_listing(app_context)
+        yield app_context
+        app_context.ticket_store.close()
+
+    def test_is_lazy_generator(self, streaming_app: AppContext) -> None:
+        it = streaming_app.iter_tickets()
+        assert next(it).ticket_id == "TKT-001"
+        it.close()
+
+    def test_predicate_and_limit(self, streaming_app: AppContext) -> None:
+        tickets = streaming_app.iter_tickets(lambda t: t.status == "open", limit=2)
+        assert [t.ticket_id for t in tickets] == ["TKT-001", "TKT-003"]
+
+    def test_limit_zero(self, streaming_app: AppContext) -> None:
+        assert list(streaming_app.iter_tickets(limit=0)) == []
+
+    def test_load_tickets_matches_iterator(self, streaming_app: AppContext) -> None:
+        assert streaming_app.load_tickets() == list(streaming_app.iter_tickets())
+
+    def test_sqlite_streams_across_batches(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr("src.ticket_store.STREAM_BATCH_SIZE", 2)
+        store = SqliteTicketRepository(tmp_path / "tickets.sqlite3")
+        try:
+            for n in range(1, 6):
+                store.append(asdict(make_ticket(n)))
+            assert [d["ticket_id"] for d in store.iter_all()] == [
+                f"TKT-{n:03d}" for n in range(1, 6)
+            ]
+        finally:
+            store.close()
+
 
 class TestTicketValidation:
     """Tests for input validation in ticket creation."""
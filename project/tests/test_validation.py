@@ -4,13 +4,20 @@ Tests for input validation functions (EP 09, EP 12).
 
 from __future__ import annotations
 
+from datetime import date
+
 import pytest
 
 from src.models import ErrorCode, ToolError
 from src.validation import (
     sanitize_string,
+    validate_choice,
+    validate_cursor,
+    validate_date,
     validate_doc_id,
+    validate_int_range,
     validate_query,
+    validate_ticket_id,
     validate_ticket_input,
 )
 
@@ -115,3 +122,56 @@ class TestValidateDocId:
     def test_empty_rejected(self) -> None:
         with pytest.raises(ToolError):
             validate_doc_id("")
+
+
+class TestValidateChoice:
+    def test_normalizes_case(self) -> None:
+        assert validate_choice(" BM25 ", ("legacy", "bm25"), "ranking") == "bm25"
+
+    def test_rejects_unknown(self) -> None:
+        with pytest.raises(ToolError) as exc_info:
+            validate_choice("cosine", ("legacy", "bm25"), "ranking")
+        assert exc_info.value.code == ErrorCode.INVALID_ARGUMENT
+
+
+class TestValidateIntRange:
+    def test_in_range(self) -> None:
+        assert validate_int_range(10, "limit", 1, 50) == 10
+
+    @pytest.mark.parametrize("value", [0, 51, True, "10"])
+    def test_rejects_out_of_range_or_non_int(self, value) -> None:
+        with pytest.raises(ToolError) as exc_info:
+            validate_int_range(value, "limit", 1, 50)
+        assert exc_info.value.code == ErrorCode.INVALID_ARGUMENT
+
+
+class TestValidateCursor:
+    def test_valid_cursor(self) -> None:
+        assert validate_cursor(" 42 ") == 42
+
+    @pytest.mark.parametrize("cursor", ["abc", "-1", "1.5", "٣", "9" * 20])
+    def test_rejects_invalid_cursor(self, cursor: str) -> None:
+        with pytest.raises(ToolError) as exc_info:
+            validate_cursor(cursor)
+        assert exc_info.value.code == ErrorCode.INVALID_ARGUMENT
+
+
+class TestValidateDate:
+    def test_valid_date(self) -> None:
+        assert validate_date("2026-02-18", "created_from") == date(2026, 2, 18)
+
+    @pytest.mark.parametrize("value", ["2026-2-18", "2026-02-30", "yesterday", "2026-02-18T00:00"])
+    def test_rejects_invalid_date(self, value: str) -> None:
+        with pytest.raises(ToolError) as exc_info:
+            validate_date(value, "created_from")
+        assert exc_info.value.code == ErrorCode.INVALID_ARGUMENT
+
+
+class TestValidateTicketId:
+    def test_normalizes_case(self) -> None:
+        assert validate_ticket_id(" tkt-1001 ") == "TKT-1001"
+
+    @pytest.mark.parametrize("ticket_id", ["TKT-", "TKT-00a", "../TKT-001", "INV-001"])
+    def test_rejects_invalid_ticket_id(self, ticket_id: str) -> None:
+        with pytest.raises(ToolError):
+            validate_ticket_id(ticket_id)
@@ -0,0 +1,110 @@
+"""
+Tests for the pre-fork hooks used by ``--workers`` mode.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.inventory import InventoryFilters
+from src.metrics import REGISTRY
+from src.models import AppContext
+from src.ticket_store import open_ticket_repository
+from src.workers import bind_socket
+
+
+@pytest.fixture(autouse=True)
+def metric_labels():
+    """after_fork labels the process-wide registry; restore it afterwards."""
+    labels = REGISTRY.labels
+    yield
+    REGISTRY.set_labels(**labels)
+
+
+def electronics(app: AppContext) -> set[str]:
+    page = app.search_inventory("", 10, filters=InventoryFilters(category="electronics"))
+    return {item["item_id"] for item in page.items}
+
+
+class TestForkHooks:
+    def test_before_fork_releases_connections(self, app_context: AppContext) -> None:
+        db = app_context.db
+        app_context.before_fork()
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.execute("SELECT 1")
+
+    def test_after_fork_restores_inventory(self, app_context: AppContext) -> None:
+        app_context.before_fork()
+        app_context.after_fork(1)
+        assert electronics(app_context) == {"INV-001", "INV-003"}
+
+    def test_workers_read_the_shared_inventory_file(self, app_context: AppContext) -> None:
+        path = app_context.inventory_readers.path
+        app_context.before_fork()
+        app_context.after_fork(1)
+        database = app_context.db.execute("PRAGMA database_list").fetchone()
+        assert Path(database["file"]) == path.resolve()
+        assert app_context.inventory_readers.path == path
+
+    def test_worker_gets_own_audit_dir(self, app_context: AppContext) -> None:
+        log_dir = app_context.audit_logger.log_path.parent
+        app_context.before_fork()
+        app_context.after_fork(2)
+        assert app_context.audit_logger.log_path == log_dir / "worker-2" / "audit.jsonl"
+        app_context.audit_logger.close()
+
+    def test_worker_labels_metrics(self, app_context: AppContext) -> None:
+        app_context.before_fork()
+        app_context.after_fork(3)
+        assert REGISTRY.labels == {"worker": "3"}
+
+    def test_sqlite_ticket_store_reopened(self, app_context: AppContext) -> None:
+        app_context.ticket_store = open_ticket_repository(app_context.tickets_file, "sqlite")
+        app_context.before_fork()
+        app_context.after_fork(1)
+        assert app_context.next_ticket_id() == "TKT-006"
+        app_context.ticket_store.close()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_forked_worker(self, app_context: AppContext) -> None:
+        app_context.before_fork()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                os.close(read_fd)
+                app_context.after_fork(1)
+                result = {
+                    "items": sorted(electronics(app_context)),
+                    "ticket": app_context.next_ticket_id(),
+                }
+                os.write(write_fd, json.dumps(result).encode())
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as f:
+            result = json.loads(f.read() or b"{}")
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert result == {"items": ["INV-001", "INV-003"], "ticket": "TKT-006"}
+
+        # The parent's state is untouched; the next ID continues after the child's
+        app_context.after_fork(2)
+        assert app_context.next_ticket_id() == "TKT-007"
+
+
+def test_bind_socket_is_inheritable() -> None:
+    sock = bind_socket("127.0.0.1", 0)
+    try:
+        assert sock.get_inheritable()
+        assert sock.getsockname()[1] > 0
+    finally:
+        sock.close()